@@ -12,6 +12,20 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
 
+# -------------------------------------------------
+# READ REPLICAS (OPTIONAL)
+# -------------------------------------------------
+# Comma-separated read-only database URLs (streaming standbys, or for
+# local testing a copy of a SQLite file). GET list / analytics routes
+# read from these; empty = everything uses DATABASE_URL.
+DATABASE_REPLICA_URLS = [
+    u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()
+]
+
+# after a write, that user's reads stay on the primary for this long
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+
+
 # -------------------------------------------------
 # MAIL SETTINGS (NEW)
 # -------------------------------------------------
@@ -25,7 +39,104 @@ MAIL_FROM = os.getenv(
     "Sales Pro <no-reply@salespro.com>"
 )
 
+# a hung SMTP server must not hold a scheduler job open
+SMTP_TIMEOUT_SECONDS = int(os.getenv("SMTP_TIMEOUT_SECONDS", 20))
+
 # -------------------------------------------------
 # TIMEZONE (NEW)
 # -------------------------------------------------
-TIMEZONE = os.getenv("TIMEZONE", "Asia/Kolkata")
\ No newline at end of file
+TIMEZONE = os.getenv("TIMEZONE", "Asia/Kolkata")
+
+
+# -------------------------------------------------
+# STARTUP (OPT-IN SIDE EFFECTS)
+# -------------------------------------------------
+def env_flag(name: str, default: str = "false"):
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+# create_all() on startup — dev only; production uses `python migrate.py`
+AUTO_CREATE_TABLES = env_flag("AUTO_CREATE_TABLES")
+
+# take part in scheduler leader election and run jobs in this process
+RUN_SCHEDULER = env_flag("RUN_SCHEDULER")
+
+# -------------------------------------------------
+# WORK QUEUE (GET /calls/queue)
+# -------------------------------------------------
+# follow-ups due within this many minutes already count as "due"
+QUEUE_DUE_WINDOW_MINUTES = int(os.getenv("QUEUE_DUE_WINDOW_MINUTES", 15))
+
+# -------------------------------------------------
+# RETENTION / ARCHIVE
+# -------------------------------------------------
+ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", 12))     # older CLOSED calls leave the reports (see archive_closed_calls)
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 1000))
+
+# -------------------------------------------------
+# LIVE UPDATES (SSE)
+# -------------------------------------------------
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", 100))
+SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", 20))
+
+# -------------------------------------------------
+# SCHEDULER LEADERSHIP (MULTI-WORKER)
+# -------------------------------------------------
+SCHEDULER_LEASE_TTL_SECONDS = int(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", 30))
+
+# a run later than this past its scheduled time is skipped (and counted
+# as missed); backed-up runs of a job collapse into one (coalesce)
+SCHEDULER_MISFIRE_GRACE_SECONDS = int(os.getenv("SCHEDULER_MISFIRE_GRACE_SECONDS", 3600))
+SCHEDULER_MAX_WORKERS = int(os.getenv("SCHEDULER_MAX_WORKERS", 4))
+
+# -------------------------------------------------
+# RATE LIMITING / LOAD SHEDDING
+# -------------------------------------------------
+RATE_LIMIT_ENABLED = env_flag("RATE_LIMIT_ENABLED", "true")
+
+# token bucket per user and route class: "<requests>/<seconds>",
+# i.e. bursts of <requests>, refilled evenly over <seconds>
+RATE_LIMITS = {
+    "auth": os.getenv("RATE_LIMIT_AUTH", "10/60"),      # keyed by client IP
+    "write": os.getenv("RATE_LIMIT_WRITE", "120/60"),
+    "read": os.getenv("RATE_LIMIT_READ", "300/60"),
+    "admin": os.getenv("RATE_LIMIT_ADMIN", "60/60"),    # admin analytics
+}
+
+# requests in flight per process before new ones get 503 (0 = no limit);
+# keep it near the DB pool size so excess load never queues on get_db
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 32))
+
+# -------------------------------------------------
+# INCREMENTAL SYNC (GET /sync)
+# -------------------------------------------------
+SYNC_MAX_ROWS = int(os.getenv("SYNC_MAX_ROWS", 2000))              # per entity, per response
+SYNC_SETTLE_SECONDS = int(os.getenv("SYNC_SETTLE_SECONDS", 5))     # re-send window for in-flight commits
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", 30))    # older cursors get a full resync
+
+# -------------------------------------------------
+# ADMIN CUBE (GET /admin/cube)
+# -------------------------------------------------
+CUBE_CACHE_SECONDS = int(os.getenv("CUBE_CACHE_SECONDS", 60))      # 0 disables the cache
+CUBE_CACHE_MAX_ENTRIES = int(os.getenv("CUBE_CACHE_MAX_ENTRIES", 256))
+
+# -------------------------------------------------
+# CALLER-ID PHONE INDEX (GET /lookup/phone/{number})
+# -------------------------------------------------
+PHONE_INDEX_ENABLED = env_flag("PHONE_INDEX_ENABLED", "true")
+PHONE_INDEX_BATCH_SIZE = int(os.getenv("PHONE_INDEX_BATCH_SIZE", 10000))          # rows per fetch while warming
+PHONE_INDEX_REFRESH_SECONDS = int(os.getenv("PHONE_INDEX_REFRESH_SECONDS", 30))   # other workers' writes; 0 = off
+
+# -------------------------------------------------
+# RESPONSE SIZE (THIN BRANCH-OFFICE LINKS)
+# -------------------------------------------------
+FRONTEND_CACHE_SECONDS = int(os.getenv("FRONTEND_CACHE_SECONDS", 86400))   # HTML pages; ETag revalidates after
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", 1024))                    # smaller responses go out as-is
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))                               # 9 costs far more CPU for ~2% less
+
+# -------------------------------------------------
+# LEAD SOURCE LOOKUP (app.models.codes)
+# -------------------------------------------------
+# How often a worker reloads lead_sources when a session begins; a source
+# another worker added since fails to decode until then (0 = every session)
+LEAD_SOURCE_REFRESH_SECONDS = float(os.getenv("LEAD_SOURCE_REFRESH_SECONDS", 5))
@@ -1,24 +1,121 @@
 # app/database.py
 
-from sqlalchemy import create_engine
+import itertools
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_URL
+from app.config import DATABASE_URL, DATABASE_REPLICA_URLS
 
-engine = create_engine(DATABASE_URL)
+# Nothing here touches the database at import time. The engine is built
+# by init_engine() — called from the FastAPI lifespan in app.main, or
+# explicitly by CLI scripts — and SessionLocal is bound to it then.
+engine = None
+replica_engines = []
+_replica_cycle = None
 
 SessionLocal = sessionmaker(
     autocommit=False,
-    autoflush=False,
-    bind=engine
+    autoflush=False
+)
+
+# sessions on a read replica (bound per session, round-robin)
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False
 )
 
 Base = declarative_base()
 
+
+@event.listens_for(SessionLocal, "after_begin")
+@event.listens_for(ReadSessionLocal, "after_begin")
+def _refresh_lead_sources(session, transaction, connection):
+    # lead source names are decoded from an in-memory cache
+    # (app.models.codes); refreshed here, on the session's own
+    # connection, so a replica session never reaches for the primary
+    from app.models.codes import refresh_sources
+    refresh_sources(connection)
+
+
+def _make_engine(url: str):
+    new_engine = create_engine(url)
+
+    # SQLite ignores FOREIGN KEY / ON DELETE CASCADE unless asked per connection
+    if new_engine.dialect.name == "sqlite":
+        @event.listens_for(new_engine, "connect")
+        def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+    return new_engine
+
+
+def init_engine(url: str | None = None, replica_urls: list | None = None):
+    """
+    Create the primary engine (once) plus any read replicas, and bind
+    SessionLocal to the primary.
+    """
+    global engine, replica_engines, _replica_cycle
+
+    if engine is not None:
+        return engine
+
+    engine = _make_engine(url or DATABASE_URL)
+    SessionLocal.configure(bind=engine)
+
+    replica_engines = [
+        _make_engine(u)
+        for u in (DATABASE_REPLICA_URLS if replica_urls is None else replica_urls)
+    ]
+    _replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+
+    return engine
+
+
+def dispose_engines():
+    global engine, replica_engines, _replica_cycle
+
+    for e in [engine, *replica_engines]:
+        if e is not None:
+            e.dispose()
+
+    engine = None
+    replica_engines = []
+    _replica_cycle = None
+
+
+def read_session():
+    """
+    Session on the next read replica, or on the primary when none is
+    configured.
+    """
+    if _replica_cycle is None:
+        return SessionLocal()
+    return ReadSessionLocal(bind=next(_replica_cycle))
+
+
+def get_engine():
+    return engine or init_engine()
+
+
+def create_tables():
+    """
+    🔴 DEV-ONLY table creation (opt-in via AUTO_CREATE_TABLES)
+    """
+    Base.metadata.create_all(bind=get_engine())
+
+
 # 🔴 CRITICAL: import ALL models so FKs resolve
 from app.models.user import User
 from app.models.lead import Lead          # ✅ THIS WAS MISSING
 from app.models.call_log import CallLog
 from app.models.call_follow_up import CallFollowUp
-
-# 🔴 DEV-ONLY table creation
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+from app.models.call_archive import CallLogArchive, CallFollowUpArchive
+from app.models.scheduler_lease import SchedulerLease
+from app.models.job_watermark import JobWatermark
+from app.models.sync_tombstone import SyncTombstone
+from app.models.call_event import CallEvent
+from app.models.call_daily_rollup import CallDailyRollup
+from app.models.lead_source import LeadSource
+from app.models.scheduler_job_stat import SchedulerJobStat
@@ -1,29 +1,148 @@
-from fastapi import Depends, HTTPException
+import time
+
+from fastapi import Depends, HTTPException, Request, Response
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.config import SECRET_KEY, ALGORITHM
+from app.database import SessionLocal, read_session
+from app.config import SECRET_KEY, ALGORITHM, READ_YOUR_WRITES_SECONDS
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_db():
+# Read-your-writes: after a write the user's reads stay on the primary.
+# Tracked in-process and in a cookie, so it holds across workers too.
+# Only commits that wrote something count (a login does not).
+PRIMARY_COOKIE = "read_primary_until"
+_recent_writers = {}    # user id -> time.time() until which to read primary
+
+
+def token_user_id(request: Request):
+    """
+    user_id from the bearer token, or None. No DB access, no errors.
+    """
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        return jwt.decode(auth[7:], SECRET_KEY, algorithms=[ALGORITHM]).get("user_id")
+    except Exception:
+        return None
+
+
+def get_db(request: Request, response: Response):
     db = SessionLocal()
+    db.info["on_write_commit"] = lambda: _mark_recent_write(request, response)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _mark_recent_write(request: Request, response: Response):
+    until = time.time() + READ_YOUR_WRITES_SECONDS
+
+    user_id = token_user_id(request)
+    if user_id is not None:
+        _recent_writers[user_id] = until
+
+    response.set_cookie(
+        PRIMARY_COOKIE, str(int(until)),
+        max_age=READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax"
+    )
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flushed(session, flush_context):
+    # only fires when the flush had rows to write
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _executed(state):
+    # bulk insert() / update() / delete() through the session
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _committed(session):
+    if session.info.pop("wrote", False) and "on_write_commit" in session.info:
+        session.info["on_write_commit"]()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("wrote", None)
+
+
+def _reads_from_primary(request: Request):
+    now = time.time()
+
+    try:
+        if float(request.cookies.get(PRIMARY_COOKIE, 0)) > now:
+            return True
+    except ValueError:
+        pass
+
+    user_id = token_user_id(request)
+    until = _recent_writers.get(user_id)
+    if until is None:
+        return False
+    if until <= now:
+        _recent_writers.pop(user_id, None)
+        return False
+    return True
+
+
+def get_read_db(request: Request):
+    """
+    Session for GET list / analytics routes: a read replica when one is
+    configured, unless this user wrote within READ_YOUR_WRITES_SECONDS.
+    """
+    db = SessionLocal() if _reads_from_primary(request) else read_session()
     try:
         yield db
     finally:
         db.close()
 
+def _load_user(token: str, db: Session):
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user = db.query(User).filter(User.id == payload["user_id"]).first()
+        if not user:
+            raise HTTPException(status_code=401)
+        return user
+    except:
+        raise HTTPException(status_code=401)
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ):
+    return _load_user(token, db)
+
+def get_read_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db)
+):
+    """
+    get_current_user for routes on get_read_db: the user is loaded
+    through the route's own read session (FastAPI reuses one
+    dependency instance per request), so no primary session is opened.
+    """
+    return _load_user(token, db)
+
+def decode_token(token: str):
+    """
+    JWT payload without a DB round trip ({"user_id", "role", "exp"}).
+    For long-lived or hot-path endpoints that must not hold a session.
+    """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user = db.query(User).filter(User.id == payload["user_id"]).first()
-        if not user:
+        if "user_id" not in payload:
             raise HTTPException(status_code=401)
-        return user
+        return payload
     except:
         raise HTTPException(status_code=401)
\ No newline at end of file
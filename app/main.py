@@ -1,19 +1,110 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
-from apscheduler.schedulers.background import BackgroundScheduler
-import pytz
-
-from app.routes import frontend, calls, auth_api, admin_utils, leads
+from app.routes import frontend, calls, auth_api, admin_utils, leads, stream, sync, lookup
+from app.database import init_engine, create_tables, dispose_engines
 from app.utils.scheduler import (
-    send_followup_reminders,
+    scheduler,
+    start_scheduler,
+    stop_scheduler,
     send_daily_summary
 )
-from app.config import TIMEZONE
+from app.utils.retention import run_nightly_archive
+from app.utils.lead_dedupe import run_nightly_dedupe
+from app.utils.leader import LeaderElector
+from app.utils.ratelimit import LoadSheddingMiddleware
+from app.utils.content_encoding import QValueGZipMiddleware
+from app.utils.phone_index import phone_index
+from app.config import AUTO_CREATE_TABLES, RUN_SCHEDULER, PHONE_INDEX_ENABLED, GZIP_MIN_BYTES, GZIP_LEVEL
+
+
+# --------------------------------------------------
+# SCHEDULER SETUP
+# --------------------------------------------------
+def setup_scheduler():
+    """
+    Every worker runs a paused scheduler (so it can still write jobs to
+    the shared store); with RUN_SCHEDULER, it also joins leader election
+    and only the lease holder resumes it and executes jobs. The
+    heartbeat wakes the leader for jobs other workers just added.
+    """
+    start_scheduler(paused=True)
+
+    if not RUN_SCHEDULER:
+        return None
+
+    # 🔔 Pre-overdue follow-up reminders are one-off jobs per call, created
+    # by the write paths (see app.utils.scheduler.schedule_followup_reminder)
+
+    # 🌙 Daily 8 PM summary
+    scheduler.add_job(
+        send_daily_summary,
+        trigger="cron",
+        hour=20,
+        minute=0,
+        id="daily_summary",
+        replace_existing=True
+    )
+
+    # 🗄️ Nightly archive of old CLOSED calls
+    scheduler.add_job(
+        run_nightly_archive,
+        trigger="cron",
+        hour=2,
+        minute=30,
+        id="archive_closed_calls",
+        replace_existing=True
+    )
+
+    # 👥 Nightly cross-team duplicate lead pass (new leads only)
+    scheduler.add_job(
+        run_nightly_dedupe,
+        trigger="cron",
+        hour=2,
+        minute=0,
+        id="dedupe_leads",
+        replace_existing=True
+    )
+
+    elector = LeaderElector(
+        "scheduler",
+        on_elected=scheduler.resume,
+        on_demoted=scheduler.pause,
+        on_heartbeat=scheduler.wakeup
+    )
+    elector.start()
+    return elector
+
+
+# --------------------------------------------------
+# LIFESPAN (NOTHING RUNS AT IMPORT TIME)
+# --------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_engine()
+
+    if AUTO_CREATE_TABLES:
+        create_tables()
 
+    if PHONE_INDEX_ENABLED:
+        # warms in the background; caller-ID lookups answer 503 until ready
+        phone_index.start()
 
-app = FastAPI(title="Sales Call Reporting API")
+    elector = setup_scheduler()
+
+    yield
+
+    if elector:
+        elector.stop()
+    phone_index.stop()
+    stop_scheduler()
+    dispose_engines()
+
+
+app = FastAPI(title="Sales Call Reporting API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +113,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# JSON lists above GZIP_MIN_BYTES; pages arrive pre-compressed and the
+# SSE stream is left alone
+app.add_middleware(QValueGZipMiddleware, minimum_size=GZIP_MIN_BYTES, compresslevel=GZIP_LEVEL)
+
+# outermost: rate limits + concurrency cap run before any route work
+app.add_middleware(LoadSheddingMiddleware)
+
 # --------------------------------------------------
 # ROUTES
 # --------------------------------------------------
@@ -35,32 +133,6 @@ app.include_router(auth_api.router)
 app.include_router(calls.router)
 app.include_router(admin_utils.router)
 app.include_router(leads.router)
-
-
-# --------------------------------------------------
-# SCHEDULER SETUP (NEW)
-# --------------------------------------------------
-scheduler = BackgroundScheduler(
-    timezone=pytz.timezone(TIMEZONE)
-)
-
-# 🔔 Pre-overdue follow-up reminders
-scheduler.add_job(
-    send_followup_reminders,
-    trigger="interval",
-    minutes=5,
-    id="followup_reminders",
-    replace_existing=True
-)
-
-# 🌙 Daily 8 PM summary
-scheduler.add_job(
-    send_daily_summary,
-    trigger="cron",
-    hour=20,
-    minute=0,
-    id="daily_summary",
-    replace_existing=True
-)
-
-scheduler.start()
\ No newline at end of file
+app.include_router(stream.router)
+app.include_router(sync.router)
+app.include_router(lookup.router)
\ No newline at end of file
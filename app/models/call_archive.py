@@ -0,0 +1,53 @@
+# app/models/call_archive.py
+#
+# Cold storage for CLOSED calls moved out of the hot tables by
+# app.utils.retention. Column names mirror call_logs / call_follow_ups
+# so rows can be copied with INSERT ... SELECT. No foreign keys back to
+# the hot tables — the originals are deleted once archived.
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.codes import Outcome, CallStatus, SourceCode
+
+
+class CallLogArchive(Base):
+    __tablename__ = "call_logs_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    call_id = Column(String, index=True)
+
+    salesperson_id = Column(Integer, index=True, nullable=False)
+    lead_id = Column(Integer, index=True)    # a lead with archived calls counts as called
+
+    query_source = Column(SourceCode)
+    client_name = Column(String)
+    contact_number = Column(String)
+    query_product = Column(String)
+    state = Column(String)
+
+    call_outcome = Column(Outcome)
+    remark = Column(String)
+    next_action = Column(String)
+    follow_up_datetime = Column(DateTime)
+
+    status = Column(CallStatus)
+    completed_at = Column(DateTime)
+    created_at = Column(DateTime(timezone=True))
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class CallFollowUpArchive(Base):
+    __tablename__ = "call_follow_ups_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    call_id = Column(Integer, index=True, nullable=False)
+    salesperson_id = Column(Integer, nullable=False)
+
+    outcome = Column(Outcome, nullable=False)
+    remark = Column(String)
+    follow_up_datetime = Column(DateTime)
+    created_at = Column(DateTime(timezone=True))
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
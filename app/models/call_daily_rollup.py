@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Date
+from app.database import Base
+
+
+class CallDailyRollup(Base):
+    """
+    Activity per salesperson per day, derived from call_events
+    (app.utils.call_events.rebuild_daily_rollups).
+    """
+    __tablename__ = "call_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    salesperson_id = Column(Integer, primary_key=True)
+
+    leads_created = Column(Integer, nullable=False, default=0)
+    calls_logged = Column(Integer, nullable=False, default=0)
+    follow_ups = Column(Integer, nullable=False, default=0)
+    calls_closed = Column(Integer, nullable=False, default=0)
+    purchased = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,53 @@
+# app/models/call_event.py
+#
+# Append-only activity log for calls, written in the same transaction as
+# every write in app/routes/calls.py. Rows are never updated or deleted
+# (archiving a call leaves its events in place), so analytics and the
+# derived tables in app.utils.call_events can be rebuilt from here alone.
+
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, String, DateTime, Boolean, Index
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.codes import Outcome, SourceCode
+
+
+# stored as SmallInteger codes to keep rows small
+EVENT_KINDS = {
+    "lead_created": 1,
+    "call_logged": 2,
+    "follow_up": 3,
+    "call_updated": 4,
+    "call_claimed": 5,
+    "call_closed": 6,         # admin bulk close
+    "call_reopened": 7,       # admin bulk reopen
+    "call_reassigned": 8,     # salesperson_id is the new owner
+}
+EVENT_NAMES = {code: name for name, code in EVENT_KINDS.items()}
+
+
+class CallEvent(Base):
+    __tablename__ = "call_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    occurred_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    kind = Column(SmallInteger, nullable=False)
+
+    call_id = Column(Integer, index=True)       # no FK: events outlive archived calls
+    lead_id = Column(Integer)
+    salesperson_id = Column(Integer)            # owner of the call / lead
+    actor_id = Column(Integer)                  # who made the change
+
+    outcome = Column(Outcome)
+    remark = Column(String)
+    follow_up_at = Column(DateTime)             # next follow-up scheduled by this event
+    closed = Column(Boolean, nullable=False, default=False)   # event closed the call
+
+    # lead / call attributes, on lead_created and call_logged only
+    query_source = Column(SourceCode)
+    query_product = Column(String)
+    state = Column(String)
+
+    __table_args__ = (
+        Index("ix_call_events_occurred", "occurred_at"),
+        Index("ix_call_events_owner", "salesperson_id", "occurred_at"),
+    )
@@ -3,7 +3,9 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from datetime import datetime
 from app.database import Base
+from app.models.codes import Outcome
 
 
 class CallFollowUp(Base):
@@ -13,7 +15,7 @@ class CallFollowUp(Base):
 
     call_id = Column(
         Integer,
-        ForeignKey("call_logs.id"),
+        ForeignKey("call_logs.id", ondelete="CASCADE"),
         index=True,
         nullable=False
     )
@@ -24,12 +26,18 @@ class CallFollowUp(Base):
         nullable=False
     )
 
-    outcome = Column(String, nullable=False)  # Connected / Busy / Not Picked / Purchased / Not Required
+    outcome = Column(Outcome, nullable=False)  # Connected / Busy / Not Picked / Purchased / Not Required
     remark = Column(String)
 
     follow_up_datetime = Column(DateTime, index=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # UTC, bumped on every write — drives GET /sync deltas
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
     # Relationship back to parent call
-    call = relationship("CallLog", back_populates="follow_ups")
\ No newline at end of file
+    call = relationship("CallLog", back_populates="follow_ups")
+
+    # ids are never reused once archived (app.utils.retention)
+    __table_args__ = {"sqlite_autoincrement": True}
\ No newline at end of file
@@ -1,7 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from datetime import datetime
 from app.database import Base
+from app.models.codes import Outcome, CallStatus, SourceCode
+
+OPEN_CODE = CallStatus.code("OPEN")
 
 
 class CallLog(Base):
@@ -30,7 +34,7 @@ class CallLog(Base):
     # --------------------------------------------------
     # CUSTOMER / QUERY DETAILS
     # --------------------------------------------------
-    query_source = Column(String)
+    query_source = Column(SourceCode)
     client_name = Column(String)
     contact_number = Column(String)
     query_product = Column(String)
@@ -39,17 +43,36 @@ class CallLog(Base):
     # --------------------------------------------------
     # FIRST CALL OUTCOME (IMMUTABLE)
     # --------------------------------------------------
-    call_outcome = Column(String)
+    call_outcome = Column(Outcome)
     remark = Column(String)
 
     # ⛔ Deprecated — kept only for backward compatibility
     next_action = Column(String)
     follow_up_datetime = Column(DateTime)
 
+    # --------------------------------------------------
+    # WORK QUEUE CLAIM (shared team queue)
+    # --------------------------------------------------
+    claimed_by_id = Column(
+        Integer,
+        ForeignKey("users.id"),
+        nullable=True
+    )
+    claimed_until = Column(DateTime)
+
+    # --------------------------------------------------
+    # FOLLOW-UP SUMMARY (maintained by app.utils.call_summary)
+    # --------------------------------------------------
+    followup_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_outcome = Column(Outcome)           # latest follow-up outcome, else call_outcome
+    last_followup_at = Column(DateTime(timezone=True))
+    next_follow_up_at = Column(DateTime)    # current follow-up while OPEN
+    purchased_at = Column(DateTime(timezone=True), index=True)
+
     # --------------------------------------------------
     # STATUS / TIMESTAMPS
     # --------------------------------------------------
-    status = Column(String, default="OPEN")  # OPEN / CLOSED
+    status = Column(CallStatus, default="OPEN")  # OPEN / CLOSED
     completed_at = Column(DateTime)
 
     created_at = Column(
@@ -57,11 +80,54 @@ class CallLog(Base):
         server_default=func.now()
     )
 
+    # UTC, bumped on every write — drives GET /sync deltas
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        index=True
+    )
+
     # --------------------------------------------------
     # FOLLOW-UP RELATIONSHIP
     # --------------------------------------------------
     follow_ups = relationship(
         "CallFollowUp",
         back_populates="call",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True    # children removed by ON DELETE CASCADE
+    )
+
+    # --------------------------------------------------
+    # INDEXES
+    # --------------------------------------------------
+    # Partial indexes over OPEN calls only: the work queue reads
+    # "next due" rows straight off these in follow_up_datetime order.
+    # status is stored as a code (app.models.codes), hence OPEN_CODE.
+    __table_args__ = (
+        Index(
+            "ix_call_logs_open_queue",
+            "salesperson_id",
+            "follow_up_datetime",
+            postgresql_where=text(f"status = {OPEN_CODE}"),
+            sqlite_where=text(f"status = {OPEN_CODE}")
+        ),
+        Index(
+            "ix_call_logs_open_team_queue",
+            "follow_up_datetime",
+            postgresql_where=text(f"status = {OPEN_CODE}"),
+            sqlite_where=text(f"status = {OPEN_CODE}")
+        ),
+        Index("ix_call_logs_sync", "salesperson_id", "updated_at"),
+        # Plain (not partial) so it also serves status = :param, as
+        # bound by the ORM; salesperson_id makes the overdue aging
+        # report an index-only range scan.
+        Index(
+            "ix_call_logs_status_due",
+            "status",
+            "follow_up_datetime",
+            "salesperson_id"
+        ),
+        # ids are never reused once archived (app.utils.retention)
+        {"sqlite_autoincrement": True},
     )
\ No newline at end of file
@@ -0,0 +1,155 @@
+# app/models/codes.py
+#
+# Column types that store repeated strings (outcomes, statuses, lead
+# sources) as SMALLINT codes. The API and all Python code keep using
+# the strings: values are encoded on the way in and decoded on the way
+# out, so filters like `CallLog.status == "OPEN"` or
+# `.in_(CLOSING_OUTCOMES)` compile to small-integer comparisons.
+
+import threading
+import time
+
+from sqlalchemy import SmallInteger, select, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.types import TypeDecorator
+
+from app.utils.enums import CallStatusEnum, CallOutcomeEnum, LeadStatusEnum
+from app.config import LEAD_SOURCE_REFRESH_SECONDS
+
+
+# ==================================================
+# FIXED VOCABULARIES (CODE = POSITION, 1-BASED)
+# ==================================================
+class CodedString(TypeDecorator):
+    """
+    One of a fixed tuple of strings, stored as its 1-based position.
+    Anything else is rejected, so a misspelled outcome cannot reach the
+    table and skew counts.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, values):
+        super().__init__()
+        self.values = tuple(values)
+        self._codes = {v: i for i, v in enumerate(self.values, 1)}
+
+    def code(self, value):
+        return self._codes[value]
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not one of {list(self.values)}") from None
+
+    def process_result_value(self, value, dialect):
+        # int(): SQLite databases converted in place keep '1' as text
+        return self.values[int(value) - 1] if value is not None else None
+
+
+OUTCOMES = tuple(e.value for e in CallOutcomeEnum)
+CALL_STATUSES = tuple(e.value for e in CallStatusEnum)
+LEAD_STATUSES = tuple(e.value for e in LeadStatusEnum)
+
+Outcome = CodedString(OUTCOMES)
+CallStatus = CodedString(CALL_STATUSES)
+LeadStatus = CodedString(LEAD_STATUSES)
+
+
+# ==================================================
+# OPEN VOCABULARY: LEAD SOURCES (lead_sources TABLE)
+# ==================================================
+# The type below is a pure in-memory lookup. The cache is filled and
+# kept current outside it: register_sources() at write paths, before
+# their transaction writes, and refresh_sources() when a session begins
+# (app.database), on that session's own connection.
+_sources_lock = threading.Lock()
+_source_ids = {}      # name -> id
+_source_names = {}    # id -> name
+_sources_loaded_at = None
+
+
+def _load_sources(conn):
+    global _sources_loaded_at
+    from app.models.lead_source import LeadSource
+    rows = conn.execute(select(LeadSource.id, LeadSource.name)).all()
+    with _sources_lock:
+        _source_ids.update({name: id_ for id_, name in rows})
+        _source_names.update({id_: name for id_, name in rows})
+        _sources_loaded_at = time.monotonic()
+
+
+def refresh_sources(conn):
+    """
+    Reload the cache through `conn` when it is older than
+    LEAD_SOURCE_REFRESH_SECONDS (or a read met an id it did not know), so
+    sources added by other workers decode here too.
+    """
+    loaded_at = _sources_loaded_at
+    if loaded_at is None or time.monotonic() - loaded_at >= LEAD_SOURCE_REFRESH_SECONDS:
+        _load_sources(conn)
+
+
+def known_source(name):
+    return name in _source_ids
+
+
+def register_sources(names):
+    """
+    Make sure every name has a lead_sources row, in its own short
+    transaction. Write paths that may bring in new sources call this
+    before their own transaction writes (SQLite allows one writer at a
+    time), so encoding never has to touch the database.
+    """
+    from app.database import get_engine
+    from app.models.lead_source import LeadSource
+
+    missing = {n for n in names if n is not None and n not in _source_ids}
+    if not missing:
+        return
+
+    engine = get_engine()
+    with engine.connect() as conn:
+        _load_sources(conn)
+
+    for name in missing - set(_source_ids):
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(LeadSource).values(name=name))
+        except IntegrityError:
+            pass    # another worker added it first
+
+    with engine.connect() as conn:
+        _load_sources(conn)
+
+
+class SourceCode(TypeDecorator):
+    """
+    Free-form lead source stored as a lead_sources id. Names must be
+    registered first (register_sources); unknown names or ids raise.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return _source_ids[value]
+        except KeyError:
+            raise ValueError(f"lead source {value!r} is not registered") from None
+
+    def process_result_value(self, value, dialect):
+        global _sources_loaded_at
+        if value is None:
+            return None
+        try:
+            return _source_names[int(value)]
+        except KeyError:
+            # added by another worker since the last refresh: reload on
+            # the next session instead of waiting out the interval
+            _sources_loaded_at = None
+            raise ValueError(f"lead source id {value} is not loaded yet") from None
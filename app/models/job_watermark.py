@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class JobWatermark(Base):
+    """
+    Progress marker for incremental batch jobs (e.g. "lead_dedupe"):
+    the highest row id already processed.
+    """
+    __tablename__ = "job_watermarks"
+
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
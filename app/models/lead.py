@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
+from datetime import datetime
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.codes import LeadStatus, SourceCode
 
 
 class Lead(Base):
@@ -12,19 +14,31 @@ class Lead(Base):
     client_name = Column(String, nullable=False)
     contact_number = Column(String, nullable=False)
 
-    query_source = Column(String)
+    query_source = Column(SourceCode)
     query_product = Column(String)
     state = Column(String)
 
+    # NULL = imported in bulk, waiting for the assignment engine
     salesperson_id = Column(
         Integer,
         ForeignKey("users.id"),
-        nullable=False
+        nullable=True
     )
 
     status = Column(
-        String,
-        default="NEW"   # NEW / CALLED / CLOSED
+        LeadStatus,
+        default="NEW"   # NEW / CALLED / CLOSED / MERGED
+    )
+
+    # --------------------------------------------------
+    # DUPLICATE DETECTION (app.utils.lead_dedupe)
+    # --------------------------------------------------
+    phone_normalized = Column(String, index=True)
+    duplicate_of_id = Column(
+        Integer,
+        ForeignKey("leads.id"),
+        nullable=True,
+        index=True
     )
 
     created_at = Column(
@@ -32,6 +46,25 @@ class Lead(Base):
         server_default=func.now()
     )
 
+    # UTC, bumped on every write — drives GET /sync deltas
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        index=True
+    )
+
+    __table_args__ = (
+        Index("ix_leads_sync", "salesperson_id", "updated_at"),
+        # the assignment engine's backlog of unassigned leads
+        Index(
+            "ix_leads_unassigned",
+            "id",
+            postgresql_where=text("salesperson_id IS NULL"),
+            sqlite_where=text("salesperson_id IS NULL"),
+        ),
+    )
+
     # --------------------------------------------------
     # RELATIONSHIPS
     # --------------------------------------------------
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+
+class LeadSource(Base):
+    """
+    Lookup table behind the small-integer query_source columns
+    (app.models.codes.SourceCode). Rows are added on first use and
+    never renamed or removed.
+    """
+    __tablename__ = "lead_sources"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime
+from app.database import Base
+
+
+class SchedulerJobStat(Base):
+    """
+    Running totals and the last run of one scheduler job (reminder jobs
+    share the "followup_reminder" row), written by the process that ran
+    it so any worker can report them (app.utils.job_telemetry).
+    """
+    __tablename__ = "scheduler_job_stats"
+
+    name = Column(String, primary_key=True)
+
+    runs = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
+    missed = Column(Integer, nullable=False, default=0)      # past misfire_grace_time
+    skipped = Column(Integer, nullable=False, default=0)     # previous run still going
+    rows_scanned = Column(Integer, nullable=False, default=0)
+    emails_attempted = Column(Integer, nullable=False, default=0)
+    emails_failed = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0)
+    max_seconds = Column(Float, nullable=False, default=0)
+    max_lag_seconds = Column(Float, nullable=False, default=0)
+
+    last_scheduled_at = Column(DateTime(timezone=True))
+    last_started_at = Column(DateTime(timezone=True))
+    last_lag_seconds = Column(Float)                         # start - scheduled time
+    last_duration_seconds = Column(Float)
+    last_rows_scanned = Column(Integer)
+    last_emails_attempted = Column(Integer)
+    last_emails_failed = Column(Integer)
+    last_error = Column(String)
+    last_missed_at = Column(DateTime(timezone=True))
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime
+from app.database import Base
+
+
+class SchedulerLease(Base):
+    """
+    One row per leadership lease (e.g. "scheduler"). The holder renews
+    expires_at on every heartbeat; anyone may take over once it lapses.
+    """
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)   # UTC
\ No newline at end of file
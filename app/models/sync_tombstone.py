@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.database import Base
+
+
+class SyncTombstone(Base):
+    """
+    A row that left the hot tables (archived, or moved to another rep),
+    so GET /sync clients can drop it from their local copy. Ids only
+    grow, so clients page through tombstones by id.
+    """
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)          # lead / call / follow_up
+    entity_id = Column(Integer, nullable=False)
+    salesperson_id = Column(Integer)                 # owner it disappeared from
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)   # UTC
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_owner", "salesperson_id", "id"),
+    )
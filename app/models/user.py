@@ -10,5 +10,6 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(String, default="SALESPERSON")
+    team = Column(String, nullable=True)    # shared work queue (scope=team)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
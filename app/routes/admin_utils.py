@@ -1,12 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, func, case, and_
+from sqlalchemy.orm import Session, aliased
 from datetime import datetime, timedelta, date
 
-from app.deps import get_current_user, get_db
+from app.database import SessionLocal, get_engine
+from app.deps import get_current_user, get_read_user, get_db, get_read_db
 from app.models.user import User
 from app.models.lead import Lead
 from app.models.call_log import CallLog
-from app.models.call_follow_up import CallFollowUp
+from app.models.codes import register_sources, OUTCOMES
+from app.utils.ratelimit import load_shedder
+from app.utils.pubsub import publish_after_commit, add_commit_listener
+from app.utils.cache import TTLCache
+from app.utils.cube import cube_query, CUBE_DIMENSIONS, CUBE_MAX_DIMENSIONS
+from app.utils.lead_assignment import assign_leads, STRATEGIES, AFFINITY_FIELDS
+from app.utils.bulk_ops import reassign, close_calls, reopen_calls, FILTER_KEYS
+from app.utils.lead_dedupe import dedupe_leads
+from app.utils.phone import normalize_phone
+from app.utils.phone_index import phone_index
+from app.utils.scheduler import scheduler, schedule_followup_reminders, cancel_followup_reminders
+from app.utils.job_telemetry import job_stats
+from app.utils.projection import fetch_dicts
+from app.utils.analytics import (
+    seconds_between,
+    percentile_aggregate,
+    nearest_rank_percentiles
+)
+from app.config import CUBE_CACHE_SECONDS, CUBE_CACHE_MAX_ENTRIES, READ_YOUR_WRITES_SECONDS
 
 router = APIRouter(prefix="/admin", tags=["Admin Utils"])
 
@@ -16,20 +36,47 @@ router = APIRouter(prefix="/admin", tags=["Admin Utils"])
 # ==================================================
 @router.get("/salespersons")
 def get_salespersons(
-    user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
 ):
     if user.role != "ADMIN":
         return []
 
     rows = (
-        db.query(User.id, User.name)
+        db.query(User.id, User.name, User.team)
         .filter(User.role == "SALESPERSON")
         .order_by(User.name.asc())
         .all()
     )
 
-    return [{"id": r.id, "name": r.name} for r in rows]
+    return [{"id": r.id, "name": r.name, "team": r.team} for r in rows]
+
+
+@router.put("/salespersons/{user_id}/team")
+def set_salesperson_team(
+    user_id: int,
+    data: dict,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Put a rep on a team ({"team": "north"}) or take them off one
+    ({"team": null}). Teammates share the scope=team work queue.
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    rep = db.query(User).filter(User.id == user_id, User.role == "SALESPERSON").first()
+    if not rep:
+        raise HTTPException(status_code=404, detail="Salesperson not found")
+
+    team = data.get("team")
+    if team is not None and (not isinstance(team, str) or not team.strip()):
+        raise HTTPException(status_code=400, detail="team must be a non-empty string or null")
+
+    rep.team = team.strip() if team else None
+    db.commit()
+    return {"id": rep.id, "team": rep.team}
 
 
 # ==================================================
@@ -117,8 +164,8 @@ def admin_kpis(
     from_date: str | None = None,
     to_date: str | None = None,
     span: str | None = None,
-    user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
 ):
     if user.role != "ADMIN":
         raise HTTPException(status_code=403)
@@ -133,22 +180,22 @@ def admin_kpis(
 
     lead_q = db.query(Lead)
     call_q = db.query(CallLog)
-    followup_q = db.query(CallFollowUp)
+    purchased_q = db.query(CallLog).filter(CallLog.purchased_at.isnot(None))
 
     if salesperson_id:
         lead_q = lead_q.filter(Lead.salesperson_id == salesperson_id)
         call_q = call_q.filter(CallLog.salesperson_id == salesperson_id)
-        followup_q = followup_q.filter(CallFollowUp.salesperson_id == salesperson_id)
+        purchased_q = purchased_q.filter(CallLog.salesperson_id == salesperson_id)
 
     if start:
         lead_q = lead_q.filter(Lead.created_at >= start)
         call_q = call_q.filter(CallLog.created_at >= start)
-        followup_q = followup_q.filter(CallFollowUp.created_at >= start)
+        purchased_q = purchased_q.filter(CallLog.purchased_at >= start)
 
     if end:
         lead_q = lead_q.filter(Lead.created_at <= end)
         call_q = call_q.filter(CallLog.created_at <= end)
-        followup_q = followup_q.filter(CallFollowUp.created_at <= end)
+        purchased_q = purchased_q.filter(CallLog.purchased_at <= end)
 
     # --------------------------------
     # LEADS
@@ -166,16 +213,9 @@ def admin_kpis(
         CallLog.status == "CLOSED"
     ).count()
 
-    # Purchased can be from FIRST CALL or FOLLOW-UP
-    purchased_from_calls = call_q.filter(
-        CallLog.call_outcome == "Purchased"
-    ).count()
-
-    purchased_from_followups = followup_q.filter(
-        CallFollowUp.outcome == "Purchased"
-    ).count()
-
-    purchased = purchased_from_calls + purchased_from_followups
+    # Purchased on the FIRST CALL or a FOLLOW-UP — kept on the call
+    # as purchased_at, so no join to call_follow_ups
+    purchased = purchased_q.count()
 
     # --------------------------------
     # FOLLOW-UPS
@@ -204,6 +244,95 @@ def admin_kpis(
     }
 
 
+# ==================================================
+# ADMIN OVERDUE FOLLOW-UP AGING
+# ==================================================
+AGING_BUCKETS = ("under_1h", "1h_4h", "same_day", "1d_3d", "over_3d")
+
+
+@router.get("/followups/aging")
+def admin_followup_aging(
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Open calls whose follow-up is past due, per salesperson, bucketed by
+    how overdue it is: < 1h, 1–4h, earlier today, 1–3 days, > 3 days.
+
+    The bucket edges are computed here, so the query is one range scan
+    of ix_call_logs_status_due (status = OPEN, follow_up_datetime <= now)
+    grouped by salesperson — one row per rep comes back.
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    now = datetime.now()
+    hour_ago = now - timedelta(hours=1)
+    four_hours_ago = now - timedelta(hours=4)
+    # "same day" is empty shortly after midnight; older goes to 1–3 days
+    today = min(datetime.combine(now.date(), datetime.min.time()), four_hours_ago)
+    three_days_ago = now - timedelta(days=3)
+
+    due = CallLog.follow_up_datetime
+    bucket = case(
+        (due > hour_ago, "under_1h"),
+        (due > four_hours_ago, "1h_4h"),
+        (due >= today, "same_day"),
+        (due >= three_days_ago, "1d_3d"),
+        else_="over_3d"
+    )
+
+    rows = db.execute(
+        select(
+            CallLog.salesperson_id,
+            *(func.count(case((bucket == b, 1))).label(b) for b in AGING_BUCKETS),
+            func.count().label("total"),
+            func.min(due).label("oldest")
+        )
+        .where(CallLog.status == "OPEN", due.isnot(None), due <= now)
+        .group_by(CallLog.salesperson_id)
+    ).all()
+
+    names = dict(db.query(User.id, User.name).filter(User.role == "SALESPERSON").all())
+
+    out = []
+    for r in rows:
+        out.append({
+            "salesperson_id": r.salesperson_id,
+            "salesperson": (
+                names.get(r.salesperson_id, r.salesperson_id)
+                if r.salesperson_id is not None else "Unassigned"
+            ),
+            "overdue": r.total,
+            **{b: getattr(r, b) for b in AGING_BUCKETS},
+            "oldest_follow_up": r.oldest,
+        })
+
+    # reps with nothing overdue still get a row
+    listed = {g["salesperson_id"] for g in out}
+    for sp_id, name in names.items():
+        if sp_id not in listed:
+            out.append({
+                "salesperson_id": sp_id,
+                "salesperson": name,
+                "overdue": 0,
+                **{b: 0 for b in AGING_BUCKETS},
+                "oldest_follow_up": None,
+            })
+
+    out.sort(key=lambda g: (g["over_3d"], g["overdue"]), reverse=True)
+
+    return {
+        "as_of": now,
+        "buckets": list(AGING_BUCKETS),
+        "totals": {
+            key: sum(g[key] for g in out)
+            for key in ("overdue", *AGING_BUCKETS)
+        },
+        "salespersons": out
+    }
+
+
 # ==================================================
 # ADMIN LEADS
 # ==================================================
@@ -215,8 +344,8 @@ def admin_leads(
     from_date: str | None = None,
     to_date: str | None = None,
     span: str | None = None,
-    user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
 ):
     if user.role != "ADMIN":
         raise HTTPException(status_code=403)
@@ -229,31 +358,342 @@ def admin_leads(
         span=span
     )
 
-    q = db.query(Lead, User.name).join(User, User.id == Lead.salesperson_id)
+    # unassigned (bulk-imported) leads are listed too
+    q = (
+        select(
+            Lead.id,
+            Lead.client_name,
+            Lead.contact_number,
+            Lead.query_source,
+            Lead.query_product,
+            Lead.state,
+            Lead.status,
+            Lead.created_at,
+            User.name.label("salesperson")
+        )
+        .outerjoin(User, User.id == Lead.salesperson_id)
+    )
 
     if salesperson_id:
-        q = q.filter(Lead.salesperson_id == salesperson_id)
+        q = q.where(Lead.salesperson_id == salesperson_id)
 
     if start:
-        q = q.filter(Lead.created_at >= start)
+        q = q.where(Lead.created_at >= start)
     if end:
-        q = q.filter(Lead.created_at <= end)
+        q = q.where(Lead.created_at <= end)
+
+    return fetch_dicts(db, q.order_by(Lead.created_at.desc()))
+
+
+# ==================================================
+# BULK LEAD IMPORT + AUTO-ASSIGNMENT
+# ==================================================
+IMPORT_MAX_ROWS = 100_000
+
+
+@router.post("/leads/import")
+def import_leads(
+    data: dict,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk insert campaign leads as unassigned (salesperson_id NULL);
+    hand them out with POST /admin/leads/assign.
+
+    Body: {"leads": [{"client_name", "contact_number", "query_source",
+    "query_product", "state"}, ...]}
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    items = data.get("leads") or []
+    if len(items) > IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {IMPORT_MAX_ROWS} leads per import"
+        )
+
+    rows, skipped = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get("client_name") or not item.get("contact_number"):
+            skipped.append(index)
+            continue
+        rows.append({
+            "client_name": item["client_name"],
+            "contact_number": str(item["contact_number"]),
+            "phone_normalized": normalize_phone(item["contact_number"]),
+            "query_source": item.get("query_source"),
+            "query_product": item.get("query_product"),
+            "state": item.get("state"),
+            "salesperson_id": None,
+            "status": "NEW"
+        })
+
+    if rows:
+        # new sources get their lookup rows before this transaction writes
+        register_sources({r["query_source"] for r in rows})
+        db.execute(insert(Lead), rows)
+        db.commit()
+
+    return {"imported": len(rows), "skipped": skipped}
+
+
+@router.post("/leads/assign")
+def assign_unassigned_leads(
+    data: dict,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Distribute unassigned leads across active salespersons.
+
+    Body: {"strategy": "round_robin" | "least_open" | "affinity",
+    "affinity": "state" | "product", "lead_ids": [...],
+    "salesperson_ids": [...], "limit": n} — all but strategy optional.
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    strategy = data.get("strategy", "least_open")
+    affinity = data.get("affinity", "state")
+
+    if strategy not in STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"strategy must be one of {list(STRATEGIES)}")
+    if affinity not in AFFINITY_FIELDS:
+        raise HTTPException(status_code=400, detail=f"affinity must be one of {sorted(AFFINITY_FIELDS)}")
+
+    result = assign_leads(
+        db,
+        strategy,
+        lead_ids=data.get("lead_ids"),
+        salesperson_ids=data.get("salesperson_ids"),
+        limit=data.get("limit"),
+        affinity=affinity
+    )
+
+    for salesperson_id, count in result["plan"].items():
+        publish_after_commit(
+            db, "leads_assigned",
+            salesperson_id=salesperson_id, count=count
+        )
+    db.commit()
+
+    names = dict(db.query(User.id, User.name).filter(User.id.in_(result["plan"])).all())
+    return {
+        "strategy": strategy,
+        "assigned": result["assigned"],
+        "per_salesperson": [
+            {"salesperson_id": sp, "salesperson": names.get(sp), "count": count}
+            for sp, count in sorted(result["plan"].items(), key=lambda kv: -kv[1])
+        ]
+    }
+
+
+# ==================================================
+# BULK REASSIGN / CLOSE / REOPEN (SET-BASED)
+# ==================================================
+def _bulk_filters(data: dict):
+    """
+    The selection part of a bulk request body: any of salesperson_id,
+    call_ids, lead_ids, state, query_product, query_source, from_date,
+    to_date. At least one is required, so an empty body never touches
+    every row.
+    """
+    filters = {k: data[k] for k in FILTER_KEYS if data.get(k) not in (None, "", [])}
+    if not filters:
+        raise HTTPException(status_code=400, detail=f"Select rows with at least one of {list(FILTER_KEYS)}")
+
+    for key in ("from_date", "to_date"):
+        if key in filters:
+            try:
+                datetime.fromisoformat(filters[key])
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail=f"{key} must be an ISO date")
+    return filters
+
+
+def _publish_per_owner(db: Session, event_type: str, calls):
+    # one live update per affected rep, not one per call
+    counts = {}
+    for call in calls:
+        counts[call.salesperson_id] = counts.get(call.salesperson_id, 0) + 1
+    for salesperson_id, count in counts.items():
+        publish_after_commit(db, event_type, salesperson_id=salesperson_id, count=count)
+
+
+@router.post("/reassign")
+def bulk_reassign(
+    data: dict,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Move leads and calls to another salesperson (e.g. when a rep
+    leaves). Body: selection (see _bulk_filters) + {"to_salesperson_id":
+    id, "include_closed": false}. OPEN calls with their pending
+    follow-ups and not-yet-called leads move; closed calls stay with
+    whoever closed them unless include_closed.
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    filters = _bulk_filters(data)
+    target = db.get(User, data.get("to_salesperson_id") or 0)
+    if not target or target.role != "SALESPERSON" or target.is_active is False:
+        raise HTTPException(status_code=400, detail="to_salesperson_id must be an active salesperson")
+
+    result = reassign(db, filters, target.id, user.id, bool(data.get("include_closed")))
+
+    for previous, count in result["from"].items():
+        publish_after_commit(
+            db, "calls_reassigned",
+            salesperson_id=previous, to_salesperson_id=target.id, count=count
+        )
+    publish_after_commit(
+        db, "calls_reassigned",
+        salesperson_id=target.id, to_salesperson_id=target.id, count=result["calls"]
+    )
+    db.commit()
+
+    phone_index.refresh(result["lead_ids"], result["call_ids"])
+
+    return {
+        "to_salesperson_id": target.id,
+        "calls": result["calls"],
+        "leads": result["leads"],
+        "follow_ups": result["follow_ups"],
+        "from": [
+            {"salesperson_id": sp, "calls": count}
+            for sp, count in sorted(result["from"].items(), key=lambda kv: -kv[1])
+        ]
+    }
+
+
+@router.post("/calls/close")
+def bulk_close_calls(
+    data: dict,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Close every selected OPEN call. Body: selection + optional
+    {"call_outcome": ...} to record on the calls.
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    filters = _bulk_filters(data)
+    outcome = data.get("call_outcome")
+    if outcome and outcome not in OUTCOMES:
+        raise HTTPException(status_code=400, detail=f"call_outcome must be one of {list(OUTCOMES)}")
+
+    calls = close_calls(db, filters, user.id, outcome)
+    _publish_per_owner(db, "calls_closed", calls)
+    db.commit()
+
+    phone_index.refresh(call_ids=[c.id for c in calls])
+    cancel_followup_reminders([c.id for c in calls])
+
+    return {"closed": len(calls)}
+
+
+@router.post("/calls/reopen")
+def bulk_reopen_calls(
+    data: dict,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Reopen every selected CLOSED call. Body: selection + optional
+    {"follow_up_datetime": ISO} for the new follow-up (default: now,
+    i.e. due straight away, with no reminder) and
+    {"include_closing_outcomes": true} to also reopen calls closed as
+    Purchased / Not Required (skipped otherwise).
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    filters = _bulk_filters(data)
+    try:
+        follow_at = datetime.fromisoformat(data["follow_up_datetime"]) if data.get("follow_up_datetime") else datetime.now()
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="follow_up_datetime must be an ISO datetime")
+
+    calls = reopen_calls(db, filters, user.id, follow_at, bool(data.get("include_closing_outcomes")))
+    _publish_per_owner(db, "calls_reopened", calls)
+    db.commit()
+
+    phone_index.refresh(call_ids=[c.id for c in calls])
+    # a follow-up due now is already in the queue: only future ones get a job
+    schedule_followup_reminders({c.id: follow_at for c in calls})
+
+    return {"reopened": len(calls)}
+
+
+# ==================================================
+# DUPLICATE LEADS (ACROSS SALESPERSONS)
+# ==================================================
+@router.post("/leads/dedupe")
+def run_lead_dedupe(
+    data: dict | None = None,
+    user=Depends(get_current_user)
+):
+    """
+    Run the duplicate pass now (it also runs nightly). Body:
+    {"mode": "flag" | "merge", "full": false}
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    data = data or {}
+    mode = data.get("mode", "flag")
+    if mode not in ("flag", "merge"):
+        raise HTTPException(status_code=400, detail="mode must be 'flag' or 'merge'")
+
+    return dedupe_leads(mode=mode, full=bool(data.get("full")))
 
-    rows = q.order_by(Lead.created_at.desc()).all()
+
+@router.get("/leads/duplicates")
+def list_duplicate_leads(
+    limit: int = 200,
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
+):
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    original = aliased(Lead)
+    dup_owner = aliased(User)
+    original_owner = aliased(User)
+
+    rows = (
+        db.query(
+            Lead.id, Lead.client_name, Lead.contact_number, Lead.query_source,
+            Lead.status, dup_owner.name,
+            original.id, original.client_name, original.contact_number,
+            original.query_source, original_owner.name
+        )
+        .join(original, original.id == Lead.duplicate_of_id)
+        .outerjoin(dup_owner, dup_owner.id == Lead.salesperson_id)
+        .outerjoin(original_owner, original_owner.id == original.salesperson_id)
+        .order_by(Lead.id.desc())
+        .limit(max(1, min(limit, 1000)))
+        .all()
+    )
 
     return [
         {
-            "id": l.id,
-            "client_name": l.client_name,
-            "contact_number": l.contact_number,
-            "query_source": l.query_source,
-            "query_product": l.query_product,
-            "state": l.state,
-            "status": l.status,
-            "created_at": l.created_at,
-            "salesperson": salesperson_name
+            "lead": {
+                "id": r[0], "client_name": r[1], "contact_number": r[2],
+                "query_source": r[3], "status": r[4], "salesperson": r[5]
+            },
+            "duplicate_of": {
+                "id": r[6], "client_name": r[7], "contact_number": r[8],
+                "query_source": r[9], "salesperson": r[10]
+            }
         }
-        for l, salesperson_name in rows
+        for r in rows
     ]
 
 
@@ -268,8 +708,8 @@ def admin_calls(
     from_date: str | None = None,
     to_date: str | None = None,
     span: str | None = None,
-    user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
 ):
     if user.role != "ADMIN":
         raise HTTPException(status_code=403)
@@ -282,32 +722,30 @@ def admin_calls(
         span=span
     )
 
-    q = db.query(CallLog, User.name).join(User, User.id == CallLog.salesperson_id)
+    q = (
+        select(
+            CallLog.id,
+            CallLog.client_name,
+            CallLog.contact_number,
+            CallLog.query_product,
+            CallLog.call_outcome,
+            CallLog.status,
+            CallLog.follow_up_datetime,
+            CallLog.created_at,
+            User.name.label("salesperson")
+        )
+        .join(User, User.id == CallLog.salesperson_id)
+    )
 
     if salesperson_id:
-        q = q.filter(CallLog.salesperson_id == salesperson_id)
+        q = q.where(CallLog.salesperson_id == salesperson_id)
 
     if start:
-        q = q.filter(CallLog.created_at >= start)
+        q = q.where(CallLog.created_at >= start)
     if end:
-        q = q.filter(CallLog.created_at <= end)
-
-    rows = q.order_by(CallLog.created_at.desc()).all()
+        q = q.where(CallLog.created_at <= end)
 
-    return [
-        {
-            "id": c.id,
-            "client_name": c.client_name,
-            "contact_number": c.contact_number,
-            "query_product": c.query_product,
-            "call_outcome": c.call_outcome,
-            "status": c.status,
-            "follow_up_datetime": c.follow_up_datetime,
-            "created_at": c.created_at,
-            "salesperson": salesperson_name
-        }
-        for c, salesperson_name in rows
-    ]
+    return fetch_dicts(db, q.order_by(CallLog.created_at.desc()))
 
 
 # ==================================================
@@ -320,8 +758,8 @@ def admin_performance_cards(
     month: str | None = None,
     from_date: str | None = None,
     to_date: str | None = None,
-    user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
 ):
     if user.role != "ADMIN":
         raise HTTPException(status_code=403)
@@ -340,32 +778,24 @@ def admin_performance_cards(
     for sp in salespersons:
         lead_q = db.query(Lead).filter(Lead.salesperson_id == sp.id)
         call_q = db.query(CallLog).filter(CallLog.salesperson_id == sp.id)
-        followup_q = db.query(CallFollowUp).filter(CallFollowUp.salesperson_id == sp.id)
+        purchased_q = call_q.filter(CallLog.purchased_at.isnot(None))
 
         if start:
             lead_q = lead_q.filter(Lead.created_at >= start)
             call_q = call_q.filter(CallLog.created_at >= start)
-            followup_q = followup_q.filter(CallFollowUp.created_at >= start)
+            purchased_q = purchased_q.filter(CallLog.purchased_at >= start)
 
         if end:
             lead_q = lead_q.filter(Lead.created_at <= end)
             call_q = call_q.filter(CallLog.created_at <= end)
-            followup_q = followup_q.filter(CallFollowUp.created_at <= end)
+            purchased_q = purchased_q.filter(CallLog.purchased_at <= end)
 
         total_leads = lead_q.count()
         new_leads = lead_q.filter(Lead.status == "NEW").count()
 
         total_calls = call_q.count()
 
-        purchased_calls = call_q.filter(
-            CallLog.call_outcome == "Purchased"
-        ).count()
-
-        purchased_followups = followup_q.filter(
-            CallFollowUp.outcome == "Purchased"
-        ).count()
-
-        purchased = purchased_calls + purchased_followups
+        purchased = purchased_q.count()
 
         conversion = (
             round((purchased / total_calls) * 100, 2)
@@ -381,4 +811,345 @@ def admin_performance_cards(
             "conversion_rate": conversion
         })
 
-    return out
\ No newline at end of file
+    return out
+
+# ==================================================
+# ADMIN FUNNEL / TIME-TO-CLOSE ANALYTICS (IN-DATABASE)
+# ==================================================
+FUNNEL_GROUPS = {
+    "salesperson": Lead.salesperson_id,
+    "source": Lead.query_source,
+    "product": Lead.query_product,
+}
+
+
+def _hours(seconds):
+    return round(seconds / 3600, 2) if seconds is not None else None
+
+
+@router.get("/funnel")
+def admin_funnel(
+    group_by: str = "salesperson",
+    salesperson_id: int | None = None,
+    single_date: str | None = None,
+    month: str | None = None,
+    from_date: str | None = None,
+    to_date: str | None = None,
+    span: str | None = None,
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Lead → first call → follow-up → purchase funnel per salesperson,
+    source or product, for leads created in the date range.
+
+    Also: average time to first call, touches before close (first call
+    + follow-ups) and median / p90 time from lead to closed call.
+    Everything is aggregated in one SQL statement — window functions
+    pick each lead's first call, percentile_cont (or a window-based
+    nearest-rank fallback on SQLite) computes the percentiles — so only
+    one row per group comes back.
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    if group_by not in FUNNEL_GROUPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"group_by must be one of {sorted(FUNNEL_GROUPS)}"
+        )
+
+    start, end = resolve_date_range(
+        single_date=single_date,
+        month=month,
+        from_date=from_date,
+        to_date=to_date,
+        span=span
+    )
+
+    # each lead's first call
+    first_calls = (
+        select(
+            CallLog.id.label("call_id"),
+            CallLog.lead_id,
+            CallLog.created_at.label("called_at"),
+            CallLog.status,
+            CallLog.completed_at,
+            CallLog.followup_count,
+            CallLog.purchased_at,
+            func.row_number().over(
+                partition_by=CallLog.lead_id,
+                order_by=(CallLog.created_at, CallLog.id)
+            ).label("rn")
+        )
+        .where(CallLog.lead_id.isnot(None))
+        .subquery("first_calls")
+    )
+
+    closed_at = case(
+        (
+            first_calls.c.status == "CLOSED",
+            func.coalesce(first_calls.c.completed_at, first_calls.c.called_at)
+        )
+    )
+
+    per_lead = (
+        select(
+            FUNNEL_GROUPS[group_by].label("grp"),
+            Lead.id.label("lead_id"),
+            first_calls.c.call_id,
+            first_calls.c.followup_count.label("touches"),
+            first_calls.c.purchased_at,
+            closed_at.label("closed_at"),
+            seconds_between(db, first_calls.c.called_at, Lead.created_at).label("ttfc"),
+            seconds_between(db, closed_at, Lead.created_at).label("ttc")
+        )
+        .select_from(Lead)
+        .outerjoin(
+            first_calls,
+            and_(first_calls.c.lead_id == Lead.id, first_calls.c.rn == 1)
+        )
+    )
+
+    if salesperson_id:
+        per_lead = per_lead.where(Lead.salesperson_id == salesperson_id)
+    if start:
+        per_lead = per_lead.where(Lead.created_at >= start)
+    if end:
+        per_lead = per_lead.where(Lead.created_at <= end)
+
+    per_lead = per_lead.cte("per_lead")
+
+    p50 = percentile_aggregate(db, 0.5, per_lead.c.ttc)
+    p90 = percentile_aggregate(db, 0.9, per_lead.c.ttc)
+
+    summary = (
+        select(
+            per_lead.c.grp,
+            func.count(per_lead.c.lead_id).label("leads"),
+            func.count(per_lead.c.call_id).label("called"),
+            func.count(case((per_lead.c.touches > 0, 1))).label("followed_up"),
+            func.count(per_lead.c.purchased_at).label("purchased"),
+            func.count(per_lead.c.closed_at).label("closed"),
+            func.avg(per_lead.c.ttfc).label("avg_ttfc"),
+            func.avg(
+                case(
+                    (
+                        per_lead.c.closed_at.isnot(None),
+                        1 + func.coalesce(per_lead.c.touches, 0)
+                    )
+                )
+            ).label("avg_touches"),
+        )
+        .group_by(per_lead.c.grp)
+    )
+
+    if p50 is not None:
+        summary = summary.add_columns(p50.label("p50"), p90.label("p90"))
+    else:
+        pct = nearest_rank_percentiles(
+            per_lead.c.grp, per_lead.c.ttc, (0.5, 0.9)
+        )
+        summary = (
+            summary
+            .outerjoin(pct, pct.c.grp.is_not_distinct_from(per_lead.c.grp))
+            .add_columns(func.max(pct.c.p50).label("p50"), func.max(pct.c.p90).label("p90"))
+        )
+
+    rows = db.execute(summary).all()
+
+    names = {}
+    if group_by == "salesperson":
+        names = dict(db.query(User.id, User.name).all())
+
+    out = []
+    for r in rows:
+        out.append({
+            "group": (
+                (names.get(r.grp, r.grp) if r.grp is not None else "Unassigned")
+                if group_by == "salesperson" else (r.grp or "Unknown")
+            ),
+            "salesperson_id": r.grp if group_by == "salesperson" else None,
+            "leads": r.leads,
+            "called": r.called,
+            "followed_up": r.followed_up,
+            "purchased": r.purchased,
+            "closed": r.closed,
+            "lead_to_call_rate": round(r.called / r.leads * 100, 2) if r.leads else 0,
+            "call_to_purchase_rate": round(r.purchased / r.called * 100, 2) if r.called else 0,
+            "avg_time_to_first_call_hours": _hours(r.avg_ttfc),
+            "avg_touches_to_close": round(r.avg_touches, 2) if r.avg_touches is not None else None,
+            "median_time_to_close_hours": _hours(r.p50),
+            "p90_time_to_close_hours": _hours(r.p90),
+        })
+
+    out.sort(key=lambda g: g["leads"], reverse=True)
+
+    return {
+        "group_by": group_by,
+        "totals": {
+            key: sum(g[key] for g in out)
+            for key in ("leads", "called", "followed_up", "purchased", "closed")
+        },
+        "groups": out
+    }
+
+
+# ==================================================
+# ADMIN CUBE (PIVOT OVER STATE / PRODUCT / SOURCE / OUTCOME / REP)
+# ==================================================
+cube_cache = TTLCache(CUBE_CACHE_SECONDS, CUBE_CACHE_MAX_ENTRIES)
+
+# any committed call / lead write may change the counts
+add_commit_listener(cube_cache.clear)
+
+
+@router.get("/cube")
+def admin_cube(
+    dims: str = "",
+    salesperson_id: int | None = None,
+    single_date: str | None = None,
+    month: str | None = None,
+    from_date: str | None = None,
+    to_date: str | None = None,
+    span: str | None = None,
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Call counts and conversion for calls created in the date range,
+    grouped by up to three of state, product, source, outcome and
+    salesperson (`dims=state,outcome`). Every subtotal comes back too:
+    a cell lists only the dimensions it is grouped by, so {} is the
+    grand total and {"state": "Kerala"} the Kerala row total.
+
+    Results are cached per dimension set and filters for
+    CUBE_CACHE_SECONDS and dropped whenever a write commits here. For
+    READ_YOUR_WRITES_SECONDS after that, refills read the primary: a
+    replica may not have the write yet and its counts would otherwise
+    be cached for the whole TTL.
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    dim_list = [d.strip() for d in dims.split(",") if d.strip()]
+    unknown = [d for d in dim_list if d not in CUBE_DIMENSIONS]
+    if unknown or len(dim_list) > CUBE_MAX_DIMENSIONS or len(set(dim_list)) != len(dim_list):
+        raise HTTPException(
+            status_code=400,
+            detail=f"dims: up to {CUBE_MAX_DIMENSIONS} distinct of {sorted(CUBE_DIMENSIONS)}"
+        )
+
+    start, end = resolve_date_range(
+        single_date=single_date,
+        month=month,
+        from_date=from_date,
+        to_date=to_date,
+        span=span
+    )
+
+    key = (tuple(dim_list), salesperson_id, start, end)
+    cached = cube_cache.get(key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    filters = []
+    if salesperson_id:
+        filters.append(CallLog.salesperson_id == salesperson_id)
+    if start:
+        filters.append(CallLog.created_at >= start)
+    if end:
+        filters.append(CallLog.created_at <= end)
+
+    generation = cube_cache.generation
+    if db.get_bind() is not get_engine() and cube_cache.cleared_within(READ_YOUR_WRITES_SECONDS):
+        primary = SessionLocal()
+        try:
+            result = _cube_result(primary, dim_list, filters)
+        finally:
+            primary.close()
+    else:
+        result = _cube_result(db, dim_list, filters)
+
+    cube_cache.set(key, result, generation)
+    return {**result, "cached": False}
+
+
+def _cube_result(db: Session, dim_list: list, filters: list):
+    rows = cube_query(db, dim_list, filters)
+
+    names = {}
+    if "salesperson" in dim_list:
+        names = dict(db.query(User.id, User.name).all())
+
+    cells = []
+    for r in rows:
+        cell = {}
+        for d in dim_list:
+            if getattr(r, f"g_{d}"):
+                continue
+            value = getattr(r, d)
+            if d == "salesperson":
+                cell["salesperson_id"] = value
+                value = names.get(value, value)
+            cell[d] = value if value is not None else "Unknown"
+
+        cells.append({
+            **cell,
+            "calls": r.calls,
+            "closed": r.closed,
+            "purchased": r.purchased,
+            "follow_ups": r.follow_ups,
+            "conversion_rate": round(r.purchased / r.calls * 100, 2) if r.calls else 0,
+        })
+
+    # grand total first, then coarser subtotals before finer cells
+    cells.sort(key=lambda c: (sum(d in c for d in dim_list), -c["calls"]))
+
+    return {"dims": dim_list, "cells": cells}
+
+
+# ==================================================
+# SCHEDULER JOB TELEMETRY (ALL WORKERS)
+# ==================================================
+@router.get("/scheduler")
+def scheduler_stats(
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Per job: runs, failures, missed and skipped (overlapping) runs,
+    duration, lag behind schedule, rows scanned and emails sent /
+    failed, plus the next scheduled run from the shared job store.
+    """
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    jobs = job_stats(db)
+    for job in jobs:
+        scheduled = scheduler.get_job(job["name"]) if scheduler.running else None
+        job["next_run_at"] = scheduled.next_run_time if scheduled else None
+
+    return {"jobs": jobs}
+
+
+# ==================================================
+# LOAD SHEDDING COUNTERS (THIS WORKER)
+# ==================================================
+@router.get("/load-shedding")
+def load_shedding_stats(user=Depends(get_current_user)):
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    return load_shedder.stats()
+
+
+# ==================================================
+# CALLER-ID PHONE INDEX SIZE (THIS WORKER)
+# ==================================================
+@router.get("/phone-index")
+def phone_index_stats(user=Depends(get_current_user)):
+    if user.role != "ADMIN":
+        raise HTTPException(status_code=403)
+
+    return phone_index.stats()
@@ -1,15 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import or_, select, insert, update
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from app.deps import get_current_user, get_db
+from app.deps import get_current_user, get_read_user, get_db, get_read_db
 from app.models.call_log import CallLog
 from app.models.call_follow_up import CallFollowUp
+from app.models.call_archive import CallLogArchive, CallFollowUpArchive
 from app.models.lead import Lead          # ✅ NEW
+from app.models.codes import OUTCOMES, register_sources
 from app.models.user import User
+from app.utils.pubsub import publish_after_commit
+from app.utils.call_summary import refresh_call_summaries
+from app.utils.call_events import record_event, record_events
+from app.utils.phone import normalize_phone
+from app.utils.projection import fetch_dicts
+from app.config import QUEUE_DUE_WINDOW_MINUTES
+from app.utils.scheduler import (
+    schedule_followup_reminder,
+    schedule_followup_reminders,
+    cancel_followup_reminder
+)
 import uuid
 
 router = APIRouter(prefix="/calls", tags=["Calls"])
 
+# Follow-up outcomes that close the call
+CLOSING_OUTCOMES = ["Purchased", "Not Required"]
+
 
 # ----------------------------
 # CREATE LEAD OR FIRST CALL (PATCHED)
@@ -21,6 +38,10 @@ def create_call(
     db: Session = Depends(get_db)
 ):
     outcome = data.get("call_outcome")
+    _check_outcome(outcome)
+
+    # a new source gets its lookup row before this transaction writes
+    register_sources([data.get("query_source")])
 
     # =====================================================
     # CASE 1: NO OUTCOME → CREATE LEAD ONLY
@@ -29,6 +50,7 @@ def create_call(
         lead = Lead(
             client_name=data["client_name"],
             contact_number=data["contact_number"],
+            phone_normalized=normalize_phone(data["contact_number"]),
             query_source=data.get("query_source"),
             query_product=data.get("query_product"),
             state=data.get("state"),
@@ -36,6 +58,13 @@ def create_call(
             status="NEW"
         )
         db.add(lead)
+        db.flush()
+        _record_lead_created(db, lead, user)
+
+        publish_after_commit(
+            db, "lead_created",
+            salesperson_id=user.id, lead_id=lead.id
+        )
         db.commit()
 
         return {
@@ -77,6 +106,7 @@ def create_call(
         lead = Lead(
             client_name=data["client_name"],
             contact_number=data["contact_number"],
+            phone_normalized=normalize_phone(data["contact_number"]),
             query_source=data.get("query_source"),
             query_product=data.get("query_product"),
             state=data.get("state"),
@@ -84,13 +114,19 @@ def create_call(
             status="CALLED"
         )
         db.add(lead)
+        db.flush()
+        _record_lead_created(db, lead, user)
         db.commit()
 
-    # ❗ prevent duplicate first call
+    # ❗ prevent duplicate first call (archived calls count too)
     existing_call = (
-        db.query(CallLog)
+        db.query(CallLog.id)
         .filter(CallLog.lead_id == lead.id)
         .first()
+    ) or (
+        db.query(CallLogArchive.id)
+        .filter(CallLogArchive.lead_id == lead.id)
+        .first()
     )
     if existing_call:
         raise HTTPException(
@@ -115,158 +151,283 @@ def create_call(
     lead.status = "CALLED"
 
     db.add(call)
+    db.flush()
+    refresh_call_summaries(db, [call.id])
+
+    record_event(
+        db, "call_logged",
+        call_id=call.id, lead_id=lead.id,
+        salesperson_id=user.id, actor_id=user.id,
+        outcome=outcome, remark=call.remark,
+        follow_up_at=follow_up_datetime, closed=status == "CLOSED",
+        query_source=call.query_source, query_product=call.query_product, state=call.state
+    )
+
+    publish_after_commit(
+        db, "call_logged",
+        salesperson_id=user.id, call_id=call.id, lead_id=lead.id,
+        status=status, outcome=outcome
+    )
+    if status == "CLOSED":
+        publish_after_commit(
+            db, "call_closed",
+            salesperson_id=user.id, call_id=call.id, outcome=outcome
+        )
     db.commit()
 
+    if status == "OPEN":
+        schedule_followup_reminder(call.id, follow_up_datetime)
+
     return {
         "message": "First call logged",
         "call_id": call.id
     }
 
 
+def _check_outcome(outcome, required: bool = False):
+    if (outcome or required) and outcome not in OUTCOMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"call_outcome must be one of {list(OUTCOMES)}"
+        )
+
+
+def _record_lead_created(db: Session, lead: Lead, user):
+    record_event(
+        db, "lead_created",
+        lead_id=lead.id, salesperson_id=lead.salesperson_id, actor_id=user.id,
+        query_source=lead.query_source, query_product=lead.query_product, state=lead.state
+    )
+
+
 # ----------------------------
 # MY CALLS (UNCHANGED)
 # ----------------------------
 @router.get("/my")
-def my_calls(user=Depends(get_current_user), db: Session = Depends(get_db)):
-    rows = (
-        db.query(CallLog)
-        .filter(CallLog.salesperson_id == user.id)
+def my_calls(user=Depends(get_read_user), db: Session = Depends(get_read_db)):
+    return fetch_dicts(
+        db,
+        select(
+            CallLog.id,
+            CallLog.query_source,
+            CallLog.client_name,
+            CallLog.contact_number,
+            CallLog.query_product,
+            CallLog.state,
+            CallLog.call_outcome,
+            CallLog.remark,
+            CallLog.status,
+            CallLog.created_at,
+            CallLog.follow_up_datetime,
+        )
+        .where(CallLog.salesperson_id == user.id)
         .order_by(CallLog.created_at.desc())
-        .all()
     )
 
-    return [
-        {
-            "id": c.id,
-            "query_source": c.query_source,
-            "client_name": c.client_name,
-            "contact_number": c.contact_number,
-            "query_product": c.query_product,
-            "state": c.state,
-            "call_outcome": c.call_outcome,
-            "remark": c.remark,
-            "status": c.status,
-            "created_at": c.created_at,
-            "follow_up_datetime": c.follow_up_datetime,
-        }
-        for c in rows
-    ]
-
 # ----------------------------
 # ALL CALLS (SALESPERSON)
 # ----------------------------
 @router.get("/all-mine")
 def all_my_calls(
-    user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
 ):
-    calls = (
-        db.query(CallLog)
-        .filter(CallLog.salesperson_id == user.id)
+    return fetch_dicts(
+        db,
+        select(
+            CallLog.id,
+            CallLog.client_name,
+            CallLog.contact_number,
+            CallLog.query_source,
+            CallLog.query_product,
+            CallLog.state,
+            CallLog.call_outcome,
+            CallLog.status,
+            CallLog.created_at,
+            CallLog.follow_up_datetime,
+        )
+        .where(CallLog.salesperson_id == user.id)
         .order_by(CallLog.created_at.desc())
-        .all()
     )
 
-    return [
-        {
-            "id": c.id,
-            "client_name": c.client_name,
-            "contact_number": c.contact_number,
-            "query_source": c.query_source,
-            "query_product": c.query_product,
-            "state": c.state,
-            "call_outcome": c.call_outcome,
-            "status": c.status,
-            "created_at": c.created_at,
-            "follow_up_datetime": c.follow_up_datetime
-        }
-        for c in calls
-    ]
-
 
 # ----------------------------
-# FOLLOW-UPS (PATCHED – READ FROM call_follow_ups)
-# ----------------------------
-# ----------------------------
-# FOLLOW-UPS (FIXED – RETURN PRODUCT)
+# FOLLOW-UPS (SUMMARY COLUMNS, NO JOIN)
 # ----------------------------
 @router.get("/follow-ups")
-def get_follow_ups(user=Depends(get_current_user), db: Session = Depends(get_db)):
+def get_follow_ups(user=Depends(get_read_user), db: Session = Depends(get_read_db)):
+    """
+    One row per open call that needs a follow-up: first calls with a
+    follow-up outcome, or calls that already have follow-ups. Outcome
+    and due time come from the call's summary columns.
+    """
     now = datetime.now()
-    result = []
 
-    # ------------------------------------
-    # 1️⃣ FIRST CALLS REQUIRING FOLLOW-UP
-    # ------------------------------------
-    first_calls = (
+    calls = (
         db.query(CallLog)
         .filter(
             CallLog.salesperson_id == user.id,
             CallLog.status == "OPEN",
-            CallLog.call_outcome.in_([
-                "Connected",
-                "Busy",
-                "Not Picked",
-                "Cut-In Between"
-            ])
+            or_(
+                CallLog.followup_count > 0,
+                CallLog.call_outcome.in_([
+                    "Connected",
+                    "Busy",
+                    "Not Picked",
+                    "Cut-In Between"
+                ])
+            )
+        )
+        .order_by(
+            CallLog.next_follow_up_at.is_(None),
+            CallLog.next_follow_up_at.asc()
         )
         .all()
     )
 
-    for call in first_calls:
-        has_followup = (
-            db.query(CallFollowUp)
-            .filter(CallFollowUp.call_id == call.id)
-            .first()
-        )
-        if has_followup:
-            continue
-
-        is_overdue = call.follow_up_datetime and call.follow_up_datetime < now
-
-        result.append({
+    return [
+        {
             "id": call.id,
             "client_name": call.client_name,
-            "contact_number": call.contact_number,      # ✅ ADDED
-            "query_product": call.query_product,        # ✅ ADDED
-            "query_source": call.query_source,          # ✅ ADDED
+            "contact_number": call.contact_number,
+            "query_product": call.query_product,
+            "query_source": call.query_source,
             "state": call.state,
-            "call_outcome": call.call_outcome,
-            "follow_up_datetime": call.follow_up_datetime,
-            "is_overdue": is_overdue
-        })
+            "call_outcome": call.last_outcome,
+            "follow_up_datetime": call.next_follow_up_at,
+            "is_overdue": bool(call.next_follow_up_at and call.next_follow_up_at < now)
+        }
+        for call in calls
+    ]
 
-    # ------------------------------------
-    # 2️⃣ ACTUAL FOLLOW-UPS (OPEN CALLS ONLY)
-    # ------------------------------------
-    followups = (
-        db.query(CallFollowUp, CallLog)
-        .join(CallLog, CallLog.id == CallFollowUp.call_id)
+
+# ----------------------------
+# WORK QUEUE (NEXT DUE / OVERDUE)
+# ----------------------------
+QUEUE_MAX_LIMIT = 100
+QUEUE_CLAIM_MINUTES = 15
+
+
+def _queue_query(db: Session, user, scope: str, now: datetime):
+    """
+    Open calls whose follow-up is due (or due within
+    QUEUE_DUE_WINDOW_MINUTES), in priority order.
+
+    Overdue rows are simply the ones with the earliest
+    follow_up_datetime, so a plain ascending sort already puts them
+    first and lets the partial "open queue" indexes serve the order.
+    Rows claimed by someone else (and not yet expired) are skipped.
+
+    scope=team is the shared queue of the user's team (users.team);
+    admins see every rep's calls, reps without a team get 403.
+    """
+    if scope not in ("mine", "team"):
+        raise HTTPException(status_code=400, detail="scope must be 'mine' or 'team'")
+
+    q = (
+        db.query(CallLog)
         .filter(
-            CallFollowUp.salesperson_id == user.id,
-            CallLog.status == "OPEN"
+            CallLog.status == "OPEN",
+            CallLog.follow_up_datetime.isnot(None),
+            CallLog.follow_up_datetime <= now + timedelta(minutes=QUEUE_DUE_WINDOW_MINUTES),
+            or_(
+                CallLog.claimed_until.is_(None),
+                CallLog.claimed_until < now,
+                CallLog.claimed_by_id == user.id
+            )
         )
-        .order_by(CallFollowUp.follow_up_datetime.asc())
-        .all()
     )
 
-    for f, call in followups:
-        is_overdue = f.follow_up_datetime and f.follow_up_datetime < now
+    if scope == "mine":
+        q = q.filter(CallLog.salesperson_id == user.id)
+    elif user.role != "ADMIN":
+        if not user.team:
+            raise HTTPException(status_code=403, detail="Not on a team")
+        q = q.filter(CallLog.salesperson_id.in_(
+            select(User.id).where(User.team == user.team)
+        ))
 
-        result.append({
-            "id": call.id,
-            "client_name": call.client_name,
-            "contact_number": call.contact_number,      # ✅ ADDED
-            "query_product": call.query_product,        # ✅ ADDED
-            "query_source": call.query_source,          # ✅ ADDED
-            "state": call.state,
-            "call_outcome": f.outcome,
-            "follow_up_datetime": f.follow_up_datetime,
-            "is_overdue": is_overdue
-        })
+    return q.order_by(CallLog.follow_up_datetime.asc(), CallLog.id.asc())
+
+
+def _may_follow_up(user, owner_id, claimed_by_id):
+    """
+    Who may log a follow-up on a call: admins, its owner, and the
+    teammate who claimed it from the team queue.
+    """
+    return user.role == "ADMIN" or user.id in (owner_id, claimed_by_id)
+
+
+def _queue_item(call: CallLog, now: datetime):
+    return {
+        "id": call.id,
+        "client_name": call.client_name,
+        "contact_number": call.contact_number,
+        "query_product": call.query_product,
+        "query_source": call.query_source,
+        "state": call.state,
+        "salesperson_id": call.salesperson_id,
+        "follow_up_datetime": call.follow_up_datetime,
+        "is_overdue": call.follow_up_datetime < now,
+        "claimed_until": call.claimed_until
+    }
+
+
+@router.get("/queue")
+def work_queue(
+    limit: int = 10,
+    scope: str = "mine",
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Peek at the next `limit` due / overdue follow-ups (no claiming).
+    """
+    now = datetime.now()
+    limit = max(1, min(limit, QUEUE_MAX_LIMIT))
+
+    calls = _queue_query(db, user, scope, now).limit(limit).all()
+    return [_queue_item(c, now) for c in calls]
+
+
+@router.post("/queue/claim")
+def claim_work_queue(
+    limit: int = 1,
+    scope: str = "team",
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Claim the next `limit` follow-ups for QUEUE_CLAIM_MINUTES.
+
+    Rows are locked with FOR UPDATE SKIP LOCKED, so reps draining the
+    same team queue concurrently never receive the same call. The claim
+    is released when a follow-up is logged or when it expires.
+    """
+    now = datetime.now()
+    limit = max(1, min(limit, QUEUE_MAX_LIMIT))
+
+    calls = (
+        _queue_query(db, user, scope, now)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
 
-    result.sort(key=lambda x: x["follow_up_datetime"] or datetime.max)
-    return result
+    claimed_until = now + timedelta(minutes=QUEUE_CLAIM_MINUTES)
+    for call in calls:
+        call.claimed_by_id = user.id
+        call.claimed_until = claimed_until
+
+    record_events(db, "call_claimed", [
+        {
+            "call_id": c.id, "lead_id": c.lead_id,
+            "salesperson_id": c.salesperson_id, "actor_id": user.id
+        }
+        for c in calls
+    ])
+    db.commit()
+    return [_queue_item(c, now) for c in calls]
 
 # ----------------------------
 # ADD FOLLOW-UP
@@ -281,6 +442,10 @@ def add_follow_up(
     call = db.query(CallLog).filter(CallLog.id == call_id).first()
     if not call:
         raise HTTPException(status_code=404, detail="Call not found")
+    if not _may_follow_up(user, call.salesperson_id, call.claimed_by_id):
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    _check_outcome(data.get("call_outcome"), required=True)
 
     follow_dt = (
         datetime.fromisoformat(data["follow_up_datetime"])
@@ -300,7 +465,7 @@ def add_follow_up(
 
     # ❌ DO NOT TOUCH call.call_outcome HERE
 
-    if data.get("call_outcome") in ["Purchased", "Not Required"]:
+    if data.get("call_outcome") in CLOSING_OUTCOMES:
         call.status = "CLOSED"
         call.completed_at = datetime.now()
         call.follow_up_datetime = None
@@ -308,9 +473,203 @@ def add_follow_up(
         call.status = "OPEN"
         call.follow_up_datetime = follow_dt
 
+    # release any work-queue claim
+    call.claimed_by_id = None
+    call.claimed_until = None
+
+    refresh_call_summaries(db, [call.id])
+
+    record_event(
+        db, "follow_up",
+        call_id=call.id, lead_id=call.lead_id,
+        salesperson_id=call.salesperson_id, actor_id=user.id,
+        outcome=follow.outcome, remark=follow.remark,
+        follow_up_at=follow_dt, closed=call.status == "CLOSED"
+    )
+
+    publish_after_commit(
+        db, "follow_up_added",
+        salesperson_id=call.salesperson_id, call_id=call.id,
+        outcome=follow.outcome, follow_up_datetime=follow_dt
+    )
+    if call.status == "CLOSED":
+        publish_after_commit(
+            db, "call_closed",
+            salesperson_id=call.salesperson_id, call_id=call.id,
+            outcome=follow.outcome
+        )
+
     db.commit()
+
+    # 🔔 move (or cancel) this call's reminder
+    schedule_followup_reminder(call.id, call.follow_up_datetime)
+
     return {"message": "Follow-up saved"}
 
+# ----------------------------
+# BATCH FOLLOW-UPS (DIAL-PAD SESSIONS)
+# ----------------------------
+BATCH_MAX_ITEMS = 500
+
+
+@router.post("/follow-ups/batch")
+def add_follow_ups_batch(
+    data: dict,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Save many follow-ups in one round trip.
+
+    Body: {"items": [{"call_id", "call_outcome", "remark",
+    "follow_up_datetime"}, ...]}. Target calls are loaded with a single
+    IN query, follow-ups are bulk inserted and call status is updated
+    set-based, all in one commit. Invalid items are reported per index
+    and do not block the rest; if a call appears more than once, its
+    last item decides the call's status.
+    """
+    items = data.get("items") or []
+
+    if len(items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BATCH_MAX_ITEMS} items per batch"
+        )
+
+    now = datetime.now()
+
+    call_ids = {
+        item.get("call_id")
+        for item in items
+        if isinstance(item, dict) and type(item.get("call_id")) is int
+    }
+    targets = db.execute(
+        select(CallLog.id, CallLog.salesperson_id, CallLog.lead_id, CallLog.claimed_by_id)
+        .where(CallLog.id.in_(call_ids))
+    ).all() if call_ids else []
+    owners = {t.id: t.salesperson_id for t in targets}
+    lead_ids = {t.id: t.lead_id for t in targets}
+    claimers = {t.id: t.claimed_by_id for t in targets}
+
+    results = []
+    followup_rows = []
+    final_state = {}    # call id -> (closes_call, follow_up_datetime)
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append({"index": index, "ok": False, "error": "Invalid item"})
+            continue
+
+        call_id = item.get("call_id")
+        outcome = item.get("call_outcome")
+        error = None
+        follow_dt = None
+
+        # bools are ints, lists / dicts cannot be looked up
+        if type(call_id) is not int:
+            results.append({"index": index, "ok": False, "error": "Invalid call_id"})
+            continue
+
+        if call_id not in owners:
+            error = "Call not found"
+        elif not _may_follow_up(user, owners[call_id], claimers[call_id]):
+            error = "Not allowed"
+        elif not outcome:
+            error = "call_outcome is required"
+        elif outcome not in OUTCOMES:
+            error = "Unknown call_outcome"
+        elif item.get("follow_up_datetime"):
+            try:
+                follow_dt = datetime.fromisoformat(item["follow_up_datetime"])
+            except (TypeError, ValueError):
+                error = "Invalid follow_up_datetime"
+
+        if error:
+            results.append({"index": index, "call_id": call_id, "ok": False, "error": error})
+            continue
+
+        followup_rows.append({
+            "call_id": call_id,
+            "salesperson_id": user.id,
+            "outcome": outcome,
+            "remark": item.get("remark"),
+            "follow_up_datetime": follow_dt
+        })
+        final_state[call_id] = (outcome in CLOSING_OUTCOMES, follow_dt)
+        results.append({"index": index, "call_id": call_id, "ok": True})
+
+    if followup_rows:
+        db.execute(insert(CallFollowUp), followup_rows)
+
+        closed_ids = [cid for cid, (closes, _) in final_state.items() if closes]
+        if closed_ids:
+            db.execute(
+                update(CallLog)
+                .where(CallLog.id.in_(closed_ids))
+                .values(
+                    status="CLOSED",
+                    completed_at=now,
+                    follow_up_datetime=None,
+                    claimed_by_id=None,
+                    claimed_until=None
+                )
+            )
+
+        # bulk UPDATE by primary key — one executemany round trip
+        open_rows = [
+            {
+                "id": cid,
+                "status": "OPEN",
+                "follow_up_datetime": follow_dt,
+                "claimed_by_id": None,
+                "claimed_until": None
+            }
+            for cid, (closes, follow_dt) in final_state.items()
+            if not closes
+        ]
+        if open_rows:
+            db.execute(update(CallLog), open_rows)
+
+        refresh_call_summaries(db, final_state.keys())
+
+        record_events(db, "follow_up", [
+            {
+                "call_id": row["call_id"], "lead_id": lead_ids[row["call_id"]],
+                "salesperson_id": owners[row["call_id"]], "actor_id": user.id,
+                "outcome": row["outcome"], "remark": row["remark"],
+                "follow_up_at": row["follow_up_datetime"],
+                "closed": row["outcome"] in CLOSING_OUTCOMES
+            }
+            for row in followup_rows
+        ])
+
+        for row in followup_rows:
+            publish_after_commit(
+                db, "follow_up_added",
+                salesperson_id=owners[row["call_id"]], call_id=row["call_id"],
+                outcome=row["outcome"], follow_up_datetime=row["follow_up_datetime"]
+            )
+        for cid in closed_ids:
+            publish_after_commit(
+                db, "call_closed",
+                salesperson_id=owners[cid], call_id=cid
+            )
+
+        db.commit()
+
+        # 🔔 every moved / cancelled reminder in one job-store write
+        schedule_followup_reminders({
+            cid: None if closes else follow_dt
+            for cid, (closes, follow_dt) in final_state.items()
+        })
+
+    return {
+        "saved": len(followup_rows),
+        "failed": len(items) - len(followup_rows),
+        "results": results
+    }
+
+
 # ----------------------------
 # FOLLOW-UP HISTORY (FILTER CLOSURE)
 # ----------------------------
@@ -321,6 +680,19 @@ def call_follow_up_history(
     db: Session = Depends(get_db)
 ):
     call = db.query(CallLog).filter(CallLog.id == call_id).first()
+    archived = False
+    FollowUpModel = CallFollowUp
+
+    # 🗄️ closed calls past retention live in the archive tables
+    if not call:
+        call = (
+            db.query(CallLogArchive)
+            .filter(CallLogArchive.id == call_id)
+            .first()
+        )
+        archived = True
+        FollowUpModel = CallFollowUpArchive
+
     if not call:
         raise HTTPException(status_code=404)
 
@@ -329,9 +701,9 @@ def call_follow_up_history(
 
     # ✅ IMPORTANT: DO NOT FILTER BY OUTCOME
     followups = (
-        db.query(CallFollowUp)
-        .filter(CallFollowUp.call_id == call.id)
-        .order_by(CallFollowUp.created_at.asc())
+        db.query(FollowUpModel)
+        .filter(FollowUpModel.call_id == call.id)
+        .order_by(FollowUpModel.created_at.asc())
         .all()
     )
 
@@ -346,7 +718,11 @@ def call_follow_up_history(
             "first_call_outcome": call.call_outcome,
             "first_follow_up_datetime": call.follow_up_datetime,
             "created_at": call.created_at,
-            "status": call.status
+            "status": call.status,
+            "followup_count": None if archived else call.followup_count,
+            "last_outcome": None if archived else call.last_outcome,
+            "purchased_at": None if archived else call.purchased_at,
+            "archived": archived
         },
         "followups": [
             {
@@ -406,15 +782,39 @@ def update_call(
     if call.salesperson_id != user.id and user.role != "ADMIN":
         raise HTTPException(status_code=403)
 
-    call.call_outcome = data.get("call_outcome", call.call_outcome)
+    _check_outcome(data.get("call_outcome"))
+
+    # an empty / null call_outcome (remark-only edit) keeps the current one
+    call.call_outcome = data.get("call_outcome") or call.call_outcome
     call.remark = data.get("remark", call.remark)
+    was_open = call.status != "CLOSED"
 
     if call.call_outcome in ["Not Required", "Purchased"]:
         call.status = "CLOSED"
         call.follow_up_datetime = None
         call.completed_at = datetime.now()
 
+    # outcome / remark edits change the cube and caller-ID entries too
+    publish_after_commit(
+        db, "call_closed" if was_open and call.status == "CLOSED" else "call_updated",
+        salesperson_id=call.salesperson_id, call_id=call.id, lead_id=call.lead_id,
+        outcome=call.call_outcome
+    )
+
+    refresh_call_summaries(db, [call.id])
+
+    record_event(
+        db, "call_updated",
+        call_id=call.id, lead_id=call.lead_id,
+        salesperson_id=call.salesperson_id, actor_id=user.id,
+        outcome=call.call_outcome, remark=call.remark,
+        closed=was_open and call.status == "CLOSED"
+    )
     db.commit()
+
+    if call.status == "CLOSED":
+        cancel_followup_reminder(call.id)
+
     return {"message": "Call updated"}
 
 
@@ -429,15 +829,22 @@ def all_calls(
     month: str | None = None,
     from_date: str | None = None,
     to_date: str | None = None,
-    user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
 ):
     if user.role != "ADMIN":
         raise HTTPException(status_code=403, detail="Admin only")
 
+    # plain column tuples, no ORM entities
     query = (
-        db.query(
-            CallLog,
+        select(
+            CallLog.id,
+            CallLog.client_name,
+            CallLog.query_product,
+            CallLog.call_outcome,
+            CallLog.status,
+            CallLog.created_at,
+            CallLog.follow_up_datetime,
             User.name.label("salesperson_name")
         )
         .join(User, User.id == CallLog.salesperson_id)
@@ -475,7 +882,7 @@ def all_calls(
         end = start + timedelta(days=1)
         query = query.filter(CallLog.created_at >= start, CallLog.created_at < end)
 
-    rows = query.all()
+    rows = db.execute(query).all()
 
     return [
         {
@@ -485,7 +892,7 @@ def all_calls(
             "call_outcome": c.call_outcome,
             "status": c.status,
             "created_at": c.created_at,
-            "salesperson_name": salesperson_name,
+            "salesperson_name": c.salesperson_name,
             "is_follow_up": c.status == "OPEN",
             "is_overdue": (
                 c.status == "OPEN"
@@ -493,5 +900,5 @@ def all_calls(
                 and c.follow_up_datetime < now
             )
         }
-        for c, salesperson_name in rows
+        for c in rows
     ]
@@ -1,53 +1,93 @@
+import gzip
+import hashlib
+from functools import lru_cache
+
 from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import Response
 from fastapi.templating import Jinja2Templates
 
+from app.utils.content_encoding import accepts_gzip
+from app.config import FRONTEND_CACHE_SECONDS
+
 router = APIRouter(tags=["Frontend"])
 templates = Jinja2Templates(directory="frontend")
 
-@router.get("/login", response_class=HTMLResponse)
+
+# ----------------------------
+# PRE-RENDERED PAGES
+# ----------------------------
+@lru_cache(maxsize=None)
+def _rendered(name: str):
+    """
+    The page's HTML, rendered once per process (the templates take no
+    data), its gzip encoding and a strong ETag for each.
+    """
+    body = templates.get_template(name).render(request=None).encode()
+    digest = hashlib.sha256(body).hexdigest()[:20]
+    return {
+        "identity": (body, f'"{digest}"'),
+        "gzip": (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gz"'),
+    }
+
+
+def _page(request: Request, name: str):
+    """
+    Serve a pre-rendered page: 304 when the browser's copy is current,
+    else the gzip or plain bytes. ETags change with the file contents,
+    so a deploy is picked up once the max-age runs out.
+    """
+    encoding = "gzip" if accepts_gzip(request.headers.get("accept-encoding", "")) else "identity"
+    body, etag = _rendered(name)[encoding]
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={FRONTEND_CACHE_SECONDS}",
+    }
+
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    known = [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in known or "*" in known:
+        return Response(status_code=304, headers={**headers, "Vary": "Accept-Encoding"})
+
+    if encoding == "gzip":
+        # GZipMiddleware passes encoded responses through untouched (and
+        # adds Vary itself to the plain ones)
+        headers.update({"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+    return Response(body, media_type="text/html", headers=headers)
+
+
+@router.get("/login")
 def login_page(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
+    return _page(request, "login.html")
 
-@router.get("/register", response_class=HTMLResponse)
+@router.get("/register")
 def register_page(request: Request):
-    return templates.TemplateResponse("register.html", {"request": request})
+    return _page(request, "register.html")
 
-@router.get("/dashboard", response_class=HTMLResponse)
+@router.get("/dashboard")
 def dashboard_page(request: Request):
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    return _page(request, "dashboard.html")
 
-@router.get("/admin", response_class=HTMLResponse)
+@router.get("/admin")
 def admin_page(request: Request):
-    return templates.TemplateResponse("admin.html", {"request": request})
+    return _page(request, "admin.html")
 
-@router.get("/call-details", response_class=HTMLResponse)
-def admin_page(request: Request):
-    return templates.TemplateResponse("call_details.html", {"request": request})
+@router.get("/call-details")
+def call_details_page(request: Request):
+    return _page(request, "call_details.html")
 
 @router.get("/follow-ups")
 def follow_ups_page(request: Request):
-    return templates.TemplateResponse(
-        "follow_up.html",
-        {"request": request}
-    )
+    return _page(request, "follow_up.html")
+
 @router.get("/all-calls")
 def all_calls_page(request: Request):
-    return templates.TemplateResponse(
-        "all_calls.html",
-        {"request": request}
-    )
+    return _page(request, "all_calls.html")
 
 @router.get("/leads")
 def leads_page(request: Request):
-    return templates.TemplateResponse(
-        "leads.html",
-        {"request": request}
-    )
+    return _page(request, "leads.html")
 
 @router.get("/admin-performance")
 def admin_performance_page(request: Request):
-    return templates.TemplateResponse(
-        "admin_performance.html",
-        {"request": request}
-    )
\ No newline at end of file
+    return _page(request, "admin_performance.html")
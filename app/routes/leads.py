@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.deps import get_current_user, get_db
+from app.deps import get_current_user, get_read_user, get_db, get_read_db
 from app.models.lead import Lead
 from app.models.call_log import CallLog
-from sqlalchemy import and_
+from app.models.call_archive import CallLogArchive
+from sqlalchemy import and_, select
 router = APIRouter(prefix="/leads", tags=["Leads"])
 
 
@@ -12,8 +13,8 @@ router = APIRouter(prefix="/leads", tags=["Leads"])
 # ----------------------------
 @router.get("/my")
 def my_leads(
-    user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user=Depends(get_read_user),
+    db: Session = Depends(get_read_db)
 ):
     # Subquery: leads that have at least ONE call logged
     called_leads_subq = (
@@ -21,12 +22,19 @@ def my_leads(
         .distinct()
         .subquery()
     )
+    # ...including calls since moved to the archive
+    archived_leads_subq = (
+        select(CallLogArchive.lead_id)
+        .where(CallLogArchive.lead_id.isnot(None))
+    )
 
     leads = (
         db.query(Lead)
         .filter(
             Lead.salesperson_id == user.id,
-            ~Lead.id.in_(called_leads_subq)   # ✅ EXCLUDE ALL CALLED LEADS
+            Lead.status != "MERGED",          # duplicates of another rep's lead
+            ~Lead.id.in_(called_leads_subq),  # ✅ EXCLUDE ALL CALLED LEADS
+            ~Lead.id.in_(archived_leads_subq)
         )
         .order_by(Lead.created_at.desc())
         .all()
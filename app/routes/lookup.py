@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.deps import oauth2_scheme, decode_token
+from app.utils.phone_index import phone_index, LEAD_ID, CALL_ID, OWNER, STATUS, LAST_OUTCOME
+
+router = APIRouter(prefix="/lookup", tags=["Lookup"])
+
+
+# ----------------------------
+# CALLER ID (IN-MEMORY, NO DB)
+# ----------------------------
+@router.get("/phone/{number}")
+def lookup_phone(number: str, token: str = Depends(oauth2_scheme)):
+    """
+    Which lead / call an incoming number belongs to, answered from the
+    in-process phone index (app.utils.phone_index). The JWT is decoded
+    without loading the user, so the request never opens a session.
+    """
+    payload = decode_token(token)
+
+    if not phone_index.ready:
+        raise HTTPException(status_code=503, detail="Phone index is warming up")
+
+    phone, entry = phone_index.lookup(number)
+    if not phone:
+        raise HTTPException(status_code=400, detail="Not a phone number")
+    if not entry:
+        raise HTTPException(status_code=404, detail="Number not found")
+
+    return {
+        "phone": phone,
+        "lead_id": entry[LEAD_ID],
+        "call_id": entry[CALL_ID],
+        "salesperson_id": entry[OWNER],
+        "is_mine": entry[OWNER] == payload["user_id"],
+        "status": entry[STATUS],
+        "last_outcome": entry[LAST_OUTCOME],
+    }
+
@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from app.deps import decode_token
+from app.utils.pubsub import broker
+from app.config import SSE_HEARTBEAT_SECONDS
+
+router = APIRouter(prefix="/events", tags=["Live Updates"])
+
+
+def _sse(event_type: str, data: dict):
+    return f"event: {event_type}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+# ----------------------------
+# LIVE CHANGE FEED (SERVER-SENT EVENTS)
+# ----------------------------
+@router.get("/stream")
+async def event_stream(request: Request, token: str):
+    """
+    Push compact change events (lead_created, call_logged,
+    follow_up_added, call_closed) to the browser.
+
+    EventSource cannot send headers, so the JWT comes as ?token=.
+    Admins receive every event; salespersons only their own. Runs on the
+    event loop and never touches the database.
+    """
+    payload = decode_token(token)
+
+    async def stream():
+        sub = broker.subscribe(
+            user_id=payload["user_id"],
+            is_admin=payload.get("role") == "ADMIN"
+        )
+        try:
+            yield "retry: 5000\n\n"
+
+            while not await request.is_disconnected():
+                try:
+                    evt = await asyncio.wait_for(
+                        sub.queue.get(),
+                        timeout=SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+
+                if sub.overflowed:
+                    # client fell behind — skip the backlog, ask for a reload
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    sub.overflowed = False
+                    yield _sse("resync", {})
+                    continue
+
+                yield _sse(evt["type"], evt)
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
\ No newline at end of file
@@ -0,0 +1,171 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import select, or_, and_
+from sqlalchemy.orm import Session
+from app.deps import get_current_user, get_db
+from app.models.lead import Lead
+from app.models.call_log import CallLog
+from app.models.call_follow_up import CallFollowUp
+from app.models.sync_tombstone import SyncTombstone
+from app.utils.projection import fetch_dicts
+from app.config import SYNC_MAX_ROWS, SYNC_SETTLE_SECONDS, SYNC_TOMBSTONE_DAYS
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+LEAD_FIELDS = (
+    "id", "client_name", "contact_number", "query_source", "query_product",
+    "state", "status", "salesperson_id", "duplicate_of_id", "created_at", "updated_at",
+)
+CALL_FIELDS = (
+    "id", "call_id", "lead_id", "salesperson_id", "client_name", "contact_number",
+    "query_source", "query_product", "state", "call_outcome", "remark",
+    "follow_up_datetime", "status", "completed_at", "followup_count",
+    "last_outcome", "last_followup_at", "next_follow_up_at", "purchased_at",
+    "created_at", "updated_at",
+)
+FOLLOW_UP_FIELDS = (
+    "id", "call_id", "salesperson_id", "outcome", "remark",
+    "follow_up_datetime", "created_at", "updated_at",
+)
+
+# cursor key -> (model, fields, response key, tombstone entity)
+ENTITIES = {
+    "l": (Lead, LEAD_FIELDS, "leads", "lead"),
+    "c": (CallLog, CALL_FIELDS, "calls", "call"),
+    "f": (CallFollowUp, FOLLOW_UP_FIELDS, "follow_ups", "follow_up"),
+}
+
+
+# ----------------------------
+# CURSOR
+# ----------------------------
+def encode_cursor(state: dict):
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None):
+    """
+    The client's position, or None when it must start over (no cursor,
+    garbled, or older than the tombstone retention).
+    """
+    if not cursor:
+        return None
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        issued = datetime.fromisoformat(state["i"])
+        positions = {
+            key: (state[key][0], int(state[key][1])) if state[key] else None
+            for key in ENTITIES
+        }
+        tombstone_id = int(state["t"])
+    except Exception:
+        return None
+
+    if issued < datetime.utcnow() - timedelta(days=SYNC_TOMBSTONE_DAYS):
+        return None
+
+    return positions, tombstone_id
+
+
+# ----------------------------
+# GET CHANGES SINCE CURSOR
+# ----------------------------
+@router.get("")
+def sync(
+    since: str | None = None,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Rows created or changed since `since` (closing a call is a change),
+    plus tombstones for rows that went away. Without a cursor, or with
+    one too old to trust, `reset` is true and the response pages
+    through the full data set; the client should drop its local copy.
+
+    Each entity is read by a (updated_at, id) keyset, at most
+    SYNC_MAX_ROWS per response; `has_more` means call again right away
+    with the new cursor. Once caught up, the cursor is held back
+    SYNC_SETTLE_SECONDS so rows from transactions still committing are
+    picked up next time (the client may see those rows twice — upsert).
+
+    Reads go to the primary: a lagging replica would advance the
+    cursor past rows it has not received yet.
+    """
+    now = datetime.utcnow()
+    horizon = now - timedelta(seconds=SYNC_SETTLE_SECONDS)
+    start = decode_cursor(since)
+    reset = start is None
+    positions, tombstone_id = start or ({key: None for key in ENTITIES}, 0)
+
+    is_admin = user.role == "ADMIN"
+    response = {"reset": reset, "has_more": False}
+    next_state = {"i": now.isoformat()}
+
+    for key, (model, fields, name, _) in ENTITIES.items():
+        stmt = select(*[getattr(model, f) for f in fields])
+
+        if not is_admin:
+            if model is CallFollowUp:
+                # follow-ups belong to whoever owns the call
+                stmt = stmt.join(CallLog, CallLog.id == CallFollowUp.call_id).where(
+                    CallLog.salesperson_id == user.id
+                )
+            else:
+                stmt = stmt.where(model.salesperson_id == user.id)
+
+        position = positions[key]
+        if position:
+            ts, last_id = datetime.fromisoformat(position[0]), position[1]
+            position = (ts, last_id)
+            stmt = stmt.where(or_(
+                model.updated_at > ts,
+                and_(model.updated_at == ts, model.id > last_id)
+            ))
+
+        rows = fetch_dicts(
+            db,
+            stmt.order_by(model.updated_at, model.id).limit(SYNC_MAX_ROWS + 1)
+        )
+        truncated = len(rows) > SYNC_MAX_ROWS
+        rows = rows[:SYNC_MAX_ROWS]
+        response[name] = rows
+        response["has_more"] |= truncated
+
+        if rows and (truncated or rows[-1]["updated_at"] < horizon):
+            position = (rows[-1]["updated_at"], rows[-1]["id"])
+        elif rows or position:
+            # caught up: hold the cursor back to the settle horizon
+            position = max(position, (horizon, 0)) if position else (horizon, 0)
+        next_state[key] = [position[0].isoformat(), position[1]] if position else None
+
+    # ---------------- tombstones ----------------
+    tombstones = select(
+        SyncTombstone.id, SyncTombstone.entity, SyncTombstone.entity_id
+    ).where(SyncTombstone.id > tombstone_id)
+    if not is_admin:
+        tombstones = tombstones.where(SyncTombstone.salesperson_id == user.id)
+
+    deleted = {name: [] for _, _, name, _ in ENTITIES.values()}
+    if not reset:
+        by_entity = {entity: name for _, _, name, entity in ENTITIES.values()}
+        rows = db.execute(tombstones.order_by(SyncTombstone.id).limit(SYNC_MAX_ROWS + 1)).all()
+        response["has_more"] |= len(rows) > SYNC_MAX_ROWS
+        for row in rows[:SYNC_MAX_ROWS]:
+            if row.entity in by_entity:
+                deleted[by_entity[row.entity]].append(row.entity_id)
+            tombstone_id = row.id
+    else:
+        # a fresh copy has nothing to delete: start after today's last tombstone
+        last = db.execute(
+            select(SyncTombstone.id).order_by(SyncTombstone.id.desc()).limit(1)
+        ).scalar()
+        tombstone_id = last or 0
+
+    response["deleted"] = deleted
+    next_state["t"] = tombstone_id
+    response["cursor"] = encode_cursor(next_state)
+    return response
@@ -0,0 +1,67 @@
+from sqlalchemy import select, func, case, Float
+from sqlalchemy.orm import Session
+
+
+# ==================================================
+# DIALECT-AWARE SQL HELPERS FOR IN-DATABASE ANALYTICS
+# ==================================================
+def dialect_name(db: Session):
+    return db.get_bind().dialect.name
+
+
+def seconds_between(db: Session, later, earlier):
+    """
+    (later - earlier) in seconds, as a SQL expression.
+    """
+    if dialect_name(db) == "postgresql":
+        return func.extract("epoch", later - earlier)
+
+    # SQLite: julianday() returns fractional days
+    return (func.julianday(later) - func.julianday(earlier)) * 86400.0
+
+
+def percentile_aggregate(db: Session, fraction: float, column):
+    """
+    percentile_cont aggregate, or None when the database has none
+    (use nearest_rank_percentiles there instead).
+    """
+    if dialect_name(db) == "postgresql":
+        return func.percentile_cont(fraction).within_group(column)
+    return None
+
+
+def nearest_rank_percentiles(group_col, value_col, fractions, name="pct"):
+    """
+    Portable percentiles via window functions: number the values per
+    group, then take the first value whose rank reaches p * count.
+
+    Returns a subquery with columns grp, p<N> for each fraction.
+    """
+    ranked = (
+        func.row_number()
+        .over(partition_by=group_col, order_by=value_col)
+        .label("rn")
+    )
+    total = func.count().over(partition_by=group_col).label("cnt")
+
+    ranked_q = (
+        select(group_col.label("grp"), value_col.label("val"), ranked, total)
+        .where(value_col.isnot(None))
+        .subquery(f"{name}_ranked")
+    )
+
+    return (
+        select(
+            ranked_q.c.grp,
+            *[
+                func.min(
+                    case(
+                        (ranked_q.c.rn * 100 >= round(f * 100) * ranked_q.c.cnt, ranked_q.c.val)
+                    )
+                ).cast(Float).label(f"p{round(f * 100)}")
+                for f in fractions
+            ]
+        )
+        .group_by(ranked_q.c.grp)
+        .subquery(name)
+    )
@@ -0,0 +1,281 @@
+from datetime import datetime
+
+from sqlalchemy import select, insert, update, literal, case, or_, false
+from sqlalchemy.orm import Session
+
+from app.models.lead import Lead
+from app.models.call_log import CallLog
+from app.models.call_follow_up import CallFollowUp
+from app.models.call_event import CallEvent, EVENT_KINDS
+from app.models.sync_tombstone import SyncTombstone
+from app.models.codes import known_source
+from app.utils.call_summary import refresh_call_summaries
+from app.utils.call_events import CLOSING_OUTCOMES
+
+
+# ids per IN (...) list, well below SQLite's bound-parameter limit
+BULK_CHUNK_SIZE = 5000
+
+# selection keys accepted by every bulk operation
+FILTER_KEYS = (
+    "salesperson_id", "call_ids", "lead_ids",
+    "state", "query_product", "query_source", "from_date", "to_date",
+)
+
+
+def _chunks(ids):
+    for i in range(0, len(ids), BULK_CHUNK_SIZE):
+        yield ids[i:i + BULK_CHUNK_SIZE]
+
+
+# ==================================================
+# SELECTION
+# ==================================================
+def _common_filters(model, filters: dict):
+    """
+    WHERE clauses shared by leads and calls: current owner, lead
+    attributes and a created_at range (from_date / to_date, ISO).
+    """
+    where = []
+    if filters.get("salesperson_id") is not None:
+        where.append(model.salesperson_id == filters["salesperson_id"])
+    for field in ("state", "query_product"):
+        if filters.get(field) is not None:
+            where.append(getattr(model, field) == filters[field])
+    if filters.get("query_source") is not None:
+        # a source nobody has used yet matches no rows
+        if known_source(filters["query_source"]):
+            where.append(model.query_source == filters["query_source"])
+        else:
+            where.append(false())
+    if filters.get("from_date"):
+        where.append(model.created_at >= datetime.fromisoformat(filters["from_date"]))
+    if filters.get("to_date"):
+        where.append(model.created_at <= datetime.fromisoformat(filters["to_date"]))
+    return where
+
+
+def call_filters(filters: dict):
+    where = _common_filters(CallLog, filters)
+    if filters.get("call_ids"):
+        where.append(CallLog.id.in_(filters["call_ids"]))
+    if filters.get("lead_ids"):
+        where.append(CallLog.lead_id.in_(filters["lead_ids"]))
+    return where
+
+
+def lead_filters(filters: dict):
+    where = _common_filters(Lead, filters)
+    if filters.get("lead_ids"):
+        where.append(Lead.id.in_(filters["lead_ids"]))
+    if filters.get("call_ids"):
+        where.append(Lead.id.in_(
+            select(CallLog.lead_id).where(CallLog.id.in_(filters["call_ids"]))
+        ))
+    return where
+
+
+def _selected_calls(db: Session, filters: dict, *extra):
+    """
+    (id, lead_id, salesperson_id) of the calls an operation will touch,
+    locked on databases that support it so the later UPDATEs act on
+    exactly these rows.
+    """
+    return db.execute(
+        select(CallLog.id, CallLog.lead_id, CallLog.salesperson_id)
+        .where(*call_filters(filters), *extra)
+        .order_by(CallLog.id)
+        .with_for_update()
+    ).all()
+
+
+def _record(db: Session, kind: str, ids, actor_id: int, **values):
+    """
+    One event per call in `ids`, INSERT ... SELECT from call_logs (after
+    the UPDATE, so owner / outcome are the new values).
+    """
+    cols = ["kind", "call_id", "lead_id", "salesperson_id", "actor_id", "outcome", "follow_up_at", "closed"]
+    for chunk in _chunks(ids):
+        db.execute(insert(CallEvent).from_select(cols, select(
+            literal(EVENT_KINDS[kind]), CallLog.id, CallLog.lead_id, CallLog.salesperson_id,
+            literal(actor_id), CallLog.call_outcome, CallLog.follow_up_datetime,
+            literal(values.get("closed", False)),
+        ).where(CallLog.id.in_(chunk))))
+
+
+# ==================================================
+# REASSIGN
+# ==================================================
+def reassign(db: Session, filters: dict, to_id: int, actor_id: int, include_closed: bool = False):
+    """
+    Move the selected calls (OPEN ones unless include_closed — closed
+    calls stay credited to whoever closed them) and leads to `to_id`.
+    Leads move when they are not called yet (NEW), or when one of their
+    calls moves. A call's pending follow-up and claim go with it.
+
+    Previous owners get sync tombstones for every lead, call and
+    follow-up they lose; moved follow-ups are touched so the new
+    owner's next /sync picks them up. Caller commits.
+    Returns counts plus {"lead_ids", "call_ids", "from": {owner: calls}}.
+    """
+    now = datetime.utcnow()
+    calls = _selected_calls(
+        db, filters,
+        CallLog.salesperson_id.is_distinct_from(to_id),
+        *(() if include_closed else (CallLog.status == "OPEN",))
+    )
+    call_ids = [c.id for c in calls]
+
+    # not-yet-called leads matching the selection, plus the leads of moved calls
+    leads = dict(db.execute(
+        select(Lead.id, Lead.salesperson_id)
+        .where(
+            Lead.status == "NEW",
+            Lead.salesperson_id.is_distinct_from(to_id),
+            *lead_filters(filters)
+        )
+        .with_for_update()
+    ).all())
+    for chunk in _chunks(sorted({c.lead_id for c in calls if c.lead_id})):
+        leads.update(db.execute(
+            select(Lead.id, Lead.salesperson_id)
+            .where(Lead.id.in_(chunk), Lead.salesperson_id.is_distinct_from(to_id))
+            .with_for_update()
+        ).all())
+    lead_ids = sorted(leads)
+
+    tombstones = SyncTombstone.__table__
+    cols = ["entity", "entity_id", "salesperson_id", "deleted_at"]
+    follow_ups = 0
+
+    for chunk in _chunks(call_ids):
+        db.execute(insert(tombstones).from_select(cols, select(
+            literal("call"), CallLog.id, CallLog.salesperson_id, literal(now)
+        ).where(CallLog.id.in_(chunk), CallLog.salesperson_id.isnot(None))))
+        db.execute(insert(tombstones).from_select(cols, select(
+            literal("follow_up"), CallFollowUp.id, CallLog.salesperson_id, literal(now)
+        ).select_from(CallFollowUp).join(CallLog, CallLog.id == CallFollowUp.call_id).where(
+            CallFollowUp.call_id.in_(chunk), CallLog.salesperson_id.isnot(None)
+        )))
+
+        db.execute(
+            update(CallLog)
+            .where(CallLog.id.in_(chunk))
+            .values(salesperson_id=to_id, claimed_by_id=None, claimed_until=None)
+            .execution_options(synchronize_session=False)
+        )
+        follow_ups += db.execute(
+            update(CallFollowUp)
+            .where(CallFollowUp.call_id.in_(chunk))
+            .values(updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    for chunk in _chunks(lead_ids):
+        db.execute(insert(tombstones).from_select(cols, select(
+            literal("lead"), Lead.id, Lead.salesperson_id, literal(now)
+        ).where(Lead.id.in_(chunk), Lead.salesperson_id.isnot(None))))
+        db.execute(
+            update(Lead)
+            .where(Lead.id.in_(chunk))
+            .values(salesperson_id=to_id)
+            .execution_options(synchronize_session=False)
+        )
+
+    _record(db, "call_reassigned", call_ids, actor_id)
+
+    moved_from = {}
+    for c in calls:
+        moved_from[c.salesperson_id] = moved_from.get(c.salesperson_id, 0) + 1
+
+    return {
+        "calls": len(call_ids),
+        "leads": len(lead_ids),
+        "follow_ups": follow_ups,
+        "from": moved_from,
+        "call_ids": call_ids,
+        "lead_ids": lead_ids,
+    }
+
+
+# ==================================================
+# CLOSE / REOPEN
+# ==================================================
+def close_calls(db: Session, filters: dict, actor_id: int, outcome: str | None = None):
+    """
+    Close the selected OPEN calls (optionally recording `outcome` as
+    their call_outcome): pending follow-up and claim cleared, summaries
+    recomputed. Caller commits. Returns the closed calls' rows.
+    """
+    calls = _selected_calls(db, filters, CallLog.status == "OPEN")
+    ids = [c.id for c in calls]
+
+    values = {
+        "status": "CLOSED",
+        "follow_up_datetime": None,
+        "completed_at": datetime.now(),
+        "claimed_by_id": None,
+        "claimed_until": None,
+    }
+    if outcome:
+        values["call_outcome"] = outcome
+
+    for chunk in _chunks(ids):
+        db.execute(
+            update(CallLog)
+            .where(CallLog.id.in_(chunk))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        refresh_call_summaries(db, chunk)
+
+    _record(db, "call_closed", ids, actor_id, closed=True)
+    return calls
+
+
+def reopen_calls(
+    db: Session,
+    filters: dict,
+    actor_id: int,
+    follow_up_at: datetime,
+    include_closing_outcomes: bool = False
+):
+    """
+    Reopen the selected live CLOSED calls with a follow-up due at
+    `follow_up_at` (archived calls stay closed). Caller commits.
+    Returns the reopened calls' rows.
+
+    Calls closed with a closing outcome (Purchased / Not Required, or
+    with a purchase on record) are left alone unless
+    `include_closing_outcomes`; those then lose the closing
+    call_outcome, and purchased_at is recomputed from the follow-up
+    history.
+    """
+    extra = [CallLog.status == "CLOSED"]
+    if not include_closing_outcomes:
+        extra += [
+            CallLog.purchased_at.is_(None),
+            or_(CallLog.call_outcome.is_(None), CallLog.call_outcome.notin_(CLOSING_OUTCOMES)),
+            or_(CallLog.last_outcome.is_(None), CallLog.last_outcome.notin_(CLOSING_OUTCOMES)),
+        ]
+    calls = _selected_calls(db, filters, *extra)
+    ids = [c.id for c in calls]
+
+    values = {"status": "OPEN", "follow_up_datetime": follow_up_at, "completed_at": None}
+    if include_closing_outcomes:
+        values["call_outcome"] = case(
+            (CallLog.call_outcome.in_(CLOSING_OUTCOMES), None),
+            else_=CallLog.call_outcome
+        )
+
+    for chunk in _chunks(ids):
+        db.execute(
+            update(CallLog)
+            .where(CallLog.id.in_(chunk))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        refresh_call_summaries(db, chunk)
+
+    _record(db, "call_reopened", ids, actor_id)
+    return calls
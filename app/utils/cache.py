@@ -0,0 +1,71 @@
+import threading
+import time
+
+
+# ==================================================
+# IN-PROCESS TTL CACHE
+# ==================================================
+class TTLCache:
+    """
+    Small thread-safe result cache for expensive read endpoints.
+
+    Entries expire after `ttl` seconds; clear() drops everything and is
+    wired to committed writes (app.utils.pubsub.add_commit_listener).
+    Per worker process: other workers only see a write once their own
+    entries expire, so `ttl` bounds staleness across the fleet.
+
+    A value computed while a clear() happened is stale: callers read
+    `generation` before computing and pass it to set(), which then
+    drops the value instead of caching it.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}    # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._cleared_at = None
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def set(self, key, value, generation: int | None = None):
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if len(self._entries) >= self.max_entries:
+                # drop expired entries, then the oldest ones
+                for k in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                    del self._entries[k]
+                while len(self._entries) >= self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (now + self.ttl, value)
+
+    def clear(self, *_):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self._cleared_at = time.monotonic()
+
+    def cleared_within(self, seconds: float):
+        cleared_at = self._cleared_at
+        return cleared_at is not None and time.monotonic() - cleared_at < seconds
+
+    def stats(self):
+        with self._lock:
+            entries = len(self._entries)
+        return {"entries": entries, "hits": self.hits, "misses": self.misses, "ttl_seconds": self.ttl}
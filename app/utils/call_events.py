@@ -0,0 +1,323 @@
+# app/utils/call_events.py
+#
+# Append-only call activity log (call_events) and the replays that
+# rebuild derived tables from it:
+#
+# - call_daily_rollups: one grouped INSERT ... SELECT over the log
+# - the follow-up summary columns on call_logs: each batch of calls'
+#   events read by call_id range, folded per call, written back only
+#   where they differ
+#
+#     python -m app.utils.call_events --backfill
+#     python -m app.utils.call_events --rollups [--since 2026-01-01]
+#     python -m app.utils.call_events --summaries
+
+import argparse
+from datetime import date, datetime
+from itertools import groupby
+
+from sqlalchemy import select, insert, update, delete, func, case, literal, exists, and_
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, init_engine
+from app.models.call_event import CallEvent, EVENT_KINDS
+from app.models.call_daily_rollup import CallDailyRollup
+from app.models.call_log import CallLog
+from app.models.call_follow_up import CallFollowUp
+from app.models.call_archive import CallLogArchive, CallFollowUpArchive
+from app.models.lead import Lead
+from app.utils.call_summary import SUMMARY_COLUMNS
+
+
+# same rules as app/routes/calls.py
+CLOSING_OUTCOMES = ("Purchased", "Not Required")
+FOLLOW_UP_OUTCOMES = ("Connected", "Not Picked", "Busy", "Cut-In Between")
+
+
+# ==================================================
+# WRITE (CALLED BY WRITE PATHS, SAME TRANSACTION)
+# ==================================================
+def record_events(db: Session, kind: str, rows):
+    """
+    Append one event of `kind` per dict in `rows` (CallEvent column
+    names) with a single INSERT. Commits with the caller's transaction.
+    """
+    rows = [{**row, "kind": EVENT_KINDS[kind]} for row in rows]
+    if rows:
+        db.execute(insert(CallEvent), rows)
+
+
+def record_event(db: Session, kind: str, **fields):
+    record_events(db, kind, [fields])
+
+
+# ==================================================
+# REPLAY: DAILY ROLLUPS
+# ==================================================
+def rebuild_daily_rollups(db: Session, since: date | None = None):
+    """
+    Recompute call_daily_rollups from the log, from `since` on (or
+    entirely). Returns the number of rollup rows written.
+    """
+    ev = CallEvent
+    day = func.date(ev.occurred_at)
+
+    def count_if(*conditions):
+        return func.sum(case((and_(*conditions), 1), else_=0))
+
+    grouped = (
+        select(
+            day,
+            ev.salesperson_id,
+            count_if(ev.kind == EVENT_KINDS["lead_created"]),
+            count_if(ev.kind == EVENT_KINDS["call_logged"]),
+            count_if(ev.kind == EVENT_KINDS["follow_up"]),
+            count_if(ev.closed.is_(True)),
+            count_if(ev.closed.is_(True), ev.outcome == "Purchased"),
+        )
+        .where(ev.salesperson_id.isnot(None))
+        .group_by(day, ev.salesperson_id)
+    )
+
+    cleared = delete(CallDailyRollup)
+    if since:
+        grouped = grouped.where(ev.occurred_at >= since)
+        cleared = cleared.where(CallDailyRollup.day >= since)
+
+    db.execute(cleared)
+    written = db.execute(
+        insert(CallDailyRollup).from_select(
+            ["day", "salesperson_id", "leads_created", "calls_logged",
+             "follow_ups", "calls_closed", "purchased"],
+            grouped
+        )
+    ).rowcount
+    db.commit()
+    return written
+
+
+# ==================================================
+# REPLAY: FOLLOW-UP SUMMARIES
+# ==================================================
+def _fold(events):
+    """
+    Summary columns of one call from its events, oldest first. Mirrors
+    app.utils.call_summary, with event time standing in for row
+    timestamps.
+    """
+    count = 0
+    last_followup_outcome = last_followup_at = first_purchase = None
+    call_outcome = status = follow_up_at = completed_at = created_at = None
+
+    for e in events:
+        if e.kind == EVENT_KINDS["call_logged"]:
+            call_outcome = e.outcome
+            created_at = e.occurred_at
+            status = "CLOSED" if e.closed else "OPEN"
+            follow_up_at = e.follow_up_at
+
+        elif e.kind == EVENT_KINDS["follow_up"]:
+            count += 1
+            last_followup_outcome = e.outcome
+            last_followup_at = e.occurred_at
+            if e.outcome == "Purchased" and first_purchase is None:
+                first_purchase = e.occurred_at
+            if e.closed:
+                status, follow_up_at, completed_at = "CLOSED", None, e.occurred_at
+            else:
+                status, follow_up_at = "OPEN", e.follow_up_at
+
+        elif e.kind == EVENT_KINDS["call_updated"]:
+            call_outcome = e.outcome or call_outcome
+            if call_outcome in CLOSING_OUTCOMES:
+                status, follow_up_at, completed_at = "CLOSED", None, e.occurred_at
+
+        elif e.kind == EVENT_KINDS["call_closed"]:
+            call_outcome = e.outcome or call_outcome
+            status, follow_up_at, completed_at = "CLOSED", None, e.occurred_at
+
+        elif e.kind == EVENT_KINDS["call_reopened"]:
+            status, follow_up_at, completed_at = "OPEN", e.follow_up_at, None
+
+    if created_at is None:
+        return None    # no call_logged event: nothing to rebuild from
+
+    return {
+        "followup_count": count,
+        "last_outcome": last_followup_outcome or call_outcome,
+        "last_followup_at": last_followup_at,
+        "next_follow_up_at": follow_up_at if status == "OPEN" else None,
+        "purchased_at": first_purchase or (
+            (completed_at or created_at) if call_outcome == "Purchased" else None
+        ),
+    }
+
+
+def _write_summaries(db: Session, summaries: dict):
+    """
+    Bulk UPDATE by primary key, only for calls whose stored summary
+    differs. Returns the number of calls changed.
+    """
+    stored = db.execute(
+        select(CallLog.id, *[getattr(CallLog, c) for c in SUMMARY_COLUMNS])
+        .where(CallLog.id.in_(summaries.keys()))
+    ).all() if summaries else []
+
+    changed = [
+        {"id": row.id, **summaries[row.id]}
+        for row in stored
+        if any(_differs(getattr(row, c), summaries[row.id][c]) for c in SUMMARY_COLUMNS)
+    ]
+    if changed:
+        db.execute(update(CallLog), changed)
+    db.commit()
+    return len(changed)
+
+
+def _differs(stored, replayed):
+    # SQLite hands back naive datetimes for timezone-aware columns
+    if isinstance(stored, datetime) and isinstance(replayed, datetime):
+        return stored.replace(tzinfo=None) != replayed.replace(tzinfo=None)
+    return stored != replayed
+
+
+def replay_call_summaries(db: Session, batch_size: int = 5000):
+    """
+    Recompute every live call's summary from call_events alone,
+    batch_size calls per transaction: one range read of their events
+    (call_id index, already in replay order), folded in Python.
+    Returns {"calls": n, "changed": n}.
+    """
+    ev = CallEvent
+    stats = {"calls": 0, "changed": 0}
+    last_id = 0
+
+    while True:
+        ids = db.execute(
+            select(CallLog.id)
+            .where(CallLog.id > last_id)
+            .order_by(CallLog.id)
+            .limit(batch_size)
+        ).scalars().all()
+
+        if not ids:
+            return stats
+
+        rows = db.execute(
+            select(ev.call_id, ev.kind, ev.occurred_at, ev.outcome, ev.follow_up_at, ev.closed)
+            .where(ev.call_id >= ids[0], ev.call_id <= ids[-1])
+            .order_by(ev.call_id, ev.occurred_at, ev.id)
+        ).all()
+
+        summaries = {}
+        for call_id, events in groupby(rows, key=lambda r: r.call_id):
+            summary = _fold(events)
+            if summary:
+                summaries[call_id] = summary
+
+        stats["calls"] += len(summaries)
+        stats["changed"] += _write_summaries(db, summaries)
+        last_id = ids[-1]
+
+
+# ==================================================
+# BACKFILL (ONE-OFF, FROM THE EXISTING TABLES)
+# ==================================================
+def backfill_events(db: Session):
+    """
+    Synthesize the log from leads, calls and follow-ups (live and
+    archived) for a database that predates it. Runs only while
+    call_events is empty. A call's first outcome is taken to be its
+    current call_outcome, and a call closed through update_call gets
+    one call_updated event at completed_at; earlier overwritten
+    outcomes and remarks are lost. Returns the number of events written.
+    """
+    if db.execute(select(CallEvent.id).limit(1)).first():
+        return 0
+
+    cols = [
+        "kind", "occurred_at", "call_id", "lead_id", "salesperson_id", "actor_id",
+        "outcome", "remark", "follow_up_at", "closed",
+        "query_source", "query_product", "state",
+    ]
+    written = db.execute(
+        insert(CallEvent).from_select(cols, select(
+            literal(EVENT_KINDS["lead_created"]), func.coalesce(Lead.created_at, func.now()),
+            literal(None), Lead.id, Lead.salesperson_id, Lead.salesperson_id,
+            literal(None), literal(None), literal(None), literal(False),
+            Lead.query_source, Lead.query_product, Lead.state,
+        ).where(Lead.salesperson_id.isnot(None)).order_by(Lead.id))
+    ).rowcount
+
+    for calls, followups in ((CallLog, CallFollowUp), (CallLogArchive, CallFollowUpArchive)):
+        calls_t, followups_t = calls.__table__, followups.__table__
+        has_followups = exists().where(followups_t.c.call_id == calls_t.c.id)
+        first_closed = calls_t.c.call_outcome.not_in(FOLLOW_UP_OUTCOMES)
+        # only update_call sets completed_at without a closing follow-up
+        closed_by_update = and_(
+            calls_t.c.status == "CLOSED",
+            calls_t.c.completed_at.isnot(None),
+            ~exists().where(
+                followups_t.c.call_id == calls_t.c.id,
+                followups_t.c.outcome.in_(CLOSING_OUTCOMES)
+            )
+        )
+        closed_at_creation = and_(first_closed, ~has_followups, ~closed_by_update)
+
+        written += db.execute(
+            insert(CallEvent).from_select(cols, select(
+                literal(EVENT_KINDS["call_logged"]), func.coalesce(calls_t.c.created_at, func.now()),
+                calls_t.c.id, calls_t.c.lead_id, calls_t.c.salesperson_id, calls_t.c.salesperson_id,
+                calls_t.c.call_outcome, calls_t.c.remark,
+                case((and_(~has_followups, ~first_closed), calls_t.c.follow_up_datetime), else_=None),
+                closed_at_creation,
+                calls_t.c.query_source, calls_t.c.query_product, calls_t.c.state,
+            ).order_by(calls_t.c.id))
+        ).rowcount
+
+        written += db.execute(
+            insert(CallEvent).from_select(cols, select(
+                literal(EVENT_KINDS["follow_up"]), func.coalesce(followups_t.c.created_at, func.now()),
+                followups_t.c.call_id, calls_t.c.lead_id, calls_t.c.salesperson_id,
+                followups_t.c.salesperson_id,
+                followups_t.c.outcome, followups_t.c.remark, followups_t.c.follow_up_datetime,
+                followups_t.c.outcome.in_(CLOSING_OUTCOMES),
+                literal(None), literal(None), literal(None),
+            )
+            .select_from(followups_t.join(calls_t, calls_t.c.id == followups_t.c.call_id))
+            .order_by(followups_t.c.id))
+        ).rowcount
+
+        written += db.execute(
+            insert(CallEvent).from_select(cols, select(
+                literal(EVENT_KINDS["call_updated"]), calls_t.c.completed_at,
+                calls_t.c.id, calls_t.c.lead_id, calls_t.c.salesperson_id, calls_t.c.salesperson_id,
+                calls_t.c.call_outcome, calls_t.c.remark, literal(None), literal(True),
+                literal(None), literal(None), literal(None),
+            ).where(closed_by_update).order_by(calls_t.c.id))
+        ).rowcount
+
+    db.commit()
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill call_events and rebuild derived tables from it")
+    parser.add_argument("--backfill", action="store_true", help="synthesize events for an empty log")
+    parser.add_argument("--rollups", action="store_true", help="rebuild call_daily_rollups")
+    parser.add_argument("--since", type=date.fromisoformat, help="rebuild rollups from this day on")
+    parser.add_argument("--summaries", action="store_true", help="rebuild call_logs summaries")
+    args = parser.parse_args()
+
+    init_engine()
+    db = SessionLocal()
+
+    if args.backfill:
+        print(f"✅ {backfill_events(db)} events backfilled")
+    if args.rollups:
+        print(f"✅ {rebuild_daily_rollups(db, args.since)} daily rollup rows written")
+    if args.summaries:
+        stats = replay_call_summaries(db)
+        print(f"✅ {stats['calls']} call summaries replayed, {stats['changed']} changed")
+
+    db.close()
@@ -0,0 +1,154 @@
+# app/utils/call_summary.py
+#
+# Keeps the denormalized follow-up summary on call_logs
+# (followup_count, last_outcome, last_followup_at, next_follow_up_at,
+# purchased_at) in step with call_follow_ups, so list / KPI queries read
+# one table.
+#
+#     python -m app.utils.call_summary --check
+#     python -m app.utils.call_summary --rebuild
+
+import argparse
+
+from sqlalchemy import select, update, func, case, or_
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, init_engine
+from app.models.call_log import CallLog
+from app.models.call_follow_up import CallFollowUp
+
+
+SUMMARY_COLUMNS = (
+    "followup_count",
+    "last_outcome",
+    "last_followup_at",
+    "next_follow_up_at",
+    "purchased_at",
+)
+
+
+def _expected_values():
+    """
+    Correlated SQL expressions for every summary column of a call.
+    """
+    fu = CallFollowUp
+    of_call = fu.call_id == CallLog.id
+
+    latest_outcome = (
+        select(fu.outcome)
+        .where(of_call)
+        .order_by(fu.created_at.desc(), fu.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    first_purchase = (
+        select(func.min(fu.created_at))
+        .where(of_call, fu.outcome == "Purchased")
+        .scalar_subquery()
+    )
+
+    return {
+        "followup_count": select(func.count()).where(of_call).scalar_subquery(),
+        "last_outcome": func.coalesce(latest_outcome, CallLog.call_outcome),
+        "last_followup_at": select(func.max(fu.created_at)).where(of_call).scalar_subquery(),
+        "next_follow_up_at": case(
+            (CallLog.status == "OPEN", CallLog.follow_up_datetime),
+            else_=None
+        ),
+        "purchased_at": func.coalesce(
+            first_purchase,
+            case(
+                (
+                    CallLog.call_outcome == "Purchased",
+                    func.coalesce(CallLog.completed_at, CallLog.created_at)
+                ),
+                else_=None
+            )
+        ),
+    }
+
+
+# ==================================================
+# MAINTAIN (CALLED BY WRITE PATHS, SAME TRANSACTION)
+# ==================================================
+def refresh_call_summaries(db: Session, call_ids):
+    """
+    Recompute the summary of the given calls with one UPDATE.
+
+    Pending follow-ups / status changes must be flushed first; the
+    statement reads them back through the call_id index.
+    """
+    call_ids = list(call_ids)
+    if not call_ids:
+        return
+
+    db.flush()
+    db.execute(
+        update(CallLog)
+        .where(CallLog.id.in_(call_ids))
+        .values(**_expected_values())
+        .execution_options(synchronize_session=False)
+    )
+
+
+# ==================================================
+# CHECK / REBUILD (MAINTENANCE)
+# ==================================================
+def find_inconsistent_calls(db: Session, limit: int = 1000):
+    """
+    Ids of calls whose stored summary differs from call_follow_ups.
+    """
+    expected = _expected_values()
+
+    return db.execute(
+        select(CallLog.id)
+        .where(or_(*[
+            getattr(CallLog, name).is_distinct_from(expected[name])
+            for name in SUMMARY_COLUMNS
+        ]))
+        .order_by(CallLog.id)
+        .limit(limit)
+    ).scalars().all()
+
+
+def rebuild_call_summaries(db: Session, batch_size: int = 5000):
+    """
+    Recompute every call's summary, batch_size ids per transaction.
+    Returns the number of calls processed.
+    """
+    last_id = 0
+    processed = 0
+
+    while True:
+        ids = db.execute(
+            select(CallLog.id)
+            .where(CallLog.id > last_id)
+            .order_by(CallLog.id)
+            .limit(batch_size)
+        ).scalars().all()
+
+        if not ids:
+            return processed
+
+        refresh_call_summaries(db, ids)
+        db.commit()
+
+        last_id = ids[-1]
+        processed += len(ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check or rebuild call_logs follow-up summaries")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every call")
+    args = parser.parse_args()
+
+    init_engine()
+    db = SessionLocal()
+
+    if args.rebuild:
+        print(f"✅ Rebuilt summaries for {rebuild_call_summaries(db)} calls")
+    else:
+        bad = find_inconsistent_calls(db)
+        print(f"{len(bad)} inconsistent calls" + (f": {bad[:20]}" if bad else ""))
+
+    db.close()
@@ -0,0 +1,70 @@
+from itertools import combinations
+
+from sqlalchemy import select, func, case, literal, union_all
+from sqlalchemy.orm import Session
+
+from app.models.call_log import CallLog
+from app.utils.analytics import dialect_name
+
+
+CUBE_DIMENSIONS = {
+    "state": CallLog.state,
+    "product": CallLog.query_product,
+    "source": CallLog.query_source,
+    "outcome": CallLog.last_outcome,       # latest outcome, first call or follow-up
+    "salesperson": CallLog.salesperson_id,
+}
+CUBE_MAX_DIMENSIONS = 3
+
+
+def _measures():
+    return [
+        func.count().label("calls"),
+        func.count(case((CallLog.status == "CLOSED", 1))).label("closed"),
+        func.count(CallLog.purchased_at).label("purchased"),
+        func.coalesce(func.sum(CallLog.followup_count), 0).label("follow_ups"),
+    ]
+
+
+# ==================================================
+# ONE STATEMENT FOR EVERY SUBTOTAL
+# ==================================================
+def cube_query(db: Session, dims, filters):
+    """
+    Counts for every combination of `dims` — each cell, every subtotal
+    and the grand total — in one statement over call_logs.
+
+    PostgreSQL groups by CUBE(...) and flags rolled-up columns with
+    GROUPING(); elsewhere the same grouping sets are spelled out as a
+    UNION ALL of GROUP BYs. Rows come back as (dim values...,
+    grouped flags..., measures...), a flag of 1 meaning "all values".
+    """
+    cols = [CUBE_DIMENSIONS[d] for d in dims]
+
+    if dialect_name(db) == "postgresql":
+        stmt = select(
+            *[c.label(d) for d, c in zip(dims, cols)],
+            *[func.grouping(c).label(f"g_{d}") for d, c in zip(dims, cols)],
+            *_measures()
+        ).where(*filters)
+        if cols:
+            stmt = stmt.group_by(func.cube(*cols))
+        return db.execute(stmt).all()
+
+    parts = []
+    for size in range(len(dims), -1, -1):
+        for kept in combinations(range(len(dims)), size):
+            parts.append(
+                select(
+                    *[
+                        (cols[i] if i in kept else literal(None)).label(d)
+                        for i, d in enumerate(dims)
+                    ],
+                    *[literal(0 if i in kept else 1).label(f"g_{d}") for i, d in enumerate(dims)],
+                    *_measures()
+                )
+                .where(*filters)
+                .group_by(*[cols[i] for i in kept])
+            )
+
+    return db.execute(union_all(*parts) if len(parts) > 1 else parts[0]).all()
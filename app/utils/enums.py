@@ -1,5 +1,9 @@
 from enum import Enum
 
+# Order matters for the enums stored as small-integer codes
+# (app.models.codes): a value's code is its position, so only ever
+# append new members.
+
 class RoleEnum(str, Enum):
     ADMIN = "ADMIN"
     SALESPERSON = "SALESPERSON"
@@ -7,4 +11,18 @@ class RoleEnum(str, Enum):
 class CallStatusEnum(str, Enum):
     OPEN = "OPEN"
     OVERDUE = "OVERDUE"
-    CLOSED = "CLOSED"
\ No newline at end of file
+    CLOSED = "CLOSED"
+
+class CallOutcomeEnum(str, Enum):
+    CONNECTED = "Connected"
+    NOT_PICKED = "Not Picked"
+    BUSY = "Busy"
+    CUT_IN_BETWEEN = "Cut-In Between"
+    NOT_REQUIRED = "Not Required"
+    PURCHASED = "Purchased"
+
+class LeadStatusEnum(str, Enum):
+    NEW = "NEW"
+    CALLED = "CALLED"
+    CLOSED = "CLOSED"
+    MERGED = "MERGED"
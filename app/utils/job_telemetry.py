@@ -0,0 +1,200 @@
+import threading
+import time
+from datetime import datetime
+
+from apscheduler.events import (
+    EVENT_JOB_SUBMITTED,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_ERROR,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_MAX_INSTANCES
+)
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.models.scheduler_job_stat import SchedulerJobStat
+
+
+# counters a job may return as a dict; anything else is ignored
+RUN_COUNTERS = ("rows_scanned", "emails_attempted", "emails_failed")
+
+
+def job_name(job_id: str):
+    # one-off jobs ("followup_reminder:123") are reported per kind
+    return job_id.split(":", 1)[0]
+
+
+# ==================================================
+# RECORD (SCHEDULER LISTENER)
+# ==================================================
+class JobTelemetry:
+    """
+    APScheduler listener that keeps scheduler_job_stats current: runs,
+    failures, duration, lag behind the scheduled time, misses, skipped
+    overlaps and the counters jobs return (RUN_COUNTERS).
+
+    Timing starts at submission, which is when the run is due to begin
+    (lag = submission - scheduled time); duration then includes any
+    wait for a free executor thread. A job fast enough to finish before
+    its submission event is dispatched is recorded with duration 0.
+    """
+
+    def __init__(self):
+        self._started = {}     # (job id, scheduled at) -> (perf counter, started at)
+        self._early = set()    # finished before their submission event
+        self._lock = threading.Lock()
+
+    def attach(self, scheduler):
+        scheduler.add_listener(
+            self.on_event,
+            EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR
+            | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+        )
+
+    def on_event(self, event):
+        try:
+            if event.code == EVENT_JOB_SUBMITTED:
+                self._submitted(event)
+            elif event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+                self._finished(event)
+            elif event.code == EVENT_JOB_MISSED:
+                self._save(event.job_id, missed=1, last_missed_at=event.scheduled_run_time)
+            elif event.code == EVENT_JOB_MAX_INSTANCES:
+                self._save(event.job_id, skipped=1)
+                print(f"[SCHEDULER] {event.job_id} still running, skipped a run")
+        except Exception as e:
+            # telemetry must never break the scheduler thread
+            print(f"[SCHEDULER] telemetry failed for {event.job_id}: {e}")
+
+    def _submitted(self, event):
+        key = (event.job_id, event.scheduled_run_times[-1])
+        started = (time.perf_counter(), datetime.now(key[1].tzinfo))
+        with self._lock:
+            if key in self._early:
+                self._early.discard(key)
+            else:
+                self._started[key] = started
+
+    def _finished(self, event):
+        scheduled = event.scheduled_run_time
+        key = (event.job_id, scheduled)
+        with self._lock:
+            started = self._started.pop(key, None)
+            if not started:
+                self._early.add(key)
+
+        if started:
+            perf, started_at = started
+            duration = time.perf_counter() - perf
+        else:
+            started_at, duration = datetime.now(scheduled.tzinfo), 0.0
+        lag = max((started_at - scheduled).total_seconds(), 0.0)
+        counts = event.retval if isinstance(getattr(event, "retval", None), dict) else {}
+        counts = {c: int(counts.get(c) or 0) for c in RUN_COUNTERS}
+        error = repr(event.exception) if event.exception else None
+
+        self._save(
+            event.job_id,
+            runs=1,
+            failures=1 if error else 0,
+            total_seconds=duration,
+            **counts,
+            last_scheduled_at=scheduled,
+            last_started_at=started_at,
+            last_lag_seconds=round(lag, 3),
+            last_duration_seconds=round(duration, 3),
+            last_rows_scanned=counts["rows_scanned"],
+            last_emails_attempted=counts["emails_attempted"],
+            last_emails_failed=counts["emails_failed"],
+            last_error=error[:500] if error else None,
+        )
+        if error:
+            print(f"[SCHEDULER] {event.job_id} failed after {duration:.1f}s: {error}")
+
+    def _save(self, job_id: str, **changes):
+        """
+        Add the counters and overwrite the last_* fields of the job's
+        row in a short transaction of its own.
+
+        One UPDATE ... SET runs = runs + :n (maxima with GREATEST), so
+        concurrent workers never lose each other's samples; the row is
+        created first when the UPDATE finds none.
+        """
+        name = job_name(job_id)
+        db = SessionLocal()
+        try:
+            stmt = self._update(db, name, changes)
+            if not db.execute(stmt).rowcount:
+                db.rollback()
+                try:
+                    db.execute(insert(SchedulerJobStat).values(
+                        name=name, runs=0, failures=0, missed=0, skipped=0,
+                        rows_scanned=0, emails_attempted=0, emails_failed=0,
+                        total_seconds=0, max_seconds=0, max_lag_seconds=0
+                    ))
+                    db.commit()
+                except IntegrityError:
+                    # another process created the row first
+                    db.rollback()
+                db.execute(stmt)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _update(db, name: str, changes: dict):
+        stat = SchedulerJobStat
+        # SQLite's two-argument max() is GREATEST elsewhere
+        greatest = func.max if db.get_bind().dialect.name == "sqlite" else func.greatest
+
+        values = {}
+        for field, value in changes.items():
+            column = getattr(stat, field)
+            values[field] = value if field.startswith("last_") else column + value
+
+        if "last_duration_seconds" in changes:
+            values["max_seconds"] = greatest(stat.max_seconds, changes["last_duration_seconds"])
+            values["max_lag_seconds"] = greatest(stat.max_lag_seconds, changes["last_lag_seconds"])
+
+        return update(stat).where(stat.name == name).values(**values)
+
+
+telemetry = JobTelemetry()
+
+
+# ==================================================
+# REPORT
+# ==================================================
+def job_stats(db):
+    """
+    One dict per job with its totals, averages and last run.
+    """
+    rows = db.execute(select(SchedulerJobStat).order_by(SchedulerJobStat.name)).scalars().all()
+    return [
+        {
+            "name": s.name,
+            "runs": s.runs,
+            "failures": s.failures,
+            "missed": s.missed,
+            "skipped_overlaps": s.skipped,
+            "avg_seconds": round(s.total_seconds / s.runs, 3) if s.runs else None,
+            "max_seconds": round(s.max_seconds, 3),
+            "max_lag_seconds": round(s.max_lag_seconds, 3),
+            "rows_scanned": s.rows_scanned,
+            "emails_attempted": s.emails_attempted,
+            "emails_failed": s.emails_failed,
+            "last_run": {
+                "scheduled_at": s.last_scheduled_at,
+                "started_at": s.last_started_at,
+                "lag_seconds": s.last_lag_seconds,
+                "duration_seconds": s.last_duration_seconds,
+                "rows_scanned": s.last_rows_scanned,
+                "emails_attempted": s.last_emails_attempted,
+                "emails_failed": s.last_emails_failed,
+                "error": s.last_error,
+            },
+            "last_missed_at": s.last_missed_at,
+        }
+        for s in rows
+    ]
@@ -0,0 +1,189 @@
+from sqlalchemy import select, update, func, case
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.lead import Lead
+from app.models.call_log import CallLog
+
+
+STRATEGIES = ("round_robin", "least_open", "affinity")
+
+# affinity: leads whose state / product matches go to the reps with the
+# most calls there (top N, balanced between them)
+AFFINITY_FIELDS = {
+    "state": (Lead.state, CallLog.state),
+    "product": (Lead.query_product, CallLog.query_product),
+}
+AFFINITY_TOP_REPS = 3
+
+
+# ==================================================
+# WORKLOAD (ONE GROUPED QUERY)
+# ==================================================
+def salesperson_workloads(db: Session, salesperson_ids=None):
+    """
+    {salesperson_id: open workload} for active salespersons, where
+    workload = OPEN calls + assigned leads not called yet.
+    """
+    open_calls = (
+        select(func.count())
+        .where(CallLog.salesperson_id == User.id, CallLog.status == "OPEN")
+        .scalar_subquery()
+    )
+    new_leads = (
+        select(func.count())
+        .where(Lead.salesperson_id == User.id, Lead.status == "NEW")
+        .scalar_subquery()
+    )
+
+    q = select(User.id, open_calls + new_leads).where(
+        User.role == "SALESPERSON",
+        User.is_active.isnot(False)
+    )
+    if salesperson_ids:
+        q = q.where(User.id.in_(salesperson_ids))
+
+    return dict(db.execute(q.order_by(User.id)).all())
+
+
+def water_fill(loads: dict, n: int):
+    """
+    Split n new leads so the final loads are as even as possible:
+    lowest-loaded reps are topped up first. Returns {rep: quota}.
+    """
+    reps = sorted(loads, key=lambda r: (loads[r], r))
+    quotas = dict.fromkeys(reps, 0)
+    remaining = n
+
+    # raise the "water level" one step (the next rep's load) at a time
+    for i, rep in enumerate(reps):
+        level_reps = reps[:i + 1]
+        next_load = loads[reps[i + 1]] if i + 1 < len(reps) else None
+        current = loads[rep] + quotas[rep]
+
+        room = (next_load - current) * len(level_reps) if next_load is not None else remaining
+        step = min(room, remaining)
+
+        each, extra = divmod(step, len(level_reps))
+        for j, r in enumerate(level_reps):
+            quotas[r] += each + (1 if j < extra else 0)
+        remaining -= step
+
+        if not remaining:
+            break
+
+    return quotas
+
+
+# ==================================================
+# ASSIGN (ONE SET-BASED UPDATE)
+# ==================================================
+def assign_leads(
+    db: Session,
+    strategy: str,
+    *,
+    lead_ids=None,
+    salesperson_ids=None,
+    limit: int | None = None,
+    affinity: str = "state"
+):
+    """
+    Assign unassigned leads (all of them, or `lead_ids`, at most
+    `limit`, oldest first) to active salespersons.
+
+    - round_robin: deal leads out in turn, least-loaded rep first
+    - least_open:  quotas that level everyone's open workload
+    - affinity:    same state / product as the rep's call history, else
+                   round robin
+
+    Unassigned leads are numbered with row_number() and mapped to a rep
+    by a CASE over that number, so the whole batch is one UPDATE ... FROM.
+    Returns {"assigned": n, "plan": {rep: planned count}}.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {STRATEGIES}")
+
+    loads = salesperson_workloads(db, salesperson_ids)
+    if not loads:
+        return {"assigned": 0, "plan": {}}
+
+    reps = sorted(loads, key=lambda r: (loads[r], r))
+    lead_value, call_value = AFFINITY_FIELDS.get(affinity, AFFINITY_FIELDS["state"])
+
+    rn_all = func.row_number().over(order_by=Lead.id) - 1
+    ranked = select(
+        Lead.id.label("lead_id"),
+        lead_value.label("val"),
+        rn_all.label("rn_all"),
+        (func.row_number().over(partition_by=lead_value, order_by=Lead.id) - 1).label("rn_val"),
+    ).where(Lead.salesperson_id.is_(None))
+
+    if lead_ids:
+        ranked = ranked.where(Lead.id.in_(lead_ids))
+    if limit:
+        ranked = ranked.order_by(Lead.id).limit(limit)
+    ranked = ranked.subquery("ranked")
+
+    round_robin = case(
+        {i: rep for i, rep in enumerate(reps)},
+        value=ranked.c.rn_all % len(reps)
+    )
+
+    if strategy == "round_robin":
+        rep_expr = round_robin
+        plan = None
+
+    elif strategy == "least_open":
+        total = db.execute(select(func.count()).select_from(ranked)).scalar()
+        quotas = water_fill(loads, total)
+
+        bounds, upto = [], 0
+        for rep in reps:
+            if quotas[rep]:
+                upto += quotas[rep]
+                bounds.append((ranked.c.rn_all < upto, rep))
+        if not bounds:
+            return {"assigned": 0, "plan": {}}
+
+        rep_expr = case(*bounds, else_=bounds[-1][1])
+        plan = {rep: q for rep, q in quotas.items() if q}
+
+    else:
+        history = db.execute(
+            select(CallLog.salesperson_id, call_value, func.count())
+            .where(CallLog.salesperson_id.in_(reps), call_value.isnot(None))
+            .group_by(CallLog.salesperson_id, call_value)
+        ).all()
+
+        by_value = {}
+        for rep, value, calls in history:
+            by_value.setdefault(value, []).append((calls, rep))
+
+        branches = []
+        for value, ranked_reps in by_value.items():
+            top = [rep for _, rep in sorted(ranked_reps, reverse=True)[:AFFINITY_TOP_REPS]]
+            # least-loaded affine rep first
+            top.sort(key=lambda r: (loads[r], r))
+            branches.append((
+                ranked.c.val == value,
+                case({i: rep for i, rep in enumerate(top)}, value=ranked.c.rn_val % len(top))
+            ))
+
+        rep_expr = case(*branches, else_=round_robin) if branches else round_robin
+        plan = None
+
+    if plan is None:
+        # the CASE decides; group by it once for the response
+        rep_col = rep_expr.label("rep")
+        plan = dict(db.execute(
+            select(rep_col, func.count()).select_from(ranked).group_by(rep_col)
+        ).all())
+
+    assigned = db.execute(
+        update(Lead)
+        .where(Lead.id == ranked.c.lead_id, Lead.salesperson_id.is_(None))
+        .values(salesperson_id=rep_expr)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    return {"assigned": assigned, "plan": plan}
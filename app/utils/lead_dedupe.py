@@ -0,0 +1,208 @@
+import re
+from difflib import SequenceMatcher
+
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.lead import Lead
+from app.models.call_log import CallLog
+from app.models.job_watermark import JobWatermark
+from app.utils.phone import normalize_phone
+
+
+WATERMARK = "lead_dedupe"
+DEDUPE_BATCH_SIZE = 50_000
+
+# same phone but clearly different names (a shop's shared line, family
+# members) is not treated as the same customer
+NAME_MATCH_THRESHOLD = 0.75
+_HONORIFICS = {"mr", "mrs", "ms", "miss", "dr", "shri", "smt", "sri"}
+
+
+def normalize_name(name):
+    words = re.sub(r"[^a-z0-9 ]", " ", (name or "").lower()).split()
+    return " ".join(w for w in words if w not in _HONORIFICS)
+
+
+def names_match(a: str, b: str):
+    """
+    Fuzzy name check for two leads that share a phone number.
+    Missing names, one name contained in the other ("Ramesh" /
+    "Ramesh Kumar") or a close spelling all count as a match.
+    """
+    a, b = normalize_name(a), normalize_name(b)
+    if not a or not b or a == b:
+        return True
+
+    short, long_ = sorted((a.split(), b.split()), key=len)
+    if set(short) <= set(long_):
+        return True
+
+    return SequenceMatcher(None, a, b).ratio() >= NAME_MATCH_THRESHOLD
+
+
+# ==================================================
+# INCREMENTAL DEDUPE PASS
+# ==================================================
+def _watermark(db: Session):
+    mark = db.get(JobWatermark, WATERMARK)
+    if not mark:
+        mark = JobWatermark(name=WATERMARK, last_id=0)
+        db.add(mark)
+        db.flush()
+    return mark
+
+
+def _normalize_batch(db: Session, low: int, high: int):
+    """
+    Fill phone_normalized for leads in (low, high] that lack it (bulk
+    imports, rows older than the column). Returns rows updated.
+    """
+    rows = db.execute(
+        select(Lead.id, Lead.contact_number)
+        .where(Lead.id > low, Lead.id <= high, Lead.phone_normalized.is_(None))
+    ).all()
+
+    params = [
+        {"id": lead_id, "phone_normalized": normalize_phone(number)}
+        for lead_id, number in rows
+        if normalize_phone(number)
+    ]
+    if params:
+        db.execute(update(Lead), params)
+    return len(params)
+
+
+def dedupe_leads(mode: str = "flag", full: bool = False, batch_size: int = DEDUPE_BATCH_SIZE):
+    """
+    Find leads that are the same customer across (or within)
+    salespersons and link each to the oldest one via duplicate_of_id.
+
+    Only leads added since the last run are examined (job_watermarks),
+    `batch_size` ids per transaction. For each batch the phones of the
+    new leads are grouped in SQL, and only the leads sharing those
+    phones are fetched — ordered by phone, so every phone's group is
+    handled in one pass with no pairwise comparison across groups.
+
+    mode "flag" only sets duplicate_of_id; "merge" also marks duplicates
+    that have no call logged yet as MERGED, which takes them off the
+    rep's lead list. `full` rescans every lead.
+    """
+    if mode not in ("flag", "merge"):
+        raise ValueError("mode must be 'flag' or 'merge'")
+
+    db: Session = SessionLocal()
+    stats = {"scanned": 0, "normalized": 0, "groups": 0, "flagged": 0, "merged": 0}
+
+    try:
+        mark = _watermark(db)
+        low = 0 if full else mark.last_id
+        max_id = db.execute(select(func.max(Lead.id))).scalar() or 0
+
+        while low < max_id:
+            high = min(low + batch_size, max_id)
+            stats["scanned"] += high - low
+            stats["normalized"] += _normalize_batch(db, low, high)
+
+            # phones of this batch that occur more than once overall
+            batch_phones = (
+                select(Lead.phone_normalized)
+                .where(Lead.id > low, Lead.id <= high, Lead.phone_normalized.isnot(None))
+                .distinct()
+                .subquery()
+            )
+            shared = (
+                select(Lead.phone_normalized)
+                .where(Lead.phone_normalized.in_(select(batch_phones)))
+                .group_by(Lead.phone_normalized)
+                .having(func.count() > 1)
+                .subquery()
+            )
+            members = db.execute(
+                select(Lead.id, Lead.phone_normalized, Lead.client_name, Lead.duplicate_of_id)
+                .where(Lead.phone_normalized.in_(select(shared)))
+                .order_by(Lead.phone_normalized, Lead.id)
+            ).all()
+
+            links = []
+            group, phone = [], None
+            for row in members + [None]:
+                if row is None or row.phone_normalized != phone:
+                    if group:
+                        links.extend(_group_links(group, low, high))
+                        stats["groups"] += 1
+                    group, phone = [], row and row.phone_normalized
+                if row is not None:
+                    group.append(row)
+
+            if links:
+                db.execute(update(Lead), [
+                    {"id": dup, "duplicate_of_id": original} for dup, original in links
+                ])
+                stats["flagged"] += len(links)
+
+                if mode == "merge":
+                    stats["merged"] += _merge(db, low, high)
+
+            mark.last_id = high
+            db.commit()
+            low = high
+
+        if full and mode == "merge":
+            # earlier flag-only runs: merge what is already linked
+            stats["merged"] += _merge(db, 0, max_id)
+            db.commit()
+
+        return stats
+    finally:
+        db.close()
+
+
+def _group_links(group, low: int, high: int):
+    """
+    (duplicate id, original id) pairs for one phone's leads. The
+    original is the oldest lead that is not itself a duplicate; only
+    leads of the current batch are linked to it.
+    """
+    originals = [r for r in group if r.duplicate_of_id is None]
+    if not originals:
+        return []
+
+    original = originals[0]
+    return [
+        (r.id, original.id)
+        for r in group
+        if r.id != original.id
+        and r.duplicate_of_id is None
+        and low < r.id <= high
+        and names_match(r.client_name, original.client_name)
+    ]
+
+
+def _merge(db: Session, low: int, high: int):
+    """
+    MERGE flagged duplicates in (low, high] that nobody has called yet.
+    """
+    called = select(CallLog.lead_id).where(CallLog.lead_id.isnot(None))
+    stmt = (
+        update(Lead)
+        .where(
+            Lead.id > low,
+            Lead.id <= high,
+            Lead.duplicate_of_id.isnot(None),
+            Lead.status == "NEW",
+            Lead.id.not_in(called)
+        )
+        .values(status="MERGED")
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
+
+
+def run_nightly_dedupe():
+    stats = dedupe_leads(mode="flag")
+    print(f"[DEDUPE] {stats}")
+
+    # counters for app.utils.job_telemetry
+    return {"rows_scanned": stats["scanned"]}
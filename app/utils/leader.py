@@ -0,0 +1,161 @@
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, insert, update, or_
+from sqlalchemy.exc import IntegrityError
+
+from app.database import get_engine
+from app.models.scheduler_lease import SchedulerLease
+from app.config import SCHEDULER_LEASE_TTL_SECONDS
+
+
+# ==================================================
+# DB-BACKED LEADER ELECTION (LEASE + HEARTBEAT)
+# ==================================================
+class LeaderElector:
+    """
+    Keeps at most one process in the "leader" role for `name`.
+
+    Every ttl/3 seconds a background thread tries to take or renew the
+    lease row with a single conditional UPDATE (only succeeds if we
+    already hold it or it has expired). Role changes are reported via
+    on_elected / on_demoted; on_heartbeat runs on every tick while we
+    lead. If the database is unreachable we step down, so a partitioned
+    worker never keeps running jobs on a stale lease.
+
+    Failover takes at most `ttl` seconds after the leader dies without
+    releasing its lease.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        on_elected=None,
+        on_demoted=None,
+        on_heartbeat=None,
+        ttl: int = SCHEDULER_LEASE_TTL_SECONDS,
+        engine=None,
+        holder: str | None = None
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.engine = engine or get_engine()
+        self.holder = holder or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.on_heartbeat = on_heartbeat
+
+        self.is_leader = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --------------------------------------------------
+    # LEASE
+    # --------------------------------------------------
+    def try_acquire(self):
+        """
+        Take or renew the lease. Returns True while we hold it.
+        """
+        lease = SchedulerLease.__table__
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl)
+
+        with self.engine.begin() as conn:
+            renewed = conn.execute(
+                update(lease)
+                .where(
+                    lease.c.name == self.name,
+                    or_(lease.c.holder == self.holder, lease.c.expires_at < now)
+                )
+                .values(holder=self.holder, expires_at=expires_at)
+            ).rowcount
+
+            if renewed:
+                return True
+
+            exists = conn.execute(
+                select(lease.c.name).where(lease.c.name == self.name)
+            ).first()
+
+        if exists:
+            return False
+
+        # first boot: race to create the row, the primary key picks a winner
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    insert(lease).values(
+                        name=self.name,
+                        holder=self.holder,
+                        expires_at=expires_at
+                    )
+                )
+            return True
+        except IntegrityError:
+            return False
+
+    def release(self):
+        lease = SchedulerLease.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(lease)
+                .where(lease.c.name == self.name, lease.c.holder == self.holder)
+                .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+
+    # --------------------------------------------------
+    # HEARTBEAT LOOP
+    # --------------------------------------------------
+    def tick(self):
+        try:
+            leading = self.try_acquire()
+        except Exception as e:
+            print(f"[LEADER] Lease check failed for {self.holder}: {e}")
+            leading = False
+
+        if leading and not self.is_leader:
+            self.is_leader = True
+            if self.on_elected:
+                self.on_elected()
+        elif not leading and self.is_leader:
+            self.is_leader = False
+            if self.on_demoted:
+                self.on_demoted()
+
+        if self.is_leader and self.on_heartbeat:
+            self.on_heartbeat()
+
+    def _run(self):
+        interval = max(self.ttl / 3, 0.1)
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(interval)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"leader-{self.name}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, release: bool = True):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+        if self.is_leader:
+            self.is_leader = False
+            if self.on_demoted:
+                self.on_demoted()
+            if release:
+                try:
+                    self.release()
+                except Exception:
+                    pass
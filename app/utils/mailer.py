@@ -6,13 +6,15 @@ from app.config import (
     SMTP_PORT,
     SMTP_USER,
     SMTP_PASSWORD,
-    MAIL_FROM
+    MAIL_FROM,
+    SMTP_TIMEOUT_SECONDS
 )
 
 
 def send_email(to_email: str, subject: str, html_content: str):
     """
-    Generic email sender used by scheduler jobs.
+    Generic email sender used by scheduler jobs. Returns True when the
+    message was handed to the SMTP server, False on any failure.
     """
 
     msg = MIMEMultipart("alternative")
@@ -23,12 +25,14 @@ def send_email(to_email: str, subject: str, html_content: str):
     msg.attach(MIMEText(html_content, "html"))
 
     try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
+        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS) as server:
             server.starttls()
             server.login(SMTP_USER, SMTP_PASSWORD)
             server.send_message(msg)
+        return True
 
     except Exception as e:
         # Intentionally not raising error
         # Scheduler should never crash due to email failure
-        print(f"[MAIL ERROR] Failed to send email to {to_email}: {e}")
\ No newline at end of file
+        print(f"[MAIL ERROR] Failed to send email to {to_email}: {e}")
+        return False
\ No newline at end of file
@@ -0,0 +1,23 @@
+import re
+
+_NON_DIGITS = re.compile(r"\D")
+
+# numbers are compared on their last 10 digits (national number), so
+# "+91 98765 43210", "098765-43210" and "9876543210" all match
+NATIONAL_DIGITS = 10
+MIN_DIGITS = 7
+
+
+def normalize_phone(raw):
+    """
+    Digits-only national number used for duplicate matching, or None
+    when there are too few digits to be a phone number.
+    """
+    if not raw:
+        return None
+
+    digits = _NON_DIGITS.sub("", str(raw))
+    if len(digits) < MIN_DIGITS:
+        return None
+
+    return digits[-NATIONAL_DIGITS:]
@@ -0,0 +1,256 @@
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models.lead import Lead
+from app.models.call_log import CallLog
+from app.utils.phone import normalize_phone
+from app.utils.pubsub import add_commit_listener
+from app.config import PHONE_INDEX_BATCH_SIZE, PHONE_INDEX_REFRESH_SECONDS, SYNC_SETTLE_SECONDS
+
+
+# entry layout: one tuple per normalized phone
+LEAD_ID, CALL_ID, OWNER, STATUS, LAST_OUTCOME = range(5)
+
+
+# ==================================================
+# IN-PROCESS CALLER-ID INDEX
+# ==================================================
+class PhoneIndex:
+    """
+    normalized phone -> (lead id, latest call id, owner, status, last
+    outcome), held in a dict so caller-ID lookups never query the
+    database.
+
+    A phone's entry follows its most recent call (status and outcome
+    are the call's); a phone nobody has called yet points at its newest
+    lead, with the lead's status. MERGED duplicates are skipped.
+
+    Filled by warm() in one streaming pass on a background thread started
+    at startup (lookups answer 503 until `ready`), then kept current by
+    refresh(): right after commits in this process (commit listener),
+    and every PHONE_INDEX_REFRESH_SECONDS from updated_at for writes made
+    by other workers. Rows that leave the tables (archived calls) are
+    not removed; their entry keeps the last call id seen.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.ready = False
+        self.warm_seconds = None
+        self.refreshed_at = None    # newest updated_at applied (naive UTC)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def lookup(self, raw_number):
+        phone = normalize_phone(raw_number)
+        return phone, (self._entries.get(phone) if phone else None)
+
+    # --------------------------------------------------
+    # APPLY ROWS
+    # --------------------------------------------------
+    def _apply_lead(self, lead_id, phone, number, owner, status):
+        # phone_normalized is missing on rows the dedupe pass has not reached
+        phone = phone or normalize_phone(number)
+        if not phone or status == "MERGED":
+            return
+        current = self._entries.get(phone)
+        if current is None or (current[CALL_ID] is None and lead_id >= current[LEAD_ID]):
+            self._entries[phone] = (lead_id, None, owner, status, None)
+
+    def _apply_call(self, call_id, lead_id, number, owner, status, last_outcome):
+        phone = normalize_phone(number)
+        if not phone:
+            return
+        current = self._entries.get(phone)
+        if current is None or current[CALL_ID] is None or call_id >= current[CALL_ID]:
+            self._entries[phone] = (lead_id, call_id, owner, status, last_outcome)
+
+    def _load(self, db, lead_filter, call_filter, stream=False):
+        """
+        Apply the matching leads, then the matching calls, oldest first
+        (so the newest row for a phone wins). Returns the newest
+        updated_at seen.
+        """
+        leads = (
+            select(
+                Lead.id, Lead.phone_normalized, Lead.contact_number, Lead.salesperson_id,
+                Lead.status, Lead.updated_at
+            )
+            .where(*lead_filter)
+            .order_by(Lead.id)
+        )
+        calls = (
+            select(
+                CallLog.id, CallLog.lead_id, CallLog.contact_number, CallLog.salesperson_id,
+                CallLog.status, CallLog.last_outcome, CallLog.updated_at
+            )
+            .where(*call_filter)
+            .order_by(CallLog.id)
+        )
+        if stream:
+            leads = leads.execution_options(yield_per=PHONE_INDEX_BATCH_SIZE)
+            calls = calls.execution_options(yield_per=PHONE_INDEX_BATCH_SIZE)
+
+        # Core rows straight off the cursor, no ORM result processing
+        conn = db.connection()
+        newest = self.refreshed_at
+        with self._lock:
+            for lead_id, phone, number, owner, status, updated_at in conn.execute(leads):
+                self._apply_lead(lead_id, phone, number, owner, status)
+                if updated_at and (newest is None or updated_at > newest):
+                    newest = updated_at
+
+            for call_id, lead_id, number, owner, status, outcome, updated_at in conn.execute(calls):
+                self._apply_call(call_id, lead_id, number, owner, status, outcome)
+                if updated_at and (newest is None or updated_at > newest):
+                    newest = updated_at
+        return newest
+
+    # --------------------------------------------------
+    # WARM / REFRESH
+    # --------------------------------------------------
+    def warm(self):
+        """
+        Build the index from scratch, streaming leads and calls
+        PHONE_INDEX_BATCH_SIZE rows at a time.
+        """
+        started = time.perf_counter()
+        scan_started_at = datetime.utcnow()
+        self._entries = {}
+        self.refreshed_at = None
+
+        db = SessionLocal()
+        try:
+            newest = self._load(db, (), (), stream=True)
+        finally:
+            db.close()
+
+        # rows written while the scan ran may have been passed already:
+        # the first refresh_changed() re-reads everything from its start
+        self.refreshed_at = min(newest, scan_started_at) if newest else scan_started_at
+        self.ready = True
+        self.warm_seconds = round(time.perf_counter() - started, 3)
+        stats = self.stats()
+        print(
+            f"[PHONE INDEX] {stats['phones']:,} numbers, {stats['memory_mb']} MB, "
+            f"warmed in {self.warm_seconds}s"
+        )
+
+    def refresh(self, lead_ids=(), call_ids=()):
+        """
+        Re-read specific leads / calls (after this process wrote them).
+        """
+        if not self.ready or not (lead_ids or call_ids):
+            return
+        lead_ids, call_ids = list(lead_ids), list(call_ids)
+        db = SessionLocal()
+        try:
+            # bulk admin operations can name thousands of rows
+            for i in range(0, max(len(lead_ids), len(call_ids)), PHONE_INDEX_BATCH_SIZE):
+                self._load(
+                    db,
+                    (Lead.id.in_(lead_ids[i:i + PHONE_INDEX_BATCH_SIZE]),),
+                    (CallLog.id.in_(call_ids[i:i + PHONE_INDEX_BATCH_SIZE]),)
+                )
+        finally:
+            db.close()
+
+    def refresh_changed(self):
+        """
+        Apply rows changed since the last pass, re-reading a
+        SYNC_SETTLE_SECONDS overlap for transactions that were still
+        committing (applying a row twice is harmless).
+        """
+        if not self.ready:
+            return
+        since = (self.refreshed_at or datetime.utcnow()) - timedelta(seconds=SYNC_SETTLE_SECONDS)
+        db = SessionLocal()
+        try:
+            self.refreshed_at = self._load(
+                db,
+                (Lead.updated_at >= since,),
+                (CallLog.updated_at >= since,)
+            )
+        finally:
+            db.close()
+
+    def on_commit(self, events):
+        lead_ids = {e["lead_id"] for e in events if e.get("lead_id")}
+        call_ids = {e["call_id"] for e in events if e.get("call_id")}
+        try:
+            self.refresh(lead_ids, call_ids)
+        except Exception as e:
+            # the periodic pass picks the rows up later
+            print(f"[PHONE INDEX] refresh failed: {e}")
+
+    # --------------------------------------------------
+    # BACKGROUND REFRESH (WRITES FROM OTHER WORKERS)
+    # --------------------------------------------------
+    def start(self, interval: int = PHONE_INDEX_REFRESH_SECONDS):
+        """
+        Warm on a background thread (startup does not wait for it), then
+        catch up and refresh every `interval` seconds (0 = warm only).
+        """
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="phone-index", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self, interval: int):
+        try:
+            self.warm()
+            self.refresh_changed()
+        except Exception as e:
+            print(f"[PHONE INDEX] warm failed: {e}")
+            return
+
+        if interval <= 0:
+            return
+        while not self._stop.wait(interval):
+            try:
+                self.refresh_changed()
+            except Exception as e:
+                print(f"[PHONE INDEX] periodic refresh failed: {e}")
+
+    # --------------------------------------------------
+    # FOOTPRINT
+    # --------------------------------------------------
+    def stats(self):
+        """
+        Entry count and approximate heap held by the index: the dict,
+        its keys, the tuples and the id ints they reference (status /
+        outcome strings are shared and not counted).
+        """
+        entries = self._entries
+        size = sys.getsizeof(entries)
+        for phone, entry in list(entries.items()):
+            size += sys.getsizeof(phone) + sys.getsizeof(entry)
+            size += sum(sys.getsizeof(v) for v in entry[:OWNER + 1] if v is not None and v > 256)
+
+        return {
+            "ready": self.ready,
+            "phones": len(entries),
+            "memory_mb": round(size / 2**20, 1),
+            "bytes_per_phone": round(size / len(entries)) if entries else 0,
+            "warm_seconds": self.warm_seconds,
+            "refreshed_at": self.refreshed_at,
+        }
+
+
+phone_index = PhoneIndex()
+add_commit_listener(phone_index.on_commit)
@@ -0,0 +1,18 @@
+from sqlalchemy.orm import Session
+
+
+# ==================================================
+# COLUMN-PROJECTED READS FOR LARGE LISTS
+# ==================================================
+def fetch_dicts(db: Session, stmt):
+    """
+    Run a Core select() of plain columns and return one dict per row,
+    keyed by the column labels.
+
+    Rows come back as tuples straight from the cursor: no ORM entities,
+    identity map or attribute instrumentation, and only the selected
+    columns are fetched.
+    """
+    result = db.execute(stmt)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
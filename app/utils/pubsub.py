@@ -0,0 +1,133 @@
+import asyncio
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.config import SSE_QUEUE_SIZE
+
+
+# ==================================================
+# SUBSCRIBER (ONE PER OPEN SSE CONNECTION)
+# ==================================================
+class Subscriber:
+    """
+    Bounded per-connection queue living on the server's event loop.
+
+    When a slow client lets its queue fill up, new events are dropped
+    and `overflowed` is set; the stream then sends a single "resync"
+    event so the page reloads once instead of the server buffering
+    without limit.
+    """
+
+    def __init__(self, loop, user_id: int, is_admin: bool):
+        self.loop = loop
+        self.user_id = user_id
+        self.is_admin = is_admin
+        self.queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        self.overflowed = False
+
+    def wants(self, evt: dict):
+        return self.is_admin or evt.get("salesperson_id") == self.user_id
+
+    def offer(self, evt: dict):
+        # runs on the event loop thread
+        try:
+            self.queue.put_nowait(evt)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+# ==================================================
+# IN-PROCESS BROKER
+# ==================================================
+class Broker:
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id: int, is_admin: bool):
+        """
+        Must be called from inside the running event loop.
+        """
+        sub = Subscriber(asyncio.get_running_loop(), user_id, is_admin)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def publish(self, evt: dict):
+        """
+        Thread-safe; called from sync route handlers in the threadpool.
+        """
+        with self._lock:
+            targets = [s for s in self._subscribers if s.wants(evt)]
+            self.published += 1
+
+        for sub in targets:
+            if sub.overflowed:
+                self.dropped += 1
+                continue
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, evt)
+            except RuntimeError:
+                # loop already closed (server shutting down)
+                self.unsubscribe(sub)
+
+    def stats(self):
+        with self._lock:
+            subscribers = len(self._subscribers)
+        return {
+            "subscribers": subscribers,
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+
+broker = Broker()
+
+
+# ==================================================
+# PUBLISH ONLY WHAT ACTUALLY COMMITTED
+# ==================================================
+def publish_after_commit(db: Session, event_type: str, **fields):
+    """
+    Queue a change event on the session; it is published after the
+    surrounding transaction commits and discarded on rollback.
+    """
+    db.info.setdefault("pending_events", []).append(
+        {"type": event_type, **fields}
+    )
+
+
+_commit_listeners = []
+
+
+def add_commit_listener(fn):
+    """
+    Call fn(events) in-process after every commit that published change
+    events — e.g. to drop cached aggregates.
+    """
+    _commit_listeners.append(fn)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_pending(session):
+    events = session.info.pop("pending_events", [])
+    for evt in events:
+        broker.publish(evt)
+
+    if events:
+        for fn in _commit_listeners:
+            fn(events)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_pending(session):
+    session.info.pop("pending_events", None)
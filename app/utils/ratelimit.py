@@ -0,0 +1,204 @@
+import math
+import time
+from collections import Counter
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.deps import token_user_id
+from app.config import RATE_LIMIT_ENABLED, RATE_LIMITS, MAX_CONCURRENT_REQUESTS
+
+
+# long-lived or static paths that never count against the limits
+EXEMPT_PREFIXES = ("/events/stream", "/docs", "/redoc", "/openapi.json")
+
+
+# HTML pages (app/routes/frontend.py): cached, never limited
+PAGE_PATHS = frozenset({
+    "/", "/login", "/register", "/dashboard", "/admin", "/call-details",
+    "/follow-ups", "/all-calls", "/leads", "/admin-performance",
+})
+
+
+def route_class(method: str, path: str):
+    """
+    auth / write / read / admin, or None for HTML pages (not limited).
+    Any other path is API and counts as read or write — including
+    /sync, /lookup and routes added later.
+    """
+    if path.startswith("/auth/"):
+        return "auth"
+    if method in ("GET", "HEAD") and path in PAGE_PATHS:
+        return None
+    if method not in ("GET", "HEAD", "OPTIONS"):
+        return "write"
+    if path.startswith("/admin/"):
+        return "admin"
+    return "read"
+
+
+def parse_rate(spec: str):
+    """
+    "120/60" -> (capacity=120, refill_per_second=2.0)
+    """
+    requests, seconds = spec.split("/")
+    return int(requests), int(requests) / float(seconds)
+
+
+# ==================================================
+# TOKEN BUCKETS (PER USER + ROUTE CLASS)
+# ==================================================
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: int, rate: float, now: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def take(self, now: float):
+        """
+        Spend one token. Returns 0 on success, else seconds to wait.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Buckets live in this process only; with several workers each one
+    enforces its own share. Touched only from the event loop, so no
+    locking is needed.
+    """
+
+    PRUNE_EVERY = 1000    # requests between sweeps of idle buckets
+
+    def __init__(self, limits: dict):
+        self.limits = {name: parse_rate(spec) for name, spec in limits.items()}
+        self.buckets = {}
+        self._calls = 0
+
+    def check(self, key, cls: str, now: float):
+        capacity, rate = self.limits[cls]
+        bucket = self.buckets.get((key, cls))
+        if bucket is None:
+            bucket = self.buckets[(key, cls)] = TokenBucket(capacity, rate, now)
+
+        self._calls += 1
+        if self._calls % self.PRUNE_EVERY == 0:
+            self.prune(now)
+
+        return bucket.take(now)
+
+    def prune(self, now: float):
+        # a bucket idle long enough to have refilled is the same as a new one
+        self.buckets = {
+            k: b for k, b in self.buckets.items()
+            if b.tokens + (now - b.updated) * b.rate < b.capacity
+        }
+
+
+# ==================================================
+# SHEDDING STATE (ONE PER PROCESS)
+# ==================================================
+class LoadShedder:
+    def __init__(
+        self,
+        *,
+        enabled: bool = RATE_LIMIT_ENABLED,
+        limits: dict = RATE_LIMITS,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS
+    ):
+        self.enabled = enabled
+        self.limiter = RateLimiter(limits)
+        self.max_concurrent = max_concurrent
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.rate_limited = Counter()
+        self.overloaded = 0
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "limits": {
+                cls: {"burst": capacity, "per_second": round(rate, 3)}
+                for cls, (capacity, rate) in self.limiter.limits.items()
+            },
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "shed_rate_limited": dict(self.rate_limited),
+            "shed_overloaded": self.overloaded,
+            "tracked_buckets": len(self.limiter.buckets),
+        }
+
+
+load_shedder = LoadShedder()
+
+
+# ==================================================
+# ASGI MIDDLEWARE
+# ==================================================
+class LoadSheddingMiddleware:
+    """
+    Rejects requests before routing (and before get_db checks out a
+    connection):
+
+    - 429 + Retry-After when the user's bucket for the route class is
+      empty (anonymous auth requests are keyed by client IP);
+    - 503 + Retry-After when max_concurrent requests are already in
+      flight, so a spike is shed instead of queueing on the threadpool
+      and the DB pool.
+    """
+
+    def __init__(self, app, shedder: LoadShedder = load_shedder):
+        self.app = app
+        self.shedder = shedder
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        shedder = self.shedder
+
+        if shedder.enabled:
+            cls = route_class(scope["method"], scope["path"])
+            if cls:
+                request = Request(scope)
+                key = token_user_id(request) if cls != "auth" else None
+                if key is None:
+                    key = request.client.host if request.client else "-"
+
+                wait = shedder.limiter.check(key, cls, time.monotonic())
+                if wait:
+                    shedder.rate_limited[cls] += 1
+                    await self._reject(scope, receive, send, 429, "Too many requests", wait)
+                    return
+
+        if shedder.max_concurrent and shedder.in_flight >= shedder.max_concurrent:
+            shedder.overloaded += 1
+            await self._reject(scope, receive, send, 503, "Server busy, retry shortly", 1)
+            return
+
+        shedder.in_flight += 1
+        shedder.peak_in_flight = max(shedder.peak_in_flight, shedder.in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            shedder.in_flight -= 1
+
+    async def _reject(self, scope, receive, send, status: int, detail: str, retry_after: float):
+        response = JSONResponse(
+            {"detail": detail},
+            status_code=status,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, insert, delete, func, literal
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.call_log import CallLog
+from app.models.call_follow_up import CallFollowUp
+from app.models.call_archive import CallLogArchive, CallFollowUpArchive
+from app.models.sync_tombstone import SyncTombstone
+from app.utils.pubsub import publish_after_commit
+from app.config import ARCHIVE_AFTER_MONTHS, ARCHIVE_BATCH_SIZE, SYNC_TOMBSTONE_DAYS
+
+
+def _copy_columns(source, target):
+    """
+    Columns present in both tables, in target order.
+    """
+    return [c.name for c in target.columns if c.name in source.c]
+
+
+# ==================================================
+# ARCHIVE CLOSED CALLS (BATCHED)
+# ==================================================
+def archive_closed_calls(
+    months: int = ARCHIVE_AFTER_MONTHS,
+    batch_size: int = ARCHIVE_BATCH_SIZE
+):
+    """
+    Move CLOSED calls older than `months` (and their follow-ups) into
+    the archive tables, `batch_size` calls per transaction.
+
+    Each batch is INSERT ... SELECT into the archive tables followed by
+    a single DELETE on call_logs; follow-ups go with it through the
+    database's ON DELETE CASCADE, so no rows are loaded into Python.
+    Returns the number of calls archived.
+
+    Archived calls still count as "called" for their lead (GET
+    /leads/my, the duplicate first-call check), and their ids are never
+    handed out again. The reports — /admin/kpis, funnel, cube — read
+    the hot tables only, so calls older than the cutoff drop out of
+    them, purchases included.
+    """
+    cutoff = datetime.now() - timedelta(days=30 * months)
+
+    calls = CallLog.__table__
+    followups = CallFollowUp.__table__
+    calls_archive = CallLogArchive.__table__
+    followups_archive = CallFollowUpArchive.__table__
+
+    call_cols = _copy_columns(calls, calls_archive)
+    followup_cols = _copy_columns(followups, followups_archive)
+
+    # CLOSED at first call has no completed_at — fall back to created_at
+    closed_at = func.coalesce(calls.c.completed_at, calls.c.created_at)
+
+    db: Session = SessionLocal()
+    archived = 0
+
+    try:
+        while True:
+            ids = db.execute(
+                select(calls.c.id)
+                .where(
+                    calls.c.status == "CLOSED",
+                    closed_at < cutoff
+                )
+                .order_by(calls.c.id)
+                .limit(batch_size)
+            ).scalars().all()
+
+            if not ids:
+                break
+
+            db.execute(
+                insert(calls_archive).from_select(
+                    call_cols,
+                    select(*[calls.c[name] for name in call_cols])
+                    .where(calls.c.id.in_(ids))
+                )
+            )
+            db.execute(
+                insert(followups_archive).from_select(
+                    followup_cols,
+                    select(*[followups.c[name] for name in followup_cols])
+                    .where(followups.c.call_id.in_(ids))
+                )
+            )
+            _record_tombstones(db, calls, followups, ids)
+            db.execute(delete(calls).where(calls.c.id.in_(ids)))
+            # drops cached aggregates (admin cube) in this process
+            publish_after_commit(db, "calls_archived", count=len(ids))
+            db.commit()
+
+            archived += len(ids)
+
+    finally:
+        db.close()
+
+    return archived
+
+
+def _record_tombstones(db: Session, calls, followups, ids):
+    """
+    Tell /sync clients the archived calls and follow-ups are gone.
+    """
+    tombstones = SyncTombstone.__table__
+    cols = ["entity", "entity_id", "salesperson_id", "deleted_at"]
+    now = datetime.utcnow()
+
+    db.execute(
+        insert(tombstones).from_select(
+            cols,
+            select(literal("call"), calls.c.id, calls.c.salesperson_id, literal(now))
+            .where(calls.c.id.in_(ids))
+        )
+    )
+    db.execute(
+        insert(tombstones).from_select(
+            cols,
+            select(literal("follow_up"), followups.c.id, calls.c.salesperson_id, literal(now))
+            .select_from(followups.join(calls, calls.c.id == followups.c.call_id))
+            .where(followups.c.call_id.in_(ids))
+        )
+    )
+
+
+def purge_tombstones(days: int = SYNC_TOMBSTONE_DAYS):
+    """
+    Drop tombstones no sync cursor can still need (older cursors are
+    answered with a full resync instead).
+    """
+    db: Session = SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        purged = db.execute(
+            delete(SyncTombstone).where(SyncTombstone.deleted_at < cutoff)
+        ).rowcount
+        db.commit()
+        return purged
+    finally:
+        db.close()
+
+
+# ==================================================
+# SCHEDULER ENTRY POINT
+# ==================================================
+def run_nightly_archive():
+    archived = archive_closed_calls()
+    print(f"[ARCHIVE] Moved {archived} closed calls to archive")
+
+    purged = purge_tombstones()
+    print(f"[ARCHIVE] Purged {purged} sync tombstones")
+
+    # counters for app.utils.job_telemetry
+    return {"rows_scanned": archived + purged}
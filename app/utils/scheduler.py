@@ -1,124 +1,261 @@
+import pickle
 from datetime import datetime, timedelta
 import pytz
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.job import Job
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.util import datetime_to_utc_timestamp
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.config import TIMEZONE, SCHEDULER_MISFIRE_GRACE_SECONDS, SCHEDULER_MAX_WORKERS
+from app.database import SessionLocal, get_engine
 from app.models.call_log import CallLog
 from app.models.call_follow_up import CallFollowUp
 from app.models.lead import Lead
 from app.models.user import User
 from app.utils.mailer import send_email
+from app.utils.job_telemetry import telemetry
 from app.utils.mail_templates import (
     followup_reminder,
     daily_summary
 )
 
 # --------------------------------------------------
-# CONFIG
+# SCHEDULER (PERSISTENT JOB STORE)
 # --------------------------------------------------
-IST = pytz.timezone("Asia/Kolkata")
-CHECK_WINDOW_MINUTES = 5  # scheduler interval
+TZ = pytz.timezone(TIMEZONE)
 
+# Jobs live in the apscheduler_jobs table, so per-follow-up reminders
+# survive restarts and deploys. The store is attached (and the thread
+# started) by start_scheduler(), never at import time.
+#
+# Defaults for every job: runs that piled up while the leader was busy
+# or down collapse into one (coalesce), a job never overlaps itself
+# (max_instances=1 — a slow SMTP day skips a run instead of starting a
+# second scan), and a run more than SCHEDULER_MISFIRE_GRACE_SECONDS late
+# is dropped and counted as missed. Reminder jobs set their own grace.
+scheduler = BackgroundScheduler(
+    timezone=TZ,
+    executors={"default": ThreadPoolExecutor(SCHEDULER_MAX_WORKERS)},
+    job_defaults={
+        "coalesce": True,
+        "max_instances": 1,
+        "misfire_grace_time": SCHEDULER_MISFIRE_GRACE_SECONDS,
+    }
+)
+telemetry.attach(scheduler)
 
-# ==================================================
-# PRE-OVERDUE FOLLOW-UP REMINDER (ONCE ONLY)
-# ==================================================
-def send_followup_reminders():
+# the persistent store; reminder jobs are written to it in bulk
+_jobstore = None
+
+
+def start_scheduler(paused: bool = True):
+    """
+    Attach the persistent job store and start the scheduler thread.
+
+    Started paused by default: the process can then add/move/cancel
+    jobs in the shared store, while only the elected leader resumes it
+    and actually executes them.
+    """
+    if scheduler.running:
+        return
+
+    global _jobstore
+    _jobstore = SQLAlchemyJobStore(engine=get_engine())
+    scheduler.add_jobstore(_jobstore, "default")
+    scheduler.start(paused=paused)
+
+
+def stop_scheduler():
+    if not scheduler.running:
+        return
+
+    scheduler.shutdown(wait=False)
+    scheduler.remove_jobstore("default")
+
+REMINDER_JOB_PREFIX = "followup_reminder:"
+
+
+def _local_now():
+    # follow_up_datetime is stored naive, in the business timezone
+    return datetime.now(TZ).replace(tzinfo=None)
+
+
+def reminder_time(follow_at: datetime, scheduled_at: datetime):
     """
     Rules:
-    - Send reminder ONLY ONCE
     - If gap < 1 hour → 15 mins before follow-up
     - Else → 30 mins before follow-up
     """
+    gap_minutes = (follow_at - scheduled_at).total_seconds() / 60
+    reminder_offset = 15 if gap_minutes < 60 else 30
+    return follow_at - timedelta(minutes=reminder_offset)
+
+
+# ==================================================
+# SCHEDULE / MOVE / CANCEL (CALLED BY WRITE PATHS)
+# ==================================================
+# job ids per DELETE ... IN (...), well below SQLite's parameter limit
+REMINDER_CHUNK_SIZE = 5000
+
+
+def _reminder_job(call_id: int, follow_at: datetime, now: datetime):
+    run_at = max(reminder_time(follow_at, now), now)
+    return Job(
+        scheduler,
+        id=f"{REMINDER_JOB_PREFIX}{call_id}",
+        func=send_call_reminder,
+        trigger=DateTrigger(run_date=TZ.localize(run_at), timezone=TZ),
+        executor="default",
+        args=[call_id, follow_at.isoformat()],
+        kwargs={},
+        name="send_call_reminder",
+        # still worth sending after a restart, as long as it's before the call
+        misfire_grace_time=int((follow_at - run_at).total_seconds()) or 1,
+        coalesce=True,
+        max_instances=1,
+        next_run_time=TZ.localize(run_at)
+    )
+
+
+def schedule_followup_reminders(reminders: dict):
+    """
+    {call id: follow-up time or None} -> one date-triggered job per
+    open call, keyed by call id.
+
+    Re-scheduling replaces the previous job (follow-up moved); no
+    follow-up time, or one already in the past, cancels it. All of it
+    is written to the job store in one transaction — a DELETE of every
+    affected job id plus one multi-row INSERT — however many calls a
+    batch or bulk operation touched.
+    """
+    if not scheduler.running or not reminders:
+        # CLI scripts / tests without the app lifespan
+        return
+
+    now = _local_now()
+    job_ids = [f"{REMINDER_JOB_PREFIX}{call_id}" for call_id in reminders]
+    rows = [
+        {
+            "id": job.id,
+            "next_run_time": datetime_to_utc_timestamp(job.next_run_time),
+            "job_state": pickle.dumps(job.__getstate__(), _jobstore.pickle_protocol),
+        }
+        for job in (
+            _reminder_job(call_id, follow_at, now)
+            for call_id, follow_at in reminders.items()
+            if follow_at and follow_at > now
+        )
+    ]
+
+    jobs_t = _jobstore.jobs_t
+    with _jobstore.engine.begin() as conn:
+        for i in range(0, len(job_ids), REMINDER_CHUNK_SIZE):
+            conn.execute(jobs_t.delete().where(jobs_t.c.id.in_(job_ids[i:i + REMINDER_CHUNK_SIZE])))
+        if rows:
+            conn.execute(jobs_t.insert(), rows)
+
+    if rows:
+        # the leader picks up the new earliest run time
+        scheduler.wakeup()
+
 
+def schedule_followup_reminder(call_id: int, follow_at: datetime | None):
+    schedule_followup_reminders({call_id: follow_at})
+
+
+def cancel_followup_reminders(call_ids):
+    schedule_followup_reminders(dict.fromkeys(call_ids))
+
+
+def cancel_followup_reminder(call_id: int):
+    schedule_followup_reminders({call_id: None})
+
+
+def sync_followup_reminders():
+    """
+    One-time backfill: create reminder jobs for every open call with a
+    future follow-up (used by migrate.py when switching over from the
+    old polling job).
+    """
     db: Session = SessionLocal()
-    now = datetime.now(IST)
-    window_end = now + timedelta(minutes=CHECK_WINDOW_MINUTES)
-
-    # --------------------------------------------------
-    # 1️⃣ FIRST CALL FOLLOW-UPS (CallLog)
-    # --------------------------------------------------
-    calls = (
-        db.query(CallLog)
+    now = _local_now()
+
+    rows = (
+        db.query(CallLog.id, CallLog.follow_up_datetime)
         .filter(
             CallLog.status == "OPEN",
-            CallLog.follow_up_datetime.isnot(None),
             CallLog.follow_up_datetime > now
         )
         .all()
     )
+    db.close()
 
-    for call in calls:
-        created_at = call.created_at
-        follow_at = call.follow_up_datetime
-
-        gap_minutes = (follow_at - created_at).total_seconds() / 60
-        reminder_offset = 15 if gap_minutes < 60 else 30
-        reminder_time = follow_at - timedelta(minutes=reminder_offset)
-
-        # 🔐 trigger only once inside narrow window
-        if reminder_time <= now < window_end:
-            user = db.query(User).get(call.salesperson_id)
-
-            send_email(
-                to_email=user.email,
-                subject="Upcoming Follow-up Reminder",
-                html_content=followup_reminder(
-                    user_name=user.name,
-                    client_name=call.client_name,
-                    follow_time=follow_at.strftime("%d %b %I:%M %p")
-                )
-            )
+    schedule_followup_reminders(dict(rows))
+    return len(rows)
 
-    # --------------------------------------------------
-    # 2️⃣ ACTUAL FOLLOW-UPS (CallFollowUp)
-    # --------------------------------------------------
-    followups = (
-        db.query(CallFollowUp, CallLog)
-        .join(CallLog, CallLog.id == CallFollowUp.call_id)
-        .filter(
-            CallLog.status == "OPEN",
-            CallFollowUp.follow_up_datetime.isnot(None),
-            CallFollowUp.follow_up_datetime > now
-        )
-        .all()
-    )
 
-    for followup, call in followups:
-        created_at = followup.created_at
-        follow_at = followup.follow_up_datetime
-
-        gap_minutes = (follow_at - created_at).total_seconds() / 60
-        reminder_offset = 15 if gap_minutes < 60 else 30
-        reminder_time = follow_at - timedelta(minutes=reminder_offset)
-
-        if reminder_time <= now < window_end:
-            user = db.query(User).get(followup.salesperson_id)
-
-            send_email(
-                to_email=user.email,
-                subject="Upcoming Follow-up Reminder",
-                html_content=followup_reminder(
-                    user_name=user.name,
-                    client_name=call.client_name,
-                    follow_time=follow_at.strftime("%d %b %I:%M %p")
-                )
-            )
+# ==================================================
+# PRE-OVERDUE FOLLOW-UP REMINDER (ONE JOB PER CALL)
+# ==================================================
+def send_call_reminder(call_id: int, follow_at_iso: str):
+    """
+    Fires at the reminder instant. Skips silently if the call was closed
+    or its follow-up moved since the job was scheduled. Returns the run's
+    counters for app.utils.job_telemetry.
+    """
+    db: Session = SessionLocal()
+    stats = {"rows_scanned": 0, "emails_attempted": 0, "emails_failed": 0}
 
-    db.close()
+    try:
+        call = db.get(CallLog, call_id)
+        follow_at = datetime.fromisoformat(follow_at_iso)
+        stats["rows_scanned"] += 1
+
+        if (
+            not call
+            or call.status != "OPEN"
+            or call.follow_up_datetime != follow_at
+        ):
+            return stats
+
+        user = db.get(User, call.salesperson_id)
+        stats["rows_scanned"] += 1
+
+        stats["emails_attempted"] += 1
+        sent = send_email(
+            to_email=user.email,
+            subject="Upcoming Follow-up Reminder",
+            html_content=followup_reminder(
+                user_name=user.name,
+                client_name=call.client_name,
+                follow_time=follow_at.strftime("%d %b %I:%M %p")
+            )
+        )
+        stats["emails_failed"] += 0 if sent else 1
+        return stats
+    finally:
+        db.close()
 
 
 # ==================================================
 # DAILY 8 PM SUMMARY (PER SALESPERSON)
 # ==================================================
 def send_daily_summary():
+    """
+    Returns the run's counters for app.utils.job_telemetry.
+    """
     db: Session = SessionLocal()
+    stats = {"rows_scanned": 0, "emails_attempted": 0, "emails_failed": 0}
 
     salespersons = (
         db.query(User)
         .filter(User.role == "SALESPERSON")
         .all()
     )
+    stats["rows_scanned"] += len(salespersons)
 
     for user in salespersons:
 
@@ -173,7 +310,10 @@ def send_daily_summary():
                 "time": f.follow_up_datetime.strftime("%d %b %I:%M %p")
             })
 
-        send_email(
+        stats["rows_scanned"] += len(leads) + len(calls) + len(fups)
+
+        stats["emails_attempted"] += 1
+        sent = send_email(
             to_email=user.email,
             subject="Daily Pending Summary – Sales Pro",
             html_content=daily_summary(
@@ -182,5 +322,7 @@ def send_daily_summary():
                 followups=followups
             )
         )
+        stats["emails_failed"] += 0 if sent else 1
 
-    db.close()
\ No newline at end of file
+    db.close()
+    return stats
\ No newline at end of file
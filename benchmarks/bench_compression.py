@@ -0,0 +1,201 @@
+"""
+Bytes on the wire and time-to-first-byte for the HTML pages and the
+large JSON lists, before and after response compression.
+
+- pages, "before": the old route — Jinja TemplateResponse rendered on
+  every hit, sent uncompressed
+- pages, "after": the pre-rendered bytes from app.routes.frontend
+  (gzip), plus a revalidation with If-None-Match (304, no body)
+- JSON, "before": Accept-Encoding: identity (what every response used
+  to be); "after": gzip through GZipMiddleware
+
+Requests go straight into the ASGI app, so TTFB is the server-side time
+until the response headers are sent; "link_ms" adds the transfer time
+of the body over a --link-kbps connection (branch offices).
+
+    python benchmarks/generate_data.py --db bench.db --calls 200000
+    python benchmarks/bench_compression.py --db bench.db --link-kbps 512
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+PAGES = ("/login", "/dashboard", "/admin", "/all-calls", "/call-details")
+JSON_LISTS = (
+    ("admin.calls_month", "/admin/calls?span=month", "admin"),
+    ("admin.leads_month", "/admin/leads?span=month", "admin"),
+    ("calls.admin_all_week", "/calls/?span=week", "admin"),
+    ("calls.all_mine", "/calls/all-mine", "rep"),
+)
+
+
+# ==================================================
+# ASGI DRIVER
+# ==================================================
+async def asgi_get(app, path: str, headers: dict):
+    """
+    One GET through the ASGI app. Returns (status, response headers,
+    wire bytes, ttfb ms, total ms).
+    """
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = {"status": None, "headers": {}, "bytes": 0, "first": None}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent["first"] = time.perf_counter()
+            sent["status"] = message["status"]
+            sent["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+        elif message["type"] == "http.response.body":
+            sent["bytes"] += len(message.get("body", b""))
+
+    t0 = time.perf_counter()
+    await app(scope, receive, send)
+    done = time.perf_counter()
+    return sent["status"], sent["headers"], sent["bytes"], (sent["first"] - t0) * 1000, (done - t0) * 1000
+
+
+def measure(app, path, headers, iterations, link_kbps):
+    """
+    Median TTFB / total over `iterations` (after one warm-up request),
+    wire bytes and estimated time on a link_kbps connection.
+    """
+    async def go():
+        await asgi_get(app, path, headers)
+        return [await asgi_get(app, path, headers) for _ in range(iterations)]
+
+    runs = asyncio.run(go())
+    status, response_headers, size = runs[-1][:3]
+    ttfb = sorted(r[3] for r in runs)[len(runs) // 2]
+    total = sorted(r[4] for r in runs)[len(runs) // 2]
+    return {
+        "status": status,
+        "encoding": response_headers.get("content-encoding", "identity"),
+        "bytes": size,
+        "ttfb_ms": round(ttfb, 2),
+        "total_ms": round(total, 2),
+        "link_ms": round(total + size * 8 / link_kbps, 1),
+        "etag": response_headers.get("etag"),
+    }
+
+
+def old_pages_app():
+    """
+    The page routes as they were: a template render per request.
+    """
+    from fastapi import FastAPI, Request
+    from app.routes.frontend import templates
+
+    app = FastAPI()
+
+    def route(name):
+        def page(request: Request):
+            return templates.TemplateResponse(name, {"request": request})
+        return page
+
+    for path in PAGES:
+        name = path.strip("/").replace("-", "_") + ".html"
+        app.get(path)(route(name))
+    return app
+
+
+# ==================================================
+# RUN
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="Wire bytes and TTFB before / after compression")
+    parser.add_argument("--db", default="bench.db", help="database from generate_data.py")
+    parser.add_argument("--iterations", type=int, default=15)
+    parser.add_argument("--link-kbps", type=float, default=512, help="branch-office link speed for link_ms")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"{args.db} not found — run benchmarks/generate_data.py first")
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["MAX_CONCURRENT_REQUESTS"] = "0"
+    os.environ.pop("DATABASE_REPLICA_URLS", None)
+    os.chdir(ROOT)    # templates are resolved relative to the repo root
+
+    import sqlite3
+    import app.main
+    from app.database import init_engine
+    from app.utils.security import create_access_token
+
+    init_engine()    # requests bypass the lifespan
+
+    conn = sqlite3.connect(args.db)
+    rep_id = conn.execute(
+        "SELECT salesperson_id FROM call_logs GROUP BY salesperson_id ORDER BY count(*) DESC LIMIT 1"
+    ).fetchone()[0]
+    admin_id = conn.execute("SELECT id FROM users WHERE role = 'ADMIN' LIMIT 1").fetchone()[0]
+    conn.close()
+    tokens = {
+        "rep": create_access_token({"user_id": rep_id, "role": "SALESPERSON"}),
+        "admin": create_access_token({"user_id": admin_id, "role": "ADMIN"}),
+    }
+
+    gzip_ok = {"Accept-Encoding": "gzip, deflate"}
+    plain = {"Accept-Encoding": "identity"}
+    results = {}
+    before_app = old_pages_app()
+
+    def report(name, before, after, extra=None):
+        results[name] = {"before": before, "after": after, **(extra or {})}
+        line = (
+            f"{name:24s} {before['bytes']:>10,} B -> {after['bytes']:>9,} B "
+            f"({after['bytes'] / before['bytes']:6.1%})   "
+            f"ttfb {before['ttfb_ms']:7.2f} -> {after['ttfb_ms']:7.2f} ms   "
+            f"@{args.link_kbps:g}kbps {before['link_ms']:8.1f} -> {after['link_ms']:8.1f} ms"
+        )
+        if extra:
+            line += f"   304: {extra['revalidate']['bytes']} B"
+        print(line, flush=True)
+
+    for path in PAGES:
+        before = measure(before_app, path, gzip_ok, args.iterations, args.link_kbps)
+        after = measure(app.main.app, path, gzip_ok, args.iterations, args.link_kbps)
+        revalidate = measure(
+            app.main.app, path, {**gzip_ok, "If-None-Match": after["etag"]},
+            args.iterations, args.link_kbps
+        )
+        report(f"page {path}", before, after, {"revalidate": revalidate})
+
+    for name, path, who in JSON_LISTS:
+        auth = {"Authorization": f"Bearer {tokens[who]}"}
+        before = measure(app.main.app, path, {**plain, **auth}, args.iterations, args.link_kbps)
+        after = measure(app.main.app, path, {**gzip_ok, **auth}, args.iterations, args.link_kbps)
+        report(name, before, after)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
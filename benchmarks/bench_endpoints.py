@@ -0,0 +1,405 @@
+"""
+Per-endpoint latency benchmark for the calls, leads and admin routes.
+
+Runs every route in app/routes/calls.py, leads.py and admin_utils.py
+through the in-process ASGI test client against a generated SQLite
+database (see generate_data.py) and records, per route:
+
+- p50 / p95 / p99 / mean latency (ms)
+- SQL statements executed per request
+- response size in bytes
+
+    python benchmarks/generate_data.py --db bench.db --calls 1000000 --followups 3000000
+    python benchmarks/bench_endpoints.py --db bench.db --output before.json
+    ... change code ...
+    python benchmarks/bench_endpoints.py --db bench.db --compare before.json
+
+Writes go to a copy of the database unless --in-place is given.
+With --compare the run exits non-zero when a route's p95 grows by more
+than --threshold or it issues more queries than the baseline. Every run
+exits non-zero if a route in those modules has no case (ROUTE_MODULES).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+# every route of these modules must be hit by a case
+ROUTE_MODULES = ("app.routes.calls", "app.routes.leads", "app.routes.admin_utils")
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+# ==================================================
+# CASES
+# ==================================================
+BULK_CASE_CALLS = 50      # calls per bulk close / reopen / reassign request
+BULK_CASE_POOL = 5000     # open calls of the second rep to take them from
+
+def build_cases(ctx):
+    """
+    (name, method, path, body factory or None, who) for every route.
+    Body factories get the iteration number so writes stay unique.
+    """
+    rep_call = ctx["rep_call_id"]
+    open_call = ctx["open_call_id"]
+    lead = ctx["rep_lead_id"]
+    rep_id = ctx["rep_id"]
+    future = (datetime.now() + timedelta(days=2)).replace(microsecond=0).isoformat()
+
+    def bulk_ids(i):
+        # a fresh slice of the second rep's open calls per iteration
+        pool = ctx["bulk_call_ids"]
+        start = i * BULK_CASE_CALLS % max(len(pool), 1)
+        return pool[start:start + BULK_CASE_CALLS]
+
+    return [
+        # ---------------- reads: calls.py ----------------
+        ("calls.my", "GET", "/calls/my", None, "rep"),
+        ("calls.all_mine", "GET", "/calls/all-mine", None, "rep"),
+        ("calls.follow_ups", "GET", "/calls/follow-ups", None, "rep"),
+        ("calls.queue", "GET", "/calls/queue?limit=20", None, "rep"),
+        ("calls.queue_team", "GET", "/calls/queue?limit=20&scope=team", None, "rep"),
+        ("calls.history", "GET", f"/calls/{rep_call}/follow-up-history", None, "rep"),
+        ("calls.get", "GET", f"/calls/{rep_call}", None, "rep"),
+        ("calls.admin_all_week", "GET", "/calls/?span=week", None, "admin"),
+        ("calls.admin_all_rep", "GET", f"/calls/?salesperson_id={rep_id}", None, "admin"),
+
+        # ---------------- reads: leads.py ----------------
+        ("leads.my", "GET", "/leads/my", None, "rep"),
+        ("leads.get", "GET", f"/leads/{lead}", None, "rep"),
+
+        # ---------------- reads: admin_utils.py ----------------
+        ("admin.salespersons", "GET", "/admin/salespersons", None, "admin"),
+        ("admin.kpis", "GET", "/admin/kpis", None, "admin"),
+        ("admin.kpis_month", "GET", "/admin/kpis?span=month", None, "admin"),
+        ("admin.leads_month", "GET", "/admin/leads?span=month", None, "admin"),
+        ("admin.calls_month", "GET", "/admin/calls?span=month", None, "admin"),
+        ("admin.performance_cards", "GET", "/admin/performance-cards", None, "admin"),
+        ("admin.funnel", "GET", "/admin/funnel", None, "admin"),
+        ("admin.funnel_source", "GET", "/admin/funnel?group_by=source", None, "admin"),
+        ("admin.followup_aging", "GET", "/admin/followups/aging", None, "admin"),
+        ("admin.cube_state_outcome", "GET", "/admin/cube?dims=state,outcome", None, "admin"),
+        ("admin.cube_rep", "GET", "/admin/cube?dims=salesperson&span=month", None, "admin"),
+        ("admin.lead_duplicates", "GET", "/admin/leads/duplicates", None, "admin"),
+        ("admin.scheduler", "GET", "/admin/scheduler", None, "admin"),
+        ("admin.phone_index", "GET", "/admin/phone-index", None, "admin"),
+        ("admin.load_shedding", "GET", "/admin/load-shedding", None, "admin"),
+
+        # ---------------- writes ----------------
+        ("calls.create_lead", "POST", "/calls/", lambda i: {
+            "client_name": f"Bench Lead {i}",
+            "contact_number": f"8{ctx['run_id']:03d}{i:06d}",
+            "query_source": "WEBSITE",
+        }, "rep"),
+        ("calls.create_call", "POST", "/calls/", lambda i: {
+            "client_name": f"Bench Call {i}",
+            "contact_number": f"7{ctx['run_id']:03d}{i:06d}",
+            "query_source": "WEBSITE",
+            "call_outcome": "Connected",
+            "follow_up_datetime": future,
+        }, "rep"),
+        ("calls.follow_up", "POST", f"/calls/{open_call}/follow-up", lambda i: {
+            "call_outcome": "Busy", "follow_up_datetime": future,
+        }, "rep"),
+        ("calls.follow_up_batch_20", "POST", "/calls/follow-ups/batch", lambda i: {
+            "items": [
+                {"call_id": cid, "call_outcome": "Not Picked", "follow_up_datetime": future}
+                for cid in ctx["open_call_ids"][:20]
+            ]
+        }, "rep"),
+        ("calls.update", "PUT", f"/calls/{open_call}", lambda i: {
+            "remark": f"bench {i}",
+        }, "rep"),
+        ("calls.queue_claim", "POST", "/calls/queue/claim?limit=1&scope=mine", lambda i: None, "rep"),
+
+        # ---------------- writes: admin_utils.py ----------------
+        ("admin.set_team", "PUT", f"/admin/salespersons/{rep_id}/team", lambda i: {
+            "team": ctx["rep_team"] or "Team 1",
+        }, "admin"),
+        ("admin.leads_import_100", "POST", "/admin/leads/import", lambda i: {
+            "leads": [
+                {"client_name": f"Import {i}-{n}", "contact_number": f"6{ctx['run_id']:03d}{i:03d}{n:03d}",
+                 "query_source": "WEBSITE"}
+                for n in range(100)
+            ]
+        }, "admin"),
+        ("admin.leads_assign", "POST", "/admin/leads/assign", lambda i: {
+            "strategy": "least_open", "limit": 100,
+        }, "admin"),
+        ("admin.leads_dedupe", "POST", "/admin/leads/dedupe", lambda i: {"mode": "flag"}, "admin"),
+        ("admin.calls_close", "POST", "/admin/calls/close", lambda i: {
+            "call_ids": bulk_ids(i), "call_outcome": "Not Required",
+        }, "admin"),
+        # calls_close recorded "Not Required", which reopen skips by default
+        ("admin.calls_reopen", "POST", "/admin/calls/reopen", lambda i: {
+            "call_ids": bulk_ids(i), "follow_up_datetime": future, "include_closing_outcomes": True,
+        }, "admin"),
+        ("admin.reassign", "POST", "/admin/reassign", lambda i: {
+            "call_ids": bulk_ids(i), "to_salesperson_id": rep_id,
+        }, "admin"),
+    ]
+
+
+def uncovered_routes(app, cases):
+    """
+    Routes of ROUTE_MODULES that no case reaches. Each case is routed
+    the way Starlette routes it (first matching path + method), so
+    "/calls/my" counts for /calls/my, not for /calls/{call_id}.
+    """
+    from starlette.routing import Match
+
+    hit = set()
+    for _, method, path, _, _ in cases:
+        scope = {"type": "http", "method": method, "path": path.split("?")[0]}
+        for route in app.routes:
+            if route.matches(scope)[0] == Match.FULL:
+                hit.add(id(route))
+                break
+
+    return sorted(
+        f"{sorted(route.methods)[0]} {route.path}"
+        for route in app.routes
+        if getattr(route, "endpoint", None) is not None
+        and route.endpoint.__module__ in ROUTE_MODULES
+        and id(route) not in hit
+    )
+
+
+# ==================================================
+# RUN
+# ==================================================
+def load_context(db_path):
+    import sqlite3
+    from app.models.codes import CallStatus
+
+    conn = sqlite3.connect(db_path)
+    rep_id = conn.execute(
+        "SELECT salesperson_id FROM call_logs GROUP BY salesperson_id "
+        "ORDER BY count(*) DESC LIMIT 1"
+    ).fetchone()[0]
+    admin_id = conn.execute("SELECT id FROM users WHERE role = 'ADMIN' LIMIT 1").fetchone()[0]
+    rep_call_id = conn.execute(
+        "SELECT call_id FROM call_follow_ups WHERE salesperson_id = ? "
+        "GROUP BY call_id ORDER BY count(*) DESC LIMIT 1", (rep_id,)
+    ).fetchone()[0]
+    open_call_ids = [r[0] for r in conn.execute(
+        "SELECT id FROM call_logs WHERE salesperson_id = ? AND status = ? "
+        "ORDER BY id LIMIT 21", (rep_id, CallStatus.code("OPEN"))
+    )]
+    rep_lead_id = conn.execute(
+        "SELECT id FROM leads WHERE salesperson_id = ? ORDER BY id DESC LIMIT 1", (rep_id,)
+    ).fetchone()[0]
+    rep_team = conn.execute("SELECT team FROM users WHERE id = ?", (rep_id,)).fetchone()[0]
+    other_rep_id = conn.execute(
+        "SELECT id FROM users WHERE role = 'SALESPERSON' AND id != ? ORDER BY id LIMIT 1", (rep_id,)
+    ).fetchone()[0]
+    bulk_call_ids = [r[0] for r in conn.execute(
+        "SELECT id FROM call_logs WHERE salesperson_id = ? AND status = ? "
+        "ORDER BY id LIMIT ?", (other_rep_id, CallStatus.code("OPEN"), BULK_CASE_POOL)
+    )]
+    conn.close()
+
+    return {
+        "rep_id": rep_id,
+        "admin_id": admin_id,
+        "rep_call_id": rep_call_id,
+        "open_call_id": open_call_ids[-1],
+        "open_call_ids": open_call_ids[:-1],
+        "rep_lead_id": rep_lead_id,
+        "rep_team": rep_team,
+        "other_rep_id": other_rep_id,
+        "bulk_call_ids": bulk_call_ids,
+        "run_id": int(time.time()) % 1000,
+    }
+
+
+def run(args):
+    db_path = args.db
+    if not args.in_place:
+        db_path = os.path.join(tempfile.mkdtemp(), "bench_copy.db")
+        shutil.copyfile(args.db, db_path)
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["MAX_CONCURRENT_REQUESTS"] = "0"
+    os.environ["RUN_SCHEDULER"] = "false"
+    os.environ["AUTO_CREATE_TABLES"] = "false"
+    os.environ.pop("DATABASE_REPLICA_URLS", None)
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from fastapi.testclient import TestClient
+
+    import app.main
+    from app.utils.security import create_access_token
+
+    statements = [0]
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _count(*_):
+        statements[0] += 1
+
+    ctx = load_context(db_path)
+    tokens = {
+        "rep": create_access_token({"user_id": ctx["rep_id"], "role": "SALESPERSON"}),
+        "admin": create_access_token({"user_id": ctx["admin_id"], "role": "ADMIN"}),
+    }
+
+    cases = build_cases(ctx)
+    missing = uncovered_routes(app.main.app, cases)
+    if missing:
+        sys.exit(f"routes without a benchmark case: {', '.join(missing)}")
+    if args.only:
+        cases = [c for c in cases if any(o in c[0] for o in args.only)]
+
+    results = {}
+    os.chdir(ROOT)    # templates are resolved relative to the repo root
+
+    with TestClient(app.main.app) as client:
+        for name, method, path, body, who in cases:
+            headers = {"Authorization": f"Bearer {tokens[who]}"}
+            timings, queries = [], []
+            size = status = None
+
+            for i in range(args.warmup + args.iterations):
+                payload = body(i) if body else None
+                statements[0] = 0
+                t0 = time.perf_counter()
+                response = client.request(method, path, headers=headers, json=payload)
+                elapsed = (time.perf_counter() - t0) * 1000
+
+                status = response.status_code
+                if i >= args.warmup:
+                    timings.append(elapsed)
+                    queries.append(statements[0])
+                    size = len(response.content)
+
+            timings.sort()
+            results[name] = {
+                "method": method,
+                "path": path,
+                "status": status,
+                "p50_ms": round(percentile(timings, 0.50), 2),
+                "p95_ms": round(percentile(timings, 0.95), 2),
+                "p99_ms": round(percentile(timings, 0.99), 2),
+                "mean_ms": round(sum(timings) / len(timings), 2),
+                "queries": max(queries),
+                "bytes": size,
+            }
+            r = results[name]
+            print(
+                f"{name:28s} {status:3d}  p50 {r['p50_ms']:9.2f}  p95 {r['p95_ms']:9.2f}  "
+                f"p99 {r['p99_ms']:9.2f} ms  {r['queries']:4d} q  {r['bytes']:>10,} B",
+                flush=True
+            )
+
+    if not args.in_place:
+        shutil.rmtree(os.path.dirname(db_path), ignore_errors=True)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "db": os.path.abspath(args.db),
+            "db_bytes": os.path.getsize(args.db),
+            "iterations": args.iterations,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+
+
+# ==================================================
+# COMPARE
+# ==================================================
+def compare(current, baseline, threshold):
+    """
+    Print per-route deltas; returns the names that regressed.
+    """
+    regressions = []
+    print(f"\nvs {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')})")
+
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            print(f"{name:28s} (new)")
+            continue
+
+        ratio = now["p95_ms"] / before["p95_ms"] if before["p95_ms"] else 1.0
+        flags = []
+        if ratio > 1 + threshold:
+            flags.append("SLOWER")
+        if now["queries"] > before["queries"]:
+            flags.append("MORE QUERIES")
+        if flags:
+            regressions.append(name)
+
+        print(
+            f"{name:28s} p95 {before['p95_ms']:9.2f} -> {now['p95_ms']:9.2f} ms ({ratio - 1:+7.1%})  "
+            f"q {before['queries']} -> {now['queries']}  "
+            f"B {before['bytes']} -> {now['bytes']}  {' '.join(flags)}"
+        )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API endpoints against a generated SQLite DB")
+    parser.add_argument("--db", default="bench.db", help="database from generate_data.py")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--only", nargs="*", help="run only cases whose name contains one of these")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed p95 growth (0.20 = 20%%)")
+    parser.add_argument("--in-place", action="store_true", help="write to --db instead of a copy")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"{args.db} not found — run benchmarks/generate_data.py first")
+
+    current = run(args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ regressions: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Memory and CPU per 100k rows: ORM entities vs column-projected Core
+reads for the large list endpoints (admin calls / leads, my calls).
+
+"orm" is how the routes used to read — full CallLog / Lead entities in
+the identity map, then a dict copy of a few attributes. "projected" is
+the current path (app.utils.projection.fetch_dicts): a select() of only
+the needed columns, rows straight to dicts.
+
+    python benchmarks/generate_data.py --db bench.db --calls 200000
+    python benchmarks/bench_list_reads.py --db bench.db --rows 100000
+
+Reports CPU seconds and peak Python heap (tracemalloc) per query shape.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import select
+
+from app.database import init_engine, SessionLocal
+from app.models.user import User
+from app.models.lead import Lead
+from app.models.call_log import CallLog
+from app.utils.projection import fetch_dicts
+
+
+CALL_FIELDS = (
+    "id", "client_name", "contact_number", "query_product", "call_outcome",
+    "status", "follow_up_datetime", "created_at",
+)
+LEAD_FIELDS = (
+    "id", "client_name", "contact_number", "query_source", "query_product",
+    "state", "status", "created_at",
+)
+
+
+def orm_calls(db, rows):
+    out = (
+        db.query(CallLog, User.name)
+        .join(User, User.id == CallLog.salesperson_id)
+        .order_by(CallLog.created_at.desc())
+        .limit(rows)
+        .all()
+    )
+    return [
+        {**{f: getattr(c, f) for f in CALL_FIELDS}, "salesperson": name}
+        for c, name in out
+    ]
+
+
+def projected_calls(db, rows):
+    return fetch_dicts(
+        db,
+        select(*[getattr(CallLog, f) for f in CALL_FIELDS], User.name.label("salesperson"))
+        .join(User, User.id == CallLog.salesperson_id)
+        .order_by(CallLog.created_at.desc())
+        .limit(rows)
+    )
+
+
+def orm_leads(db, rows):
+    out = (
+        db.query(Lead, User.name)
+        .outerjoin(User, User.id == Lead.salesperson_id)
+        .order_by(Lead.created_at.desc())
+        .limit(rows)
+        .all()
+    )
+    return [
+        {**{f: getattr(l, f) for f in LEAD_FIELDS}, "salesperson": name}
+        for l, name in out
+    ]
+
+
+def projected_leads(db, rows):
+    return fetch_dicts(
+        db,
+        select(*[getattr(Lead, f) for f in LEAD_FIELDS], User.name.label("salesperson"))
+        .outerjoin(User, User.id == Lead.salesperson_id)
+        .order_by(Lead.created_at.desc())
+        .limit(rows)
+    )
+
+
+def measure(fn, rows, repeat):
+    """
+    Best-of-`repeat` CPU time, then peak heap from a separate traced run
+    (tracemalloc itself slows allocation down a lot).
+    """
+    best_cpu, count = None, 0
+    for _ in range(repeat):
+        db = SessionLocal()
+        t0 = time.process_time()
+        count = len(fn(db, rows))
+        cpu = time.process_time() - t0
+        db.close()
+        best_cpu = cpu if best_cpu is None else min(best_cpu, cpu)
+
+    db = SessionLocal()
+    tracemalloc.start()
+    fn(db, rows)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.close()
+
+    per_100k = 100_000 / count if count else 0
+    return {
+        "rows": count,
+        "cpu_s_per_100k": round(best_cpu * per_100k, 3),
+        "peak_mb_per_100k": round(peak * per_100k / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM vs projected list reads")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    init_engine(f"sqlite:///{args.db}")
+
+    results = {}
+    for shape, orm_fn, projected_fn in (
+        ("calls", orm_calls, projected_calls),
+        ("leads", orm_leads, projected_leads),
+    ):
+        orm = measure(orm_fn, args.rows, args.repeat)
+        projected = measure(projected_fn, args.rows, args.repeat)
+        results[shape] = {"orm": orm, "projected": projected}
+        print(
+            f"{shape:6s} {orm['rows']:>8,} rows   "
+            f"cpu {orm['cpu_s_per_100k']:.3f}s -> {projected['cpu_s_per_100k']:.3f}s   "
+            f"peak {orm['peak_mb_per_100k']:.1f} MB -> {projected['peak_mb_per_100k']:.1f} MB  (per 100k)"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Import-time and cold-start benchmark for the API worker.
+
+Each sample runs in a fresh interpreter:
+
+- import:      `import app.main` only — must not need a database, open
+               connections or start threads
+- cold start:  import + lifespan startup (engine, opt-in create_all,
+               scheduler) + first request, against a throwaway SQLite file
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+IMPORT_SNIPPET = """
+import json, threading, time
+t0 = time.perf_counter()
+import app.main
+import app.database as database
+print(json.dumps({
+    "ms": (time.perf_counter() - t0) * 1000,
+    "threads": threading.active_count(),
+    "engine_created": database.engine is not None,
+}))
+"""
+
+COLD_START_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+from fastapi.testclient import TestClient
+import app.main
+t_import = time.perf_counter()
+with TestClient(app.main.app) as client:
+    t_ready = time.perf_counter()
+    status = client.get("/login").status_code
+    t_first = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t_import - t0) * 1000,
+    "startup_ms": (t_ready - t_import) * 1000,
+    "first_request_ms": (t_first - t_ready) * 1000,
+    "total_ms": (t_first - t0) * 1000,
+    "status": status,
+}))
+"""
+
+
+def run_snippet(code: str, env: dict):
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(values):
+    return {
+        "min": round(min(values), 1),
+        "median": round(statistics.median(values), 1),
+        "max": round(max(values), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    # import must work with no database configured at all
+    import_env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    import_env["SECRET_KEY"] = "bench"
+
+    imports = [run_snippet(IMPORT_SNIPPET, import_env) for _ in range(args.runs)]
+
+    cold = []
+    for _ in range(args.runs):
+        db_file = os.path.join(tempfile.mkdtemp(), "startup.db")
+        env = dict(
+            import_env,
+            DATABASE_URL=f"sqlite:///{db_file}",
+            AUTO_CREATE_TABLES=os.getenv("AUTO_CREATE_TABLES", "true"),
+            RUN_SCHEDULER=os.getenv("RUN_SCHEDULER", "false"),
+        )
+        cold.append(run_snippet(COLD_START_SNIPPET, env))
+
+    results = {
+        "import_ms": summarize([r["ms"] for r in imports]),
+        "threads_after_import": max(r["threads"] for r in imports),
+        "engine_created_on_import": any(r["engine_created"] for r in imports),
+        "cold_start": {
+            key: summarize([r[key] for r in cold])
+            for key in ("import_ms", "startup_ms", "first_request_ms", "total_ms")
+        },
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Seeded synthetic data for benchmarks.
+
+Creates reps, admins, leads, first calls and follow-ups with realistic
+outcome mixes, spread over the last --days days. The follow-up summary
+columns on call_logs are filled in directly, so the data passes
+`python -m app.utils.call_summary` without a rebuild.
+
+    python benchmarks/generate_data.py --db bench.db --reps 100 \\
+        --calls 1000000 --followups 3000000
+
+Every user's password is "bench"; reps are rep<N>@bench.local, admins
+admin<N>@bench.local. Same --seed, same data.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import insert, event
+
+from app.database import init_engine, create_tables, dispose_engines
+from app.models.codes import register_sources
+from app.models.user import User
+from app.models.lead import Lead
+from app.models.call_log import CallLog
+from app.models.call_follow_up import CallFollowUp
+from app.utils.security import hash_password
+
+PASSWORD = "bench"
+
+OPEN_OUTCOMES = ["Connected", "Not Picked", "Busy", "Cut-In Between"]
+CLOSING_OUTCOMES = ["Purchased", "Not Required"]
+SOURCES = ["INDIAMART", "FACEBOOK", "WEBSITE", "JUSTDIAL", "REFERRAL", "WALK-IN"]
+PRODUCTS = ["Solar Panel", "Inverter", "Battery", "Water Heater", "AMC"]
+STATES = ["Maharashtra", "Gujarat", "Karnataka", "Delhi", "Tamil Nadu", "Rajasthan"]
+
+
+def first_outcome(rng):
+    r = rng.random()
+    if r < 0.10:
+        return "Purchased"
+    if r < 0.30:
+        return "Not Required"
+    return rng.choice(OPEN_OUTCOMES)
+
+
+class Generator:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = datetime.now().replace(microsecond=0)
+
+        self.engine = init_engine(f"sqlite:///{args.db}")
+        create_tables()
+        register_sources(SOURCES)    # lookup rows before the bulk transaction
+
+        # bulk load speed over durability — this is throwaway data
+        @event.listens_for(self.engine, "connect")
+        def _fast_pragmas(dbapi_conn, _):
+            cur = dbapi_conn.cursor()
+            cur.execute("PRAGMA journal_mode=MEMORY")
+            cur.execute("PRAGMA synchronous=OFF")
+            cur.close()
+
+        self.engine.dispose()
+        self.counts = {"users": 0, "leads": 0, "calls": 0, "followups": 0}
+
+    def flush(self, conn, table, rows, key):
+        if rows:
+            conn.execute(insert(table), rows)
+            self.counts[key] += len(rows)
+            rows.clear()
+
+    # --------------------------------------------------
+    # USERS
+    # --------------------------------------------------
+    def users(self, conn):
+        password_hash = hash_password(PASSWORD)
+        rows = []
+        for n in range(1, self.args.reps + 1):
+            rows.append({
+                "id": n, "name": f"Rep {n:03d}", "email": f"rep{n}@bench.local",
+                "password_hash": password_hash, "role": "SALESPERSON", "is_active": True,
+                "team": f"Team {(n - 1) // 10 + 1}"    # shared work queues of ten
+            })
+        for n in range(1, self.args.admins + 1):
+            rows.append({
+                "id": self.args.reps + n, "name": f"Admin {n}", "email": f"admin{n}@bench.local",
+                "password_hash": password_hash, "role": "ADMIN", "is_active": True,
+                "team": None
+            })
+        self.flush(conn, User.__table__, rows, "users")
+
+    # --------------------------------------------------
+    # LEADS + CALLS + FOLLOW-UPS
+    # --------------------------------------------------
+    def lead_row(self, lead_id, rep_id, created_at, status):
+        rng = self.rng
+        return {
+            "id": lead_id,
+            "client_name": f"Client {lead_id}",
+            "contact_number": f"9{lead_id:09d}",
+            "query_source": rng.choice(SOURCES),
+            "query_product": rng.choice(PRODUCTS),
+            "state": rng.choice(STATES),
+            "salesperson_id": rep_id,
+            "status": status,
+            "created_at": created_at,
+        }
+
+    def followups_for(self, call_id, rep_id, called_at, count, next_id):
+        """
+        `count` follow-ups after the first call; only the last may close
+        it. Returns (rows, closing_outcome_or_None).
+        """
+        rng = self.rng
+        rows = []
+        at = called_at
+        closing = None
+
+        for i in range(count):
+            at = min(at + timedelta(hours=rng.uniform(2, 96)), self.now)
+            last = i == count - 1
+            if last and rng.random() < 0.5:
+                outcome = rng.choice(CLOSING_OUTCOMES)
+                closing = outcome
+                follow_at = None
+            else:
+                outcome = rng.choice(OPEN_OUTCOMES)
+                follow_at = at + timedelta(hours=rng.uniform(1, 72))
+
+            rows.append({
+                "id": next_id + i,
+                "call_id": call_id,
+                "salesperson_id": rep_id,
+                "outcome": outcome,
+                "remark": None,
+                "follow_up_datetime": follow_at,
+                "created_at": at,
+            })
+
+        return rows, closing
+
+    def calls(self, conn):
+        args, rng = self.args, self.rng
+        open_share = 0.70
+        mean_followups = args.followups / max(args.calls * open_share, 1)
+
+        leads, calls, followups = [], [], []
+        next_followup_id = 1
+
+        for call_id in range(1, args.calls + 1):
+            rep_id = rng.randint(1, args.reps)
+            called_at = self.now - timedelta(seconds=rng.uniform(0, args.days * 86400))
+            lead_at = called_at - timedelta(seconds=rng.uniform(60, 48 * 3600))
+
+            leads.append(self.lead_row(call_id, rep_id, lead_at, "CALLED"))
+
+            outcome = first_outcome(rng)
+            fu_rows, closing = [], None
+            if outcome in OPEN_OUTCOMES:
+                count = rng.randint(0, round(2 * mean_followups))
+                fu_rows, closing = self.followups_for(
+                    call_id, rep_id, called_at, count, next_followup_id
+                )
+                next_followup_id += len(fu_rows)
+                followups.extend(fu_rows)
+
+            if outcome in CLOSING_OUTCOMES or closing:
+                status = "CLOSED"
+                completed_at = fu_rows[-1]["created_at"] if closing else called_at
+                follow_at = None
+            else:
+                status = "OPEN"
+                completed_at = None
+                # open work is due around now: some overdue, some upcoming
+                follow_at = self.now + timedelta(hours=rng.uniform(-72, 168))
+                if fu_rows:
+                    fu_rows[-1]["follow_up_datetime"] = follow_at
+
+            purchased = [f["created_at"] for f in fu_rows if f["outcome"] == "Purchased"]
+            if purchased:
+                purchased_at = purchased[0]
+            elif outcome == "Purchased":
+                purchased_at = completed_at or called_at
+            else:
+                purchased_at = None
+
+            calls.append({
+                "id": call_id,
+                "call_id": f"CALL-{call_id:08X}",
+                "salesperson_id": rep_id,
+                "lead_id": call_id,
+                "query_source": leads[-1]["query_source"],
+                "client_name": leads[-1]["client_name"],
+                "contact_number": leads[-1]["contact_number"],
+                "query_product": leads[-1]["query_product"],
+                "state": leads[-1]["state"],
+                "call_outcome": outcome,
+                "remark": None,
+                "follow_up_datetime": follow_at,
+                "status": status,
+                "completed_at": completed_at,
+                "created_at": called_at,
+                "followup_count": len(fu_rows),
+                "last_outcome": fu_rows[-1]["outcome"] if fu_rows else outcome,
+                "last_followup_at": fu_rows[-1]["created_at"] if fu_rows else None,
+                "next_follow_up_at": follow_at,
+                "purchased_at": purchased_at,
+            })
+
+            if len(calls) >= args.batch_size:
+                self.flush(conn, Lead.__table__, leads, "leads")
+                self.flush(conn, CallLog.__table__, calls, "calls")
+                self.flush(conn, CallFollowUp.__table__, followups, "followups")
+                print(f"  {self.counts['calls']:,} calls, {self.counts['followups']:,} follow-ups", flush=True)
+
+        self.flush(conn, Lead.__table__, leads, "leads")
+        self.flush(conn, CallLog.__table__, calls, "calls")
+        self.flush(conn, CallFollowUp.__table__, followups, "followups")
+
+        # leads not called yet (the "My Leads" list)
+        lead_id = args.calls
+        for rep_id in range(1, args.reps + 1):
+            for _ in range(args.new_leads_per_rep):
+                lead_id += 1
+                created_at = self.now - timedelta(seconds=rng.uniform(0, 14 * 86400))
+                leads.append(self.lead_row(lead_id, rep_id, created_at, "NEW"))
+            if len(leads) >= args.batch_size:
+                self.flush(conn, Lead.__table__, leads, "leads")
+        self.flush(conn, Lead.__table__, leads, "leads")
+
+    def run(self):
+        with self.engine.begin() as conn:
+            self.users(conn)
+            self.calls(conn)
+        dispose_engines()
+        return self.counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded benchmark data (SQLite)")
+    parser.add_argument("--db", default="bench.db", help="SQLite file to create")
+    parser.add_argument("--reps", type=int, default=100)
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--followups", type=int, default=300_000, help="approximate total")
+    parser.add_argument("--new-leads-per-rep", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365, help="spread calls over this many days")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--force", action="store_true", help="overwrite an existing --db")
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        if not args.force:
+            sys.exit(f"{args.db} already exists (use --force to overwrite)")
+        os.remove(args.db)
+
+    t0 = time.perf_counter()
+    counts = Generator(args).run()
+    print(f"✅ {args.db}: {counts} in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
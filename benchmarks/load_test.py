@@ -0,0 +1,339 @@
+"""
+Mixed-workload load generator: a sales floor of concurrent reps plus a
+few admins against a running server.
+
+Reps log in once, then loop over realistic actions with random think
+time: open the dashboard (my calls, leads, follow-ups), refresh the
+follow-up list, log a follow-up, log a first call on a new lead, open a
+call's history. Admins cycle through KPIs, performance cards, the
+funnel and the month's calls / leads exports.
+
+The rep count ramps through --stages (e.g. 10,25,50,100), holding each
+for --stage-seconds, which gives the saturation curve for the server's
+current threadpool / DB pool configuration: per stage throughput,
+latency percentiles and error / shed (429, 503) rates, plus a time
+series every --interval seconds.
+
+    python benchmarks/generate_data.py --db bench.db --reps 100
+    python benchmarks/load_test.py --start-server --db bench.db \\
+        --stages 10,25,50,100 --admins 3 --output load.json
+
+Without --start-server, point --url at a server already running on a
+generated database (users rep<N>@bench.local / admin<N>@bench.local,
+password "bench"); start it with RATE_LIMIT_ENABLED=false unless the
+rate limits themselves are under test, as every virtual user shares
+one client IP for /auth.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PASSWORD = "bench"
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+# ==================================================
+# RECORDING
+# ==================================================
+class Recorder:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.samples = []    # (t, stage, action, ms, status)
+        self.stage = 0
+
+    def add(self, action, ms, status):
+        self.samples.append((time.monotonic() - self.started, self.stage, action, ms, status))
+
+    def summarize(self, samples, seconds):
+        latencies = sorted(s[3] for s in samples)
+        statuses = defaultdict(int)
+        for s in samples:
+            statuses[s[4]] += 1
+        errors = sum(c for st, c in statuses.items() if st == 0 or (st >= 500 and st != 503))
+        return {
+            "requests": len(samples),
+            "rps": round(len(samples) / seconds, 2) if seconds else None,
+            "p50_ms": round(percentile(latencies, 0.50) or 0, 1),
+            "p95_ms": round(percentile(latencies, 0.95) or 0, 1),
+            "p99_ms": round(percentile(latencies, 0.99) or 0, 1),
+            "error_rate": round(errors / len(samples), 4) if samples else 0,
+            "shed_429": statuses.get(429, 0),
+            "shed_503": statuses.get(503, 0),
+        }
+
+
+# ==================================================
+# VIRTUAL USERS
+# ==================================================
+async def timed(client, rec, action, method, path, **kwargs):
+    t0 = time.perf_counter()
+    try:
+        response = await client.request(method, path, **kwargs)
+        status = response.status_code
+    except httpx.HTTPError:
+        response, status = None, 0
+    rec.add(action, (time.perf_counter() - t0) * 1000, status)
+    return response
+
+
+async def login(client, rec, email, stop):
+    while not stop.is_set():
+        r = await timed(client, rec, "login", "POST", "/auth/login",
+                        json={"email": email, "password": PASSWORD})
+        if r is not None and r.status_code == 200:
+            return r.json()["access_token"]
+        wait = float(r.headers.get("retry-after", 1)) if r is not None else 1
+        await asyncio.sleep(wait)
+    return None
+
+
+async def think(rng, mean, stop):
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=rng.expovariate(1 / mean))
+    except asyncio.TimeoutError:
+        pass
+
+
+async def rep_user(n, base_url, rec, args, stop):
+    rng = random.Random(args.seed * 1000 + n)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout) as client:
+        token = await login(client, rec, f"rep{n}@bench.local", stop)
+        if not token:
+            return
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        follow_ups, leads = [], []
+        seq = 0
+
+        while not stop.is_set():
+            action = rng.choices(
+                ["dashboard", "follow_ups", "log_follow_up", "log_call", "history"],
+                weights=[20, 35, 25, 10, 10]
+            )[0]
+            future = (datetime.now() + timedelta(hours=rng.uniform(1, 72))).replace(microsecond=0)
+
+            if action == "dashboard":
+                await timed(client, rec, "page.dashboard", "GET", "/dashboard")
+                await timed(client, rec, "calls.my", "GET", "/calls/my")
+                r = await timed(client, rec, "leads.my", "GET", "/leads/my")
+                if r is not None and r.status_code == 200:
+                    leads = r.json()
+
+            if action in ("dashboard", "follow_ups") or not follow_ups:
+                r = await timed(client, rec, "calls.follow_ups", "GET", "/calls/follow-ups")
+                if r is not None and r.status_code == 200:
+                    follow_ups = r.json()
+
+            elif action == "log_follow_up":
+                item = rng.choice(follow_ups)
+                closes = rng.random() < 0.2
+                await timed(
+                    client, rec, "calls.follow_up", "POST", f"/calls/{item['id']}/follow-up",
+                    json={
+                        "call_outcome": rng.choice(["Purchased", "Not Required"]) if closes
+                        else rng.choice(["Connected", "Busy", "Not Picked"]),
+                        "remark": "load test",
+                        "follow_up_datetime": None if closes else future.isoformat()
+                    }
+                )
+                if closes:
+                    follow_ups.remove(item)
+
+            elif action == "log_call":
+                seq += 1
+                lead = leads.pop() if leads else None
+                await timed(client, rec, "calls.create", "POST", "/calls/", json={
+                    "client_name": lead["client_name"] if lead else f"Walk-in {n}-{seq}",
+                    "contact_number": lead["contact_number"] if lead else f"6{n:04d}{seq:05d}{args.seed % 10}",
+                    "query_source": "WALK-IN",
+                    "call_outcome": rng.choice(["Connected", "Busy", "Not Picked", "Purchased"]),
+                    "follow_up_datetime": future.isoformat()
+                })
+
+            elif action == "history":
+                item = rng.choice(follow_ups)
+                await timed(client, rec, "calls.history", "GET", f"/calls/{item['id']}/follow-up-history")
+
+            await think(rng, args.rep_think, stop)
+
+
+async def admin_user(n, base_url, rec, args, stop):
+    rng = random.Random(args.seed * 1000 + 999 - n)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout) as client:
+        token = await login(client, rec, f"admin{n}@bench.local", stop)
+        if not token:
+            return
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        while not stop.is_set():
+            action, path = rng.choices(
+                [
+                    ("admin.kpis", "/admin/kpis?span=month"),
+                    ("admin.performance_cards", "/admin/performance-cards?span=month"),
+                    ("admin.funnel", "/admin/funnel?span=month"),
+                    ("admin.export_calls", "/admin/calls?span=month"),
+                    ("admin.export_leads", "/admin/leads?span=month"),
+                ],
+                weights=[30, 25, 15, 15, 15]
+            )[0]
+            await timed(client, rec, action, "GET", path)
+            await think(rng, args.admin_think, stop)
+
+
+# ==================================================
+# SERVER
+# ==================================================
+def start_server(args):
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.abspath(args.db)}",
+        SECRET_KEY=os.getenv("SECRET_KEY", "bench"),
+        RATE_LIMIT_ENABLED=os.getenv("RATE_LIMIT_ENABLED", "false"),
+        RUN_SCHEDULER="false",
+        AUTO_CREATE_TABLES="false",
+    )
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(args.port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env=env
+    )
+
+    url = f"http://127.0.0.1:{args.port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/login", timeout=1).status_code == 200:
+                return proc, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    proc.terminate()
+    sys.exit("server did not start within 30s")
+
+
+# ==================================================
+# MAIN
+# ==================================================
+async def run(args, base_url):
+    rec = Recorder()
+    stop = asyncio.Event()
+    tasks = [
+        asyncio.create_task(admin_user(n, base_url, rec, args, stop))
+        for n in range(1, args.admins + 1)
+    ]
+
+    stages = []
+    active = 0
+    for index, reps in enumerate(args.stages):
+        rec.stage = index
+        stage_start = time.monotonic() - rec.started
+
+        for n in range(active + 1, reps + 1):
+            tasks.append(asyncio.create_task(rep_user(n, base_url, rec, args, stop)))
+        active = max(active, reps)
+
+        await asyncio.sleep(args.stage_seconds)
+
+        stage = rec.summarize(
+            [s for s in rec.samples if s[1] == index and s[2] != "login"],
+            args.stage_seconds
+        )
+        stage.update({"stage": index, "reps": reps, "admins": args.admins, "start_s": round(stage_start, 1)})
+        stages.append(stage)
+        print(
+            f"stage {index}: {reps:4d} reps  {stage['rps']:8.1f} req/s  p50 {stage['p50_ms']:8.1f}  "
+            f"p95 {stage['p95_ms']:8.1f}  p99 {stage['p99_ms']:8.1f} ms  "
+            f"err {stage['error_rate']:.2%}  429 {stage['shed_429']}  503 {stage['shed_503']}",
+            flush=True
+        )
+
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    total_s = time.monotonic() - rec.started
+    timeline = []
+    for t in range(0, int(total_s) + 1, args.interval):
+        window = [s for s in rec.samples if t <= s[0] < t + args.interval and s[2] != "login"]
+        if window:
+            timeline.append({"t_s": t, **rec.summarize(window, args.interval)})
+
+    per_action = defaultdict(list)
+    for s in rec.samples:
+        per_action[s[2]].append(s)
+
+    return {
+        "meta": {
+            "url": base_url,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "workers": args.workers if args.start_server else None,
+            "rep_think_s": args.rep_think,
+            "admin_think_s": args.admin_think,
+        },
+        "stages": stages,
+        "timeline": timeline,
+        "actions": {
+            name: rec.summarize(samples, total_s)
+            for name, samples in sorted(per_action.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent reps + admins load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--start-server", action="store_true", help="start uvicorn on --db first")
+    parser.add_argument("--db", default="bench.db", help="database for --start-server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --start-server")
+    parser.add_argument("--stages", default="10,25,50", help="comma-separated concurrent rep counts")
+    parser.add_argument("--stage-seconds", type=int, default=30)
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument("--rep-think", type=float, default=3.0, help="mean seconds between rep actions")
+    parser.add_argument("--admin-think", type=float, default=8.0, help="mean seconds between admin actions")
+    parser.add_argument("--interval", type=int, default=5, help="timeline bucket in seconds")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    args.stages = [int(s) for s in args.stages.split(",")]
+
+    proc = None
+    base_url = args.url
+    if args.start_server:
+        proc, base_url = start_server(args)
+
+    try:
+        results = asyncio.run(run(args, base_url))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
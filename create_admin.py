@@ -1,8 +1,9 @@
-from app.database import SessionLocal
+from app.database import SessionLocal, init_engine
 from app.models.user import User
 from app.utils.security import hash_password
 from app.utils.enums import RoleEnum
 
+init_engine()
 db = SessionLocal()
 
 admin = User(
@@ -0,0 +1,351 @@
+# migrate.py
+#
+# Idempotent schema upgrades for an existing database.
+#
+# create_all() only creates missing tables — it never adds new columns
+# or indexes to tables that already exist. Run this once after pulling
+# changes that touch the models:
+#
+#     python migrate.py
+
+import re
+
+from sqlalchemy import inspect
+
+from app.database import init_engine, Base
+from app.models.call_log import CallLog
+from app.models.lead import Lead
+from app.models.call_follow_up import CallFollowUp
+from app.models.call_archive import CallLogArchive
+from app.models.codes import Outcome, CallStatus, LeadStatus
+
+
+def add_column(conn, table: str, column: str, ddl: str):
+    """
+    ALTER TABLE ... ADD COLUMN, skipped when the column already exists.
+    Returns True when the column was added.
+    """
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column in existing:
+        return False
+
+    conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+    print(f"  + {table}.{column}")
+    return True
+
+
+def cascade_foreign_key(conn, table: str, column: str, referred: str):
+    """
+    Recreate `table.column -> referred.id` with ON DELETE CASCADE.
+
+    PostgreSQL only; SQLite cannot alter constraints in place, so dev
+    databases need to be recreated to pick up the cascade.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+
+    for fk in inspect(conn).get_foreign_keys(table):
+        if fk["referred_table"] != referred or fk["constrained_columns"] != [column]:
+            continue
+        if (fk.get("options", {}).get("ondelete") or "").upper() == "CASCADE":
+            return
+
+        conn.exec_driver_sql(f"ALTER TABLE {table} DROP CONSTRAINT {fk['name']}")
+        conn.exec_driver_sql(
+            f"ALTER TABLE {table} ADD CONSTRAINT {fk['name']} "
+            f"FOREIGN KEY ({column}) REFERENCES {referred}(id) ON DELETE CASCADE"
+        )
+        print(f"  ~ {table}.{column} ON DELETE CASCADE")
+
+
+def drop_not_null(engine, table: str, column: str):
+    """
+    Make a column nullable. PostgreSQL alters it in place; SQLite
+    cannot, so the table is rebuilt without the constraint
+    (rebuild_sqlite_table). Runs in its own transaction.
+    """
+    with engine.connect() as conn:
+        nullable = {c["name"]: c["nullable"] for c in inspect(conn).get_columns(table)}
+    if nullable.get(column, True):
+        return
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ALTER COLUMN {column} DROP NOT NULL")
+    elif engine.dialect.name == "sqlite":
+        rebuild_sqlite_table(engine, table, lambda ddl: _without_not_null(ddl, table, column))
+    else:
+        raise SystemExit(f"Cannot drop NOT NULL on {table}.{column} for {engine.dialect.name}")
+    print(f"  ~ {table}.{column} NULL")
+
+
+def _without_not_null(ddl: str, table: str, column: str):
+    new_ddl, found = re.subn(
+        rf'([(,]\s*"?{column}"?\s[^,]*?)\s+NOT NULL', r"\1", ddl, count=1, flags=re.IGNORECASE
+    )
+    if not found:
+        raise SystemExit(f"{table}.{column}: NOT NULL not found in\n{ddl}")
+    return new_ddl
+
+
+def rebuild_sqlite_table(engine, table: str, edit):
+    """
+    SQLite's documented way to change a column definition: create the
+    table again from its CREATE statement as changed by `edit`, copy
+    the rows across, drop the old table, rename the new one and
+    recreate its indexes and triggers — all in one transaction, with
+    foreign keys off (they cannot be switched inside a transaction)
+    and checked before commit.
+    """
+    raw = engine.raw_connection()
+    sqlite = raw.driver_connection
+    isolation_level = sqlite.isolation_level
+    sqlite.isolation_level = None    # explicit BEGIN / COMMIT below
+    cur = sqlite.cursor()
+    try:
+        cur.execute("PRAGMA foreign_keys=OFF")
+        cur.execute("BEGIN")
+        try:
+            ddl = cur.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()[0]
+            dependents = [sql for (sql,) in cur.execute(
+                "SELECT sql FROM sqlite_master "
+                "WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+                (table,)
+            ).fetchall()]
+
+            new_table = f"{table}__rebuild"
+            new_ddl = re.sub(
+                rf'^CREATE TABLE\s+"?{table}"?', f"CREATE TABLE {new_table}", edit(ddl), count=1
+            )
+            cur.execute(new_ddl)
+            cur.execute(f"INSERT INTO {new_table} SELECT * FROM {table}")
+            cur.execute(f"DROP TABLE {table}")
+            cur.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+            for sql in dependents:
+                cur.execute(sql)
+
+            broken = cur.execute(f"PRAGMA foreign_key_check({table})").fetchall()
+            if broken:
+                raise SystemExit(f"{table}: rebuild would break foreign keys: {broken[:10]}")
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+    finally:
+        cur.execute("PRAGMA foreign_keys=ON")
+        cur.close()
+        sqlite.isolation_level = isolation_level
+        raw.close()
+
+
+def sqlite_autoincrement(engine, table: str, archive: str):
+    """
+    SQLite only: rebuild `table` with id INTEGER PRIMARY KEY
+    AUTOINCREMENT, so ids of rows moved to `archive` are not reused,
+    and start its sequence past the highest archived id.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.connect() as conn:
+        ddl = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).scalar()
+    if "AUTOINCREMENT" not in ddl.upper():
+        rebuild_sqlite_table(engine, table, _with_autoincrement)
+        print(f"  ~ {table}.id AUTOINCREMENT")
+
+    with engine.begin() as conn:
+        top = conn.exec_driver_sql(
+            f"SELECT max(coalesce((SELECT max(id) FROM {table}), 0), "
+            f"coalesce((SELECT max(id) FROM {archive}), 0))"
+        ).scalar()
+        seq = conn.exec_driver_sql("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).scalar()
+        if seq is None:
+            conn.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, top))
+        elif seq < top:
+            conn.exec_driver_sql("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (top, table))
+
+
+def _with_autoincrement(ddl: str):
+    new_ddl, found = re.subn(r"\bid INTEGER NOT NULL,", "id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,", ddl, count=1)
+    new_ddl, dropped = re.subn(r",\s*PRIMARY KEY \(id\)", "", new_ddl, count=1)
+    if not (found and dropped):
+        raise SystemExit(f"id column / PRIMARY KEY (id) not found in\n{ddl}")
+    return new_ddl
+
+
+def backfill_updated_at(conn, table: str):
+    """
+    Seed a new updated_at (naive UTC) from created_at. On SQLite the
+    value is written in SQLAlchemy's own format, with microseconds, so
+    the /sync keyset compares it correctly.
+    """
+    if conn.dialect.name == "postgresql":
+        value = "COALESCE(created_at, now()) AT TIME ZONE 'UTC'"
+    else:
+        value = "strftime('%Y-%m-%d %H:%M:%f', COALESCE(created_at, CURRENT_TIMESTAMP)) || '000'"
+
+    conn.exec_driver_sql(f"UPDATE {table} SET updated_at = {value} WHERE updated_at IS NULL")
+
+
+# columns stored as small-integer codes (app.models.codes);
+# None = free-form source, coded through the lead_sources table
+ENCODED_COLUMNS = [
+    ("leads", "status", LeadStatus),
+    ("leads", "query_source", None),
+    ("call_logs", "status", CallStatus),
+    ("call_logs", "call_outcome", Outcome),
+    ("call_logs", "last_outcome", Outcome),
+    ("call_logs", "query_source", None),
+    ("call_follow_ups", "outcome", Outcome),
+    ("call_logs_archive", "status", CallStatus),
+    ("call_logs_archive", "call_outcome", Outcome),
+    ("call_logs_archive", "query_source", None),
+    ("call_follow_ups_archive", "outcome", Outcome),
+    ("call_events", "outcome", Outcome),
+    ("call_events", "query_source", None),
+]
+
+
+def encode_column(conn, table: str, column: str, coded):
+    """
+    Rewrite a string column as small-integer codes. Values are matched
+    ignoring case and surrounding spaces; any other value stops the
+    migration (fix or delete those rows, then rerun) rather than being
+    silently dropped. Returns True when rows were rewritten.
+
+    PostgreSQL gets a real SMALLINT column (add, fill, drop, rename —
+    indexes on the old column are recreated by create_indexes). SQLite
+    cannot change a column's type, so codes are written in place.
+    """
+    info = {c["name"]: c for c in inspect(conn).get_columns(table)}[column]
+    postgres = conn.dialect.name == "postgresql"
+    if postgres and info["type"].python_type is int:
+        return False
+
+    pending = f"{column} IS NOT NULL"
+    if not postgres:
+        # rows already holding a code are left alone
+        pending += f" AND NOT (CAST({column} AS TEXT) GLOB '[0-9]*')"
+
+    if coded is None:
+        conn.exec_driver_sql(
+            f"INSERT INTO lead_sources (name) SELECT DISTINCT trim({column}) FROM {table} "
+            f"WHERE {pending} AND trim({column}) NOT IN (SELECT name FROM lead_sources)"
+        )
+        code = f"(SELECT s.id FROM lead_sources s WHERE s.name = trim({table}.{column}))"
+    else:
+        whens = " ".join(
+            f"WHEN '{value.lower()}' THEN {coded.code(value)}" for value in coded.values
+        )
+        code = f"CASE lower(trim({column})) {whens} END"
+
+    unknown = conn.exec_driver_sql(
+        f"SELECT {column}, count(*) FROM {table} WHERE {pending} AND {code} IS NULL GROUP BY {column}"
+    ).all()
+    if unknown:
+        raise SystemExit(f"❌ {table}.{column} has values outside {list(coded.values)}: {unknown}")
+
+    if not postgres:
+        changed = conn.exec_driver_sql(f"UPDATE {table} SET {column} = {code} WHERE {pending}").rowcount
+        if changed:
+            print(f"  ~ {table}.{column} -> codes ({changed} rows)")
+        return bool(changed)
+
+    conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column}__code SMALLINT")
+    conn.exec_driver_sql(f"UPDATE {table} SET {column}__code = {code}")
+    conn.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN {column}")
+    conn.exec_driver_sql(f"ALTER TABLE {table} RENAME COLUMN {column}__code TO {column}")
+    if not info["nullable"]:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+    print(f"  ~ {table}.{column} SMALLINT")
+    return True
+
+
+def create_indexes(engine, table):
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+def upgrade():
+    """
+    Returns which backfills are needed: {"summaries": bool, "events": bool}
+    — true when the follow-up summary columns / call_events table were
+    just created.
+    """
+    engine = init_engine()
+    needs_events = not inspect(engine).has_table("call_events")
+    Base.metadata.create_all(bind=engine)
+
+    # bulk-imported leads wait unassigned for the assignment engine
+    drop_not_null(engine, "leads", "salesperson_id")
+
+    # archived call / follow-up ids must never be handed out again
+    sqlite_autoincrement(engine, "call_logs", "call_logs_archive")
+    sqlite_autoincrement(engine, "call_follow_ups", "call_follow_ups_archive")
+
+    with engine.begin() as conn:
+        # work queue claims
+        add_column(conn, "call_logs", "claimed_by_id", "INTEGER REFERENCES users(id)")
+        add_column(conn, "call_logs", "claimed_until", "TIMESTAMP")
+        add_column(conn, "users", "team", "VARCHAR")
+
+        # follow-up summary (app.utils.call_summary)
+        needs_summary = add_column(
+            conn, "call_logs", "followup_count", "INTEGER NOT NULL DEFAULT 0"
+        )
+        add_column(conn, "call_logs", "last_outcome", "SMALLINT")
+        add_column(conn, "call_logs", "last_followup_at", "TIMESTAMP WITH TIME ZONE")
+        add_column(conn, "call_logs", "next_follow_up_at", "TIMESTAMP")
+        add_column(conn, "call_logs", "purchased_at", "TIMESTAMP WITH TIME ZONE")
+
+        # duplicate lead detection (app.utils.lead_dedupe)
+        add_column(conn, "leads", "phone_normalized", "VARCHAR")
+        add_column(conn, "leads", "duplicate_of_id", "INTEGER REFERENCES leads(id)")
+
+        # change tracking for GET /sync
+        for table in ("leads", "call_logs", "call_follow_ups"):
+            if add_column(conn, table, "updated_at", "TIMESTAMP"):
+                backfill_updated_at(conn, table)
+
+        # outcomes / statuses / sources as small-integer codes
+        for table, column, coded in ENCODED_COLUMNS:
+            if encode_column(conn, table, column, coded) and (table, column) == ("call_logs", "status"):
+                # partial indexes still filter on status = 'OPEN'
+                for index in ("ix_call_logs_open_queue", "ix_call_logs_open_team_queue"):
+                    conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index}")
+
+        # archive purge relies on the database cascade
+        cascade_foreign_key(conn, "call_follow_ups", "call_id", "call_logs")
+
+    create_indexes(engine, CallLog.__table__)
+    create_indexes(engine, Lead.__table__)
+    create_indexes(engine, CallFollowUp.__table__)
+    create_indexes(engine, CallLogArchive.__table__)
+    return {"summaries": needs_summary, "events": needs_events}
+
+
+if __name__ == "__main__":
+    backfills = upgrade()
+    if any(backfills.values()):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        if backfills["summaries"]:
+            from app.utils.call_summary import rebuild_call_summaries
+            print(f"  {rebuild_call_summaries(db)} call summaries backfilled")
+        if backfills["events"]:
+            from app.utils.call_events import backfill_events, rebuild_daily_rollups
+            print(f"  {backfill_events(db)} call events backfilled")
+            print(f"  {rebuild_daily_rollups(db)} daily rollup rows built")
+        db.close()
+
+    # 🔔 reminders moved from a 5-minute poll to one job per follow-up;
+    # create jobs for follow-ups that were scheduled before the switch
+    from app.utils.scheduler import start_scheduler, stop_scheduler, sync_followup_reminders
+    start_scheduler(paused=True)
+    print(f"  {sync_followup_reminders()} follow-up reminders scheduled")
+    stop_scheduler()
+    print("✅ Database schema is up to date")
@@ -1,4 +1,9 @@
+import os
 import uvicorn
 
 if __name__ == "__main__":
+    # local dev: create tables and run scheduler jobs in this process
+    os.environ.setdefault("AUTO_CREATE_TABLES", "true")
+    os.environ.setdefault("RUN_SCHEDULER", "true")
+
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,306 @@
+"""
+Simulate N app workers sharing one job store and check that scheduled
+jobs run exactly once and that only one worker leads at a time,
+including across a leader crash.
+
+Each simulated worker is a separate process set up the way app.main
+sets up a worker: a paused BackgroundScheduler on the shared SQLAlchemy
+job store plus a LeaderElector that resumes it only while holding the
+lease. Jobs are added from the parent process, like a web worker that
+never leads. Halfway through, the current leader is killed with SIGKILL
+while one of its jobs is running: no lease release, no shutdown hook,
+no demotion callback.
+
+    python scripts/simulate_scheduler_workers.py --workers 8 --jobs 40
+
+Checks (exit status 1 if any fails):
+- no job ran more than once
+- every job ran to completion, except those the crashed leader had
+  already submitted (a date job leaves the store when it is submitted,
+  so it is not retried: at-most-once, never twice)
+- leadership intervals never overlap, and every run started inside
+  the leadership interval of the worker that ran it
+- another worker took over after the crash
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# throwaway SQLite database unless DATABASE_URL points elsewhere
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'scheduler_sim.db')}"
+)
+os.environ.setdefault("SECRET_KEY", "simulation")
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.events import EVENT_JOB_SUBMITTED
+from sqlalchemy import text
+
+from app.database import init_engine, create_tables
+from app.utils.leader import LeaderElector
+
+
+# ==================================================
+# SHARED LOG (ONE TABLE PER FACT, WRITTEN BY THE WORKERS)
+# ==================================================
+LOG_DDL = (
+    "CREATE TABLE IF NOT EXISTS sim_runs "
+    "(job_no INTEGER, worker VARCHAR, started_at FLOAT, finished_at FLOAT)",
+    "CREATE TABLE IF NOT EXISTS sim_submitted "
+    "(job_no INTEGER, worker VARCHAR, at FLOAT)",
+    "CREATE TABLE IF NOT EXISTS sim_leadership "
+    "(worker VARCHAR, event VARCHAR, at FLOAT)",
+)
+
+
+def log(sql: str, **params):
+    with init_engine().begin() as conn:
+        conn.execute(text(sql), params)
+
+
+def record_run(job_no: int, seconds: float):
+    """
+    The scheduled job: logs its start, works for `seconds`, logs its end.
+    """
+    worker = os.environ["SIM_WORKER"]
+    log(
+        "INSERT INTO sim_runs (job_no, worker, started_at) VALUES (:n, :w, :t)",
+        n=job_no, w=worker, t=time.time()
+    )
+    time.sleep(seconds)
+    log(
+        "UPDATE sim_runs SET finished_at = :t WHERE job_no = :n AND worker = :w",
+        n=job_no, w=worker, t=time.time()
+    )
+
+
+def log_leadership(worker: str, event: str):
+    log(
+        "INSERT INTO sim_leadership (worker, event, at) VALUES (:w, :e, :t)",
+        w=worker, e=event, t=time.time()
+    )
+
+
+# ==================================================
+# WORKER PROCESS
+# ==================================================
+def run_worker(index: int, ttl: float):
+    worker = f"worker{index}"
+    os.environ["SIM_WORKER"] = worker
+    engine = init_engine()
+
+    scheduler = BackgroundScheduler(
+        jobstores={"default": SQLAlchemyJobStore(engine=engine)},
+        executors={"default": ThreadPoolExecutor(4)}
+    )
+    scheduler.start(paused=True)
+
+    def elected():
+        log_leadership(worker, "elected")
+        scheduler.resume()
+
+    def demoted():
+        scheduler.pause()
+        log_leadership(worker, "demoted")
+
+    def submitted(event):
+        log(
+            "INSERT INTO sim_submitted (job_no, worker, at) VALUES (:n, :w, :t)",
+            n=int(event.job_id.rsplit("-", 1)[1]), w=worker, t=time.time()
+        )
+
+    scheduler.add_listener(submitted, EVENT_JOB_SUBMITTED)
+
+    elector = LeaderElector(
+        "scheduler",
+        ttl=ttl,
+        holder=worker,
+        on_elected=elected,
+        on_demoted=demoted,
+        on_heartbeat=scheduler.wakeup
+    )
+    elector.start()
+
+    # runs until the parent terminates (SIGTERM) or kills (SIGKILL) us
+    signal.signal(signal.SIGTERM, lambda *_: (elector.stop(), scheduler.shutdown(wait=False), os._exit(0)))
+    while True:
+        time.sleep(1)
+
+
+# ==================================================
+# CHECKS
+# ==================================================
+def leadership_intervals(conn, killed: str, killed_at: float, ended_at: float):
+    """
+    [(worker, start, end)] from the elected / demoted log; the killed
+    leader's interval ends at the kill, open ones at `ended_at`.
+    """
+    rows = conn.execute(text("SELECT worker, event, at FROM sim_leadership ORDER BY at")).all()
+    intervals, open_since = [], {}
+    for worker, event, at in rows:
+        if event == "elected":
+            open_since[worker] = at
+        elif worker in open_since:
+            intervals.append((worker, open_since.pop(worker), at))
+    for worker, start in open_since.items():
+        intervals.append((worker, start, killed_at if worker == killed else ended_at))
+    return sorted(intervals, key=lambda i: i[1])
+
+
+def check(conn, jobs: int, killed: str, killed_at: float, ended_at: float):
+    failures = []
+    runs = conn.execute(text("SELECT job_no, worker, started_at, finished_at FROM sim_runs")).all()
+
+    started = {}
+    for job_no, worker, started_at, finished_at in runs:
+        started.setdefault(job_no, []).append((worker, started_at, finished_at))
+
+    finished = {n for n, r in started.items() if any(f is not None for _, _, f in r)}
+    on_crashed = {n for (n,) in conn.execute(
+        text("SELECT job_no FROM sim_submitted WHERE worker = :k"), {"k": killed}
+    )}
+
+    duplicated = {n: len(r) for n, r in started.items() if len(r) > 1}
+    interrupted = sorted(on_crashed - finished)
+    missing = [n for n in range(jobs) if n not in finished and n not in on_crashed]
+    if duplicated:
+        failures.append(f"jobs ran more than once: {duplicated}")
+    if missing:
+        failures.append(f"jobs never ran: {missing}")
+    if not any(r[0][0] == killed and r[0][2] is None for r in started.values()):
+        failures.append("the crash did not interrupt a running job")
+
+    intervals = leadership_intervals(conn, killed, killed_at, ended_at)
+    for (w1, _, end1), (w2, start2, _) in zip(intervals, intervals[1:]):
+        if start2 < end1:
+            failures.append(f"{w1} and {w2} led at the same time ({end1 - start2:.2f}s)")
+
+    for job_no, [(worker, started_at, _), *_] in started.items():
+        if not any(w == worker and s <= started_at <= e for w, s, e in intervals):
+            failures.append(f"job {job_no} ran on {worker} while it was not the leader")
+
+    if not any(w != killed and s >= killed_at for w, s, _ in intervals):
+        failures.append("no worker took over after the crash")
+
+    runs_by_worker = {}
+    for job_no, [(worker, *_), *_] in started.items():
+        runs_by_worker[worker] = runs_by_worker.get(worker, 0) + 1
+    return failures, interrupted, intervals, runs_by_worker
+
+
+# ==================================================
+# RUN
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=30)
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between job run times")
+    parser.add_argument("--job-seconds", type=float, default=0.5, help="how long each job runs")
+    parser.add_argument("--ttl", type=float, default=1.5, help="lease TTL in seconds")
+    args = parser.parse_args()
+
+    engine = init_engine()
+    create_tables()
+    with engine.begin() as conn:
+        for ddl in LOG_DDL:
+            conn.execute(text(ddl))
+
+    ctx = multiprocessing.get_context("spawn")
+    procs = {}
+    for i in range(args.workers):
+        # daemonic: terminated with the parent, whatever path it exits by
+        proc = ctx.Process(target=run_worker, args=(i, args.ttl), name=f"worker{i}", daemon=True)
+        proc.start()
+        procs[f"worker{i}"] = proc
+
+    # jobs are written to the store by a process that never leads
+    # (job defaults are stored with each job, so the grace period must
+    # be set here for runs that come due during the failover)
+    adder = BackgroundScheduler(
+        jobstores={"default": SQLAlchemyJobStore(engine=engine)},
+        job_defaults={"misfire_grace_time": 3600}
+    )
+    adder.start(paused=True)
+    start = datetime.now() + timedelta(seconds=args.ttl + 1)
+    for n in range(args.jobs):
+        adder.add_job(
+            record_run,
+            trigger="date",
+            run_date=start + timedelta(seconds=n * args.interval),
+            args=[n, args.job_seconds],
+            id=f"sim-job-{n}"
+        )
+    adder.shutdown(wait=False)
+
+    # halfway through, SIGKILL the leader while one of its jobs is running
+    killed = killed_at = None
+    time.sleep(args.ttl + 1 + args.jobs * args.interval / 2)
+    deadline = time.time() + args.jobs * args.interval + 10
+    while killed is None and time.time() < deadline:
+        with engine.connect() as conn:
+            row = conn.execute(text(
+                "SELECT worker FROM sim_runs r JOIN scheduler_leases l "
+                "ON l.holder = r.worker AND l.name = 'scheduler' "
+                "WHERE r.finished_at IS NULL LIMIT 1"
+            )).first()
+        if row:
+            killed, killed_at = row.worker, time.time()
+            os.kill(procs[killed].pid, signal.SIGKILL)
+            procs[killed].join()
+            print(f"SIGKILLed leader {killed} in the middle of a job")
+        else:
+            time.sleep(0.02)
+
+    if killed is None:
+        print("FAIL could not catch the leader in the middle of a job")
+        sys.exit(1)
+
+    # wait for failover and the remaining jobs, then for any duplicate to show up
+    deadline = time.time() + args.jobs * args.interval + args.ttl * 3 + 10
+    while time.time() < deadline:
+        with engine.connect() as conn:
+            pending = conn.execute(text("SELECT count(*) FROM apscheduler_jobs")).scalar()
+            running = conn.execute(text(
+                "SELECT count(*) FROM sim_runs WHERE finished_at IS NULL AND worker != :k"
+            ), {"k": killed}).scalar()
+        if not pending and not running:
+            break
+        time.sleep(0.1)
+    time.sleep(args.ttl)
+
+    for proc in procs.values():
+        if proc.is_alive():
+            proc.terminate()
+            proc.join()
+    ended_at = time.time()
+
+    with engine.connect() as conn:
+        failures, interrupted, intervals, runs_by_worker = check(
+            conn, args.jobs, killed, killed_at, ended_at
+        )
+
+    print(f"workers={args.workers} jobs={args.jobs} interrupted by the crash={interrupted}")
+    print(f"runs per worker: {runs_by_worker}")
+    print("leaders: " + ", ".join(f"{w} {e - s:.1f}s" for w, s, e in intervals))
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1)
+
+    print("OK one leader at a time; every job ran once, except those interrupted by the crash")
+
+
+if __name__ == "__main__":
+    main()